@@ -3,6 +3,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
+from django.conf import settings
+from . import anomaly, catalog_cache, verification
+from .pagination import ApproximateCountPaginator
 from .models import (
     # Job models
     JobGroup, Job, JobTag, JobTagRelation,
@@ -17,7 +20,7 @@ from .models import (
     # Quest models
     Quest, QuestCompletion,
     # Salary models
-    SalaryReport,
+    SalaryReport, VerificationAudit,
     VerificationStatus,
 )
 
@@ -29,6 +32,13 @@ admin.site.site_title = "운산 아카데미"
 admin.site.index_title = "데이터베이스 관리"
 
 
+def thumbnail_html(thumbnail):
+    """Inline preview of a processed proof thumbnail."""
+    if not thumbnail:
+        return '-'
+    return format_html('<img src="{}" style="max-height: 60px;" />', thumbnail.url)
+
+
 # ============ INLINE ADMINS ============
 
 class JobTagRelationInline(admin.TabularInline):
@@ -230,10 +240,12 @@ class CourseAdmin(admin.ModelAdmin):
     @admin.action(description='선택 과정 활성화')
     def mark_active(self, request, queryset):
         queryset.update(is_active=True)
+        catalog_cache.invalidate_model(queryset.model)
 
     @admin.action(description='선택 과정 비활성화')
     def mark_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        catalog_cache.invalidate_model(queryset.model)
 
 
 @admin.register(CourseTag)
@@ -267,7 +279,7 @@ class MechanicProfileAdmin(admin.ModelAdmin):
     list_filter = ['tier', 'salary_verification_status']
     search_fields = ['name', 'user__username', 'user__email']
     autocomplete_fields = ['current_job', 'target_job']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['salary_proof_preview', 'created_at', 'updated_at']
 
     fieldsets = (
         ('계정 정보', {
@@ -288,7 +300,7 @@ class MechanicProfileAdmin(admin.ModelAdmin):
         }),
         ('연봉 인증', {
             'fields': (
-                'current_salary', 'salary_proof_image',
+                'current_salary', ('salary_proof_image', 'salary_proof_preview'),
                 ('salary_verification_status', 'salary_verified_at')
             ),
         }),
@@ -298,6 +310,10 @@ class MechanicProfileAdmin(admin.ModelAdmin):
         }),
     )
 
+    def salary_proof_preview(self, obj):
+        return thumbnail_html(obj.salary_proof_thumbnail)
+    salary_proof_preview.short_description = '인증 사진'
+
     def salary_display(self, obj):
         if obj.current_salary:
             return f"{obj.current_salary:,}만원"
@@ -318,21 +334,24 @@ class MechanicProfileAdmin(admin.ModelAdmin):
         )
     verification_status.short_description = '인증 상태'
 
-    actions = ['approve_salary', 'reject_salary']
+    actions = ['approve_salary', 'reject_salary', 'approve_consistent_salary']
 
     @admin.action(description='연봉 인증 승인')
     def approve_salary(self, request, queryset):
-        count = queryset.filter(salary_verification_status='Pending').update(
-            salary_verification_status='Verified',
-            salary_verified_at=timezone.now()
-        )
+        count = verification.verify_profiles(queryset, VerificationStatus.VERIFIED, reviewer=request.user)
         self.message_user(request, f'{count}명 인증 승인됨')
 
+    @admin.action(description='이상치 낮은 연봉 인증 일괄 승인')
+    def approve_consistent_salary(self, request, queryset):
+        # Scored against every pending proof, so the selection does not skew the medians
+        scores = anomaly.score_pending_profiles()
+        threshold = settings.SALARY_ANOMALY_APPROVE_THRESHOLD
+        consistent = queryset.filter(pk__in=[pk for pk, score in scores.items() if score <= threshold])
+        self.approve_salary(request, consistent)
+
     @admin.action(description='연봉 인증 반려')
     def reject_salary(self, request, queryset):
-        count = queryset.filter(salary_verification_status='Pending').update(
-            salary_verification_status='Rejected'
-        )
+        count = verification.verify_profiles(queryset, VerificationStatus.REJECTED, reviewer=request.user)
         self.message_user(request, f'{count}명 인증 반려됨')
 
 
@@ -409,12 +428,37 @@ class SuccessStoryAdmin(admin.ModelAdmin):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'author', 'likes', 'views', 'comment_count', 'is_pinned', 'created_at']
-    list_filter = ['category', 'is_pinned', 'show_verified_salary']
+    list_display = [
+        'title', 'category', 'author', 'likes', 'views', 'unique_views', 'comment_count',
+        'flag_display', 'is_pinned', 'created_at'
+    ]
+    list_filter = ['is_flagged', 'category', 'is_pinned', 'show_verified_salary']
     search_fields = ['title', 'content', 'author__name']
     autocomplete_fields = ['author', 'related_job']
     list_editable = ['is_pinned']
-    readonly_fields = ['likes', 'views', 'comment_count', 'created_at', 'updated_at']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    readonly_fields = [
+        'likes', 'views', 'unique_views', 'comment_count',
+        'duplicate_of', 'duplicate_score', 'duplicate_reviewed', 'created_at', 'updated_at'
+    ]
+
+    def flag_display(self, obj):
+        if not obj.is_flagged:
+            return "-"
+        return format_html(
+            '<span style="color: #ef4444; font-weight: bold;">중복 의심 ({:.0%}) #{}</span>',
+            obj.duplicate_score or 0, obj.duplicate_of_id or '-'
+        )
+    flag_display.short_description = '모더레이션'
+
+    actions = ['clear_flag']
+
+    @admin.action(description='선택 게시글 정상 처리')
+    def clear_flag(self, request, queryset):
+        # Recorded so that edits and `reindex_posts` do not flag the post again
+        count = queryset.filter(is_flagged=True).update(is_flagged=False, duplicate_of=None, duplicate_reviewed=True)
+        self.message_user(request, f'{count}개 게시글 정상 처리됨')
 
 
 @admin.register(Comment)
@@ -422,6 +466,8 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ['short_content', 'post', 'author', 'likes', 'created_at']
     search_fields = ['content', 'author__name']
     autocomplete_fields = ['post', 'author']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
 
     def short_content(self, obj):
         return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
@@ -460,10 +506,12 @@ class QuestAdmin(admin.ModelAdmin):
     @admin.action(description='선택 퀘스트 활성화')
     def mark_active(self, request, queryset):
         queryset.update(is_active=True)
+        catalog_cache.invalidate_model(queryset.model)
 
     @admin.action(description='선택 퀘스트 비활성화')
     def mark_inactive(self, request, queryset):
         queryset.update(is_active=False)
+        catalog_cache.invalidate_model(queryset.model)
 
 
 @admin.register(QuestCompletion)
@@ -472,7 +520,13 @@ class QuestCompletionAdmin(admin.ModelAdmin):
     list_filter = ['is_verified', 'quest__category']
     search_fields = ['profile__name', 'quest__title']
     autocomplete_fields = ['profile', 'quest']
-    readonly_fields = ['completed_at']
+    readonly_fields = ['proof_preview', 'completed_at']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def proof_preview(self, obj):
+        return thumbnail_html(obj.proof_thumbnail)
+    proof_preview.short_description = '인증 사진'
 
 
 # ============ SALARY REPORT ADMIN ============
@@ -481,12 +535,12 @@ class QuestCompletionAdmin(admin.ModelAdmin):
 class SalaryReportAdmin(admin.ModelAdmin):
     list_display = [
         'user', 'target_job', 'current_salary_display', 'estimated_display',
-        'gap_display', 'status', 'created_at'
+        'gap_display', 'anomaly_display', 'status', 'created_at'
     ]
     list_filter = ['status', 'target_job__group']
     search_fields = ['user__name', 'target_job__title']
     autocomplete_fields = ['user', 'target_job']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['proof_preview', 'anomaly_score', 'anomaly_scored_at', 'created_at', 'updated_at']
 
     fieldsets = (
         ('사용자 정보', {
@@ -496,7 +550,10 @@ class SalaryReportAdmin(admin.ModelAdmin):
             'fields': (('current_salary', 'estimated_salary'), 'percentile', 'user_stats')
         }),
         ('인증', {
-            'fields': ('proof_image', ('status', 'verified_at'), 'rejection_reason'),
+            'fields': (('proof_image', 'proof_preview'), ('status', 'verified_at'), 'rejection_reason'),
+        }),
+        ('이상치 분석', {
+            'fields': (('anomaly_score', 'anomaly_scored_at'),),
         }),
     )
 
@@ -504,6 +561,10 @@ class SalaryReportAdmin(admin.ModelAdmin):
         return f"{obj.current_salary:,}만원"
     current_salary_display.short_description = '현재 연봉'
 
+    def proof_preview(self, obj):
+        return thumbnail_html(obj.proof_thumbnail)
+    proof_preview.short_description = '인증 사진'
+
     def estimated_display(self, obj):
         return f"{obj.estimated_salary:,}만원"
     estimated_display.short_description = '시장 가치'
@@ -525,21 +586,58 @@ class SalaryReportAdmin(admin.ModelAdmin):
         )
     gap_display.short_description = '격차'
 
-    actions = ['approve_selected', 'reject_selected']
+    def anomaly_display(self, obj):
+        if obj.anomaly_score is None:
+            return "-"
+        threshold = settings.SALARY_ANOMALY_APPROVE_THRESHOLD
+        color = '#ef4444' if obj.anomaly_score > threshold * 2 else '#f59e0b' if obj.anomaly_score > threshold else '#10b981'
+        return format_html('<span style="color: {}; font-weight: bold;">{:.2f}</span>', color, obj.anomaly_score)
+    anomaly_display.short_description = '이상치'
+    anomaly_display.admin_order_field = 'anomaly_score'
+
+    actions = ['approve_selected', 'reject_selected', 'score_pending', 'approve_consistent']
+
+    @admin.action(description='심사 대기 리포트 이상치 점수 계산')
+    def score_pending(self, request, queryset):
+        count = anomaly.score_pending()
+        self.message_user(request, f'{count}개 리포트 점수 계산됨')
+
+    @admin.action(description='이상치 낮은 리포트 일괄 승인')
+    def approve_consistent(self, request, queryset):
+        # Rescore first: a stored score may predate the latest pending reports
+        anomaly.score_pending()
+        consistent = queryset.filter(
+            status=VerificationStatus.PENDING,
+            anomaly_score__lte=settings.SALARY_ANOMALY_APPROVE_THRESHOLD,
+        )
+        self.approve_selected(request, consistent)
 
     @admin.action(description='인증 승인')
     def approve_selected(self, request, queryset):
-        count = queryset.update(
-            status=VerificationStatus.VERIFIED,
-            verified_at=timezone.now(),
-            rejection_reason=''
-        )
+        count = verification.verify_reports(queryset, VerificationStatus.VERIFIED, reviewer=request.user)
         self.message_user(request, f'{count}개 리포트 승인됨')
 
     @admin.action(description='인증 반려')
     def reject_selected(self, request, queryset):
-        count = queryset.update(
-            status=VerificationStatus.REJECTED,
-            rejection_reason='제출된 서류가 기준에 부적합합니다.'
+        count = verification.verify_reports(
+            queryset, VerificationStatus.REJECTED, reviewer=request.user,
+            reason='제출된 서류가 기준에 부적합합니다.'
         )
         self.message_user(request, f'{count}개 리포트 반려됨')
+
+
+@admin.register(VerificationAudit)
+class VerificationAuditAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'report', 'profile', 'previous_status', 'status', 'reviewer', 'batch']
+    list_filter = ['status', 'previous_status']
+    search_fields = ['profile__name', 'batch']
+    list_select_related = ['report__user', 'report__target_job', 'profile', 'reviewer']
+    readonly_fields = [
+        'report', 'profile', 'previous_status', 'status', 'reason', 'reviewer', 'batch', 'created_at'
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,204 @@
+"""Columnar analytics snapshots of salary, quest and profile data.
+
+A snapshot is a directory holding one ``.npy`` file per column plus a
+``manifest.json``. Loading uses ``np.load(mmap_mode='r')``, so notebooks and
+the estimation engine can read millions of rows zero-copy without the ORM.
+Choice fields are stored as int8 codes; nullable integers use -1.
+"""
+
+import itertools
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import (
+    MechanicProfile, QuestCompletion, SalaryReport,
+    StatType, Tier, VerificationStatus,
+)
+
+
+CHUNK_SIZE = 10000
+NULL_INT = -1
+
+# table -> (model, [(column, ORM path, dtype, categories or None)])
+TABLES = {
+    'salary_reports': (SalaryReport, [
+        ('id', 'id', 'int64', None),
+        ('user_id', 'user_id', 'int64', None),
+        ('target_job_id', 'target_job_id', 'int64', None),
+        ('job_group_id', 'target_job__group_id', 'int64', None),
+        ('current_salary', 'current_salary', 'int32', None),
+        ('estimated_salary', 'estimated_salary', 'int32', None),
+        ('years_experience', 'years_experience', 'int16', None),
+        ('percentile', 'percentile', 'int16', None),
+        ('status', 'status', 'int8', VerificationStatus.values),
+        ('created_at', 'created_at', 'datetime64[s]', None),
+    ]),
+    'quest_completions': (QuestCompletion, [
+        ('id', 'id', 'int64', None),
+        ('profile_id', 'profile_id', 'int64', None),
+        ('quest_id', 'quest_id', 'int64', None),
+        ('target_stat', 'quest__target_stat', 'int8', StatType.values),
+        ('xp_reward', 'quest__xp_reward', 'int16', None),
+        ('is_verified', 'is_verified', 'bool', None),
+        ('completed_at', 'completed_at', 'datetime64[s]', None),
+    ]),
+    'profiles': (MechanicProfile, [
+        ('id', 'id', 'int64', None),
+        ('tier', 'tier', 'int8', Tier.values),
+        ('xp', 'xp', 'int32', None),
+        ('current_job_id', 'current_job_id', 'int64', None),
+        ('years_experience', 'years_experience', 'int16', None),
+        ('stat_tech', 'stat_tech', 'int16', None),
+        ('stat_hand', 'stat_hand', 'int16', None),
+        ('stat_speed', 'stat_speed', 'int16', None),
+        ('stat_art', 'stat_art', 'int16', None),
+        ('stat_biz', 'stat_biz', 'int16', None),
+        ('current_salary', 'current_salary', 'int32', None),
+        ('salary_verification_status', 'salary_verification_status', 'int8', VerificationStatus.values),
+    ]),
+}
+
+
+def snapshot_root():
+    return Path(getattr(settings, 'ANALYTICS_SNAPSHOT_DIR', settings.BASE_DIR / 'snapshots'))
+
+
+def _convert(values, dtype, categories):
+    if categories is not None:
+        index = {value: code for code, value in enumerate(categories)}
+        return np.array([index.get(value, NULL_INT) for value in values], dtype=dtype)
+    if dtype.startswith('datetime64'):
+        return np.array([value.replace(tzinfo=None) if value else None for value in values], dtype=dtype)
+    if dtype == 'bool':
+        return np.array(values, dtype=dtype)
+    return np.array([NULL_INT if value is None else value for value in values], dtype=dtype)
+
+
+def _write_table(directory, model, columns):
+    """Fill pre-sized memory-mapped .npy files chunk by chunk (constant memory)."""
+    queryset = model.objects.order_by('pk')
+    max_pk = queryset.values_list('pk', flat=True).last()
+    queryset = queryset.filter(pk__lte=max_pk or 0)
+    total = queryset.count()
+
+    directory.mkdir(parents=True)
+    arrays = {
+        name: np.lib.format.open_memmap(directory / f'{name}.npy', mode='w+', dtype=dtype, shape=(total,))
+        for name, _, dtype, _ in columns
+    }
+    paths = [path for _, path, _, _ in columns]
+    offset = 0
+    chunk = []
+    for row in queryset.values_list(*paths).iterator(chunk_size=CHUNK_SIZE):
+        if offset + len(chunk) == total:
+            # Only without a snapshot (see write_snapshot): rows committed after the count
+            break
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            offset = _flush_chunk(arrays, columns, chunk, offset)
+            chunk = []
+    if chunk:
+        offset = _flush_chunk(arrays, columns, chunk, offset)
+    for array in arrays.values():
+        array.flush()
+    return offset
+
+
+def _flush_chunk(arrays, columns, chunk, offset):
+    end = offset + len(chunk)
+    for position, (name, _, dtype, categories) in enumerate(columns):
+        arrays[name][offset:end] = _convert([row[position] for row in chunk], dtype, categories)
+    return end
+
+
+def _write_parquet(directory, columns, rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({
+        name: np.load(directory / f'{name}.npy', mmap_mode='r')[:rows]
+        for name, _, _, _ in columns
+    })
+    pq.write_table(table, directory / 'table.parquet')
+
+
+def _new_snapshot_dir(root):
+    """Create and return ``root/<timestamp>``, suffixed when a snapshot of the same second exists."""
+    root.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+    for attempt in itertools.count():
+        target = root / (f'{stamp}.{attempt:03d}' if attempt else stamp)
+        try:
+            target.mkdir()
+        except FileExistsError:
+            continue
+        return target
+
+
+def write_snapshot(root=None, parquet=False):
+    """Write a new snapshot directory and return its path."""
+    root = Path(root) if root else snapshot_root()
+    target = _new_snapshot_dir(root)
+    manifest = {'created_at': timezone.now().isoformat(), 'null_int': NULL_INT, 'tables': {}}
+
+    # One snapshot for every table: PostgreSQL's default READ COMMITTED takes
+    # a new one per statement, so ask for REPEATABLE READ (it must come first).
+    # An SQLite read transaction already sees a single snapshot.
+    repeatable = connection.vendor == 'postgresql' and not connection.in_atomic_block
+    with transaction.atomic():
+        if repeatable:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        for table, (model, columns) in TABLES.items():
+            rows = _write_table(target / table, model, columns)
+            if parquet:
+                _write_parquet(target / table, columns, rows)
+            manifest['tables'][table] = {
+                'rows': rows,
+                'columns': {
+                    name: {'dtype': dtype, 'categories': categories}
+                    for name, _, dtype, categories in columns
+                },
+            }
+
+    (target / 'manifest.json').write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return target
+
+
+def list_snapshots(root=None):
+    root = Path(root) if root else snapshot_root()
+    if not root.exists():
+        return []
+    return sorted(path for path in root.iterdir() if (path / 'manifest.json').exists())
+
+
+def prune_snapshots(keep, root=None):
+    snapshots = list_snapshots(root)
+    for path in snapshots[:-keep] if keep else []:
+        shutil.rmtree(path)
+
+
+def load_snapshot(table, path=None):
+    """Memory-mapped columns of ``table`` from ``path`` (default: latest snapshot).
+
+    Returns ``(columns, manifest)`` where ``columns`` maps names to read-only
+    arrays; decode category codes with ``manifest['columns'][name]['categories']``.
+    """
+    if path is None:
+        snapshots = list_snapshots()
+        if not snapshots:
+            raise FileNotFoundError(f'No analytics snapshots in {snapshot_root()}')
+        path = snapshots[-1]
+    path = Path(path)
+    manifest = json.loads((path / 'manifest.json').read_text(encoding='utf-8'))['tables'][table]
+    columns = {
+        name: np.load(path / table / f'{name}.npy', mmap_mode='r')[:manifest['rows']]
+        for name in manifest['columns']
+    }
+    return columns, manifest
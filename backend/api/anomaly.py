@@ -0,0 +1,100 @@
+"""Batch anomaly scoring to triage pending salary reports.
+
+Each report's salary is compared with the estimation engine's expected
+salary for its job and years of experience. The log ratio is turned into a
+robust z-score (median / MAD) per job, computed for all pending reports in
+one vectorized pass. Pending profile salary proofs are scored the same way,
+on demand. A stored report score is cleared when the report's job, years or
+salary change (see signals.py).
+"""
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from . import salary
+from .models import Job, MechanicProfile, SalaryReport, VerificationStatus
+
+
+MAD_SCALE = 1.4826  # Makes MAD consistent with the standard deviation for normal data
+MIN_GROUP_SIZE = 5  # Smaller jobs are scored against the pooled distribution
+MIN_MAD = 0.05
+
+# SalaryReport fields a stored score was computed from
+SCORED_FIELDS = ('target_job_id', 'years_experience', 'current_salary')
+
+
+def group_medians(groups, values, n_groups):
+    """Median of ``values`` within each group id, without a Python loop over groups."""
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    safe = np.maximum(counts, 1)
+    low = sorted_values[np.minimum(starts + (safe - 1) // 2, len(values) - 1)]
+    high = sorted_values[np.minimum(starts + safe // 2, len(values) - 1)]
+    return np.where(counts > 0, (low + high) / 2, np.nan), counts
+
+
+def robust_z(job_ids, years, salaries, jobs):
+    """|robust z| of log(salary / expected) per report; ``jobs`` maps id -> salary params row."""
+    job_ids = np.asarray(job_ids)
+    unique_jobs, groups = np.unique(job_ids, return_inverse=True)
+    base, cap, growth, _ = salary.salary_params([jobs[job_id] for job_id in unique_jobs])
+    expected = salary.estimate(base[groups], cap[groups], growth[groups], years, 50)
+    residual = np.log(np.maximum(np.asarray(salaries, dtype=np.float64), 1) / np.maximum(expected, 1))
+
+    medians, counts = group_medians(groups, residual, len(unique_jobs))
+    deviation = np.abs(residual - medians[groups])
+    mads, _ = group_medians(groups, deviation, len(unique_jobs))
+
+    pooled_median = np.median(residual)
+    pooled_mad = np.median(np.abs(residual - pooled_median))
+    small = counts[groups] < MIN_GROUP_SIZE
+    center = np.where(small, pooled_median, medians[groups])
+    spread = np.where(small, pooled_mad, mads[groups])
+    spread = np.maximum(spread * MAD_SCALE, MIN_MAD)
+    return np.abs(residual - center) / spread
+
+
+def score_rows(rows):
+    """(ids, |robust z|) for ``(id, job_id, years, salary)`` rows."""
+    ids, job_ids, years, salaries = (np.array(column) for column in zip(*rows))
+    jobs = {
+        row['id']: row
+        for row in Job.objects.filter(id__in=set(job_ids.tolist()))
+        .values('id', 'salary_min', 'salary_max', *salary.REQ_FIELDS)
+    }
+    return ids, robust_z(job_ids, years, salaries, jobs)
+
+
+def score_pending():
+    """Score every pending report and store the result; returns the number scored."""
+    pending = SalaryReport.objects.filter(status=VerificationStatus.PENDING).order_by()
+    rows = list(pending.values_list('id', *SCORED_FIELDS))
+    if not rows:
+        return 0
+
+    ids, scores = score_rows(rows)
+
+    now = timezone.now()
+    reports = [
+        SalaryReport(id=int(report_id), anomaly_score=round(float(score), 3), anomaly_scored_at=now)
+        for report_id, score in zip(ids, scores)
+    ]
+    with transaction.atomic():
+        SalaryReport.objects.bulk_update(reports, ['anomaly_score', 'anomaly_scored_at'], batch_size=1000)
+    return len(reports)
+
+
+def score_pending_profiles():
+    """{profile id: score} for every pending profile salary proof with a job and salary."""
+    pending = MechanicProfile.objects.filter(
+        salary_verification_status=VerificationStatus.PENDING,
+        current_job__isnull=False, current_salary__isnull=False,
+    ).order_by()
+    rows = list(pending.values_list('id', 'current_job_id', 'years_experience', 'current_salary'))
+    if not rows:
+        return {}
+    ids, scores = score_rows(rows)
+    return {int(profile_id): float(score) for profile_id, score in zip(ids, scores)}
@@ -0,0 +1,135 @@
+"""Response cache for the read-only catalog viewsets (jobs, groups, academies, courses, quests).
+
+Serialized ``list`` / ``retrieve`` payloads are stored in the ``api`` cache
+under ``catalog:<namespace>:<version>:<hash of action, pk and query params>``.
+Invalidation bumps the namespace version (model signals, see signals.py), so
+stale entries are never read again and simply expire. The backend is chosen
+with API_CACHE_BACKEND; use file or redis when running several processes,
+since locmem invalidations only reach the process that made the change.
+
+Misses are computed from the primary even in replica-routed viewsets: an
+entry lives for API_CACHE_SECONDS under the current version (which is also
+the catalog ETag), so filling it from a lagging replica would pin the old
+data until the next change.
+"""
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .replicas import reading_from_replica
+
+
+CACHE_ALIAS = 'api'
+
+# model label -> namespaces whose payloads include its data
+DEPENDENCIES = {
+    'api.Job': ('jobs', 'job_groups', 'courses'),  # job_count, target_job_ids
+    'api.JobGroup': ('job_groups', 'jobs'),
+    'api.JobTag': ('jobs',),
+    'api.JobTagRelation': ('jobs',),
+    'api.JobReviewStats': ('jobs',),
+    'api.Academy': ('academies', 'courses'),
+    'api.Course': ('courses', 'academies'),  # course_count
+    'api.CourseTag': ('courses',),
+    'api.CourseTagRelation': ('courses',),
+    'api.Quest': ('quests',),
+}
+
+_counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_counts_lock = threading.Lock()
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f'catalog:version:{namespace}'
+
+
+def version(namespace):
+    key = _version_key(namespace)
+    value = _cache().get(key)
+    if value is None:
+        # Seed with the clock, so an evicted counter can never resurrect old entries
+        _cache().add(key, time.time_ns(), None)
+        value = _cache().get(key, 0)
+    return value
+
+
+def invalidate(*namespaces):
+    for namespace in namespaces:
+        try:
+            _cache().incr(_version_key(namespace))
+        except ValueError:
+            _cache().set(_version_key(namespace), time.time_ns(), None)
+
+
+def invalidate_model(model):
+    invalidate(*DEPENDENCIES.get(model._meta.label, ()))
+
+
+def cache_key(namespace, action, pk, query_params):
+    params = urlencode(sorted((key, sorted(values)) for key, values in query_params.lists()), doseq=True)
+    digest = hashlib.md5(f'{action}:{pk}:{params}'.encode(), usedforsecurity=False).hexdigest()
+    return f'catalog:{namespace}:{version(namespace)}:{digest}'
+
+
+def _record(namespace, hit):
+    with _counts_lock:
+        _counts[namespace]['hits' if hit else 'misses'] += 1
+
+
+def stats():
+    """Hit/miss counts of this process per namespace, with hit ratios."""
+    with _counts_lock:
+        counts = {namespace: dict(values) for namespace, values in _counts.items()}
+    for values in counts.values():
+        total = values['hits'] + values['misses']
+        values['hit_ratio'] = round(values['hits'] / total, 4) if total else None
+    return counts
+
+
+class CachedCatalogMixin:
+    """Cache ``list`` and ``retrieve`` responses of a read-only viewset.
+
+    Requests carrying any of ``cache_bypass_params`` (per-user data) skip the cache.
+    """
+    cache_namespace = None
+    cache_bypass_params = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response('list', None, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        return self._cached_response('retrieve', lookup, super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, cache_action, lookup, view, request, *args, **kwargs):
+        if any(param in request.query_params for param in self.cache_bypass_params):
+            return view(request, *args, **kwargs)
+
+        # Key (and so version) is fixed before computing, so a concurrent
+        # invalidation cannot get a stale payload stored under the new version
+        key = cache_key(self.cache_namespace, cache_action, lookup, request.query_params)
+        data = _cache().get(key)
+        if data is not None:
+            _record(self.cache_namespace, True)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _record(self.cache_namespace, False)
+        with reading_from_replica(False):
+            response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            _cache().set(key, response.data, getattr(settings, 'API_CACHE_SECONDS', 3600))
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,112 @@
+"""Negotiated brotli / gzip compression of text responses.
+
+Brotli is used when the client accepts it and the ``brotli`` package is
+installed, gzip otherwise. Bodies below COMPRESSION_MIN_BYTES, non-text
+content types and responses that are already encoded pass through untouched;
+streaming responses (exports) are compressed chunk by chunk.
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+)
+
+
+def accepted_encodings(header):
+    """Accept-Encoding -> set of codings with a non-zero q-value."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate(header):
+    accepted = accepted_encodings(header)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def _brotli_quality():
+    # 4-5 keeps dynamic responses fast; 11 is meant for static assets
+    return getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=_brotli_quality())
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress text responses with the best coding the client accepts."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.compress(request, response)
+
+    def compress(self, request, response):
+        content_type = response.get('Content-Type', '').lower()
+        if (
+            response.has_header('Content-Encoding')
+            or response.status_code in (204, 304)
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if encoding == 'br':
+                response.streaming_content = _brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < getattr(settings, 'COMPRESSION_MIN_BYTES', 1024):
+                return response
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=_brotli_quality())
+            else:
+                compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The encoded body is no longer byte-identical to the strong validator
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
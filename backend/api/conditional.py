@@ -0,0 +1,93 @@
+"""Conditional GET (ETag / Last-Modified) for API reads, answered before serialization.
+
+The validators come from one ``values_list`` over the rows the response would
+contain (for lists, the requested page, whose objects are then served
+without paginating again): ``updated_at`` plus the viewset's
+``conditional_fields``, i.e. counters and related timestamps that change the
+payload without touching ``updated_at``. Catalog viewsets also mix in their
+response-cache version, which moves with every dependent change (tags,
+review stats, groups), so their lists validate without a query. A matching
+If-None-Match / If-Modified-Since gets a 304 without building objects or
+running serializers.
+
+Last-Modified is only sent for detail responses: a deletion leaves a list's
+newest ``updated_at`` unchanged, so lists validate by ETag alone.
+"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import catalog_cache
+from .instrumentation import timed
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified validation for ``list`` and ``retrieve``."""
+    last_modified_field = 'updated_at'
+    conditional_fields = ()
+
+    def get_conditional_fields(self):
+        return self.conditional_fields
+
+    def list(self, request, *args, **kwargs):
+        if getattr(self, 'cache_namespace', None):
+            # The catalog version already moves with every saved or deleted row
+            return self._conditional_response(request, 'list', [], None, super().list, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list('pk', self.last_modified_field, *self.get_conditional_fields())
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return self._conditional_response(request, 'list', list(rows), None, super().list, *args, **kwargs)
+
+        def view(request, *args, **kwargs):
+            # Serve the page the validators came from; paginating again would repeat the count
+            pks = list(dict.fromkeys(row[0] for row in page))
+            objects = queryset.in_bulk(pks)
+            serializer = self.get_serializer([objects[pk] for pk in pks if pk in objects], many=True)
+            with timed(request, 'ser'):
+                data = serializer.data
+            return self.get_paginated_response(data)
+
+        return self._conditional_response(request, 'list', list(page), None, view, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: lookup})
+        rows = list(queryset.values_list('pk', self.last_modified_field, *self.get_conditional_fields()))
+        last_modified = max((value for row in rows for value in row[1:] if hasattr(value, 'timestamp')), default=None)
+        return self._conditional_response(
+            request, 'retrieve', rows, last_modified,
+            super().retrieve, *args, **kwargs,
+        )
+
+    def get_etag(self, request, action, rows):
+        params = urlencode(sorted((key, sorted(values)) for key, values in request.query_params.lists()), doseq=True)
+        namespace = getattr(self, 'cache_namespace', None)
+        version = catalog_cache.version(namespace) if namespace else ''
+        renderer = getattr(request, 'accepted_renderer', None)
+        source = f'{action}:{params}:{getattr(renderer, "format", "")}:{version}:{rows!r}'
+        return hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()
+
+    def _conditional_response(self, request, action, rows, last_modified, view, *args, **kwargs):
+        if not rows and action == 'retrieve':
+            # Let the view produce its 404
+            return view(request, *args, **kwargs)
+        etag = self.get_etag(request, action, rows)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request, etag=quote_etag(etag), last_modified=timestamp)
+        if not_modified is not None:
+            not_modified.headers['ETag'] = quote_etag(etag)
+            patch_cache_control(not_modified, private=True, no_cache=True)
+            return not_modified
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.headers['ETag'] = quote_etag(etag)
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+            # Cacheable, but always revalidated
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
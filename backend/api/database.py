@@ -0,0 +1,23 @@
+"""Per-connection database tuning and tracking."""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import metrics
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS (WAL, synchronous, busy timeout, mmap) to new SQLite connections."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def track_connection(sender, connection, **kwargs):
+    """Count new connections and keep them for the open-connections gauge."""
+    metrics.track_connection(connection)
@@ -0,0 +1,66 @@
+"""Streaming CSV / NDJSON exports for analysts.
+
+Rows are read with ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL, chunked ``fetchmany`` on SQLite) and encoded one line at a time,
+so memory use does not grow with the table size.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import MechanicProfile, SalaryReport
+
+
+CHUNK_SIZE = 2000
+
+EXPORTS = {
+    'reports': (SalaryReport, [
+        'id', 'user_id', 'user__name', 'target_job_id', 'target_job__code', 'target_job__title',
+        'current_salary', 'estimated_salary', 'years_experience', 'percentile',
+        'status', 'verified_at', 'created_at',
+    ]),
+    'profiles': (MechanicProfile, [
+        'id', 'user__username', 'name', 'tier', 'xp',
+        'current_job_id', 'current_job__title', 'target_job_id', 'target_job__title',
+        'years_experience', 'stat_tech', 'stat_hand', 'stat_speed', 'stat_art', 'stat_biz',
+        'current_salary', 'salary_verification_status', 'salary_verified_at', 'created_at',
+    ]),
+}
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(kind):
+    model, columns = EXPORTS[kind]
+    queryset = model.objects.order_by('pk').values_list(*columns)
+    return columns, queryset.iterator(chunk_size=CHUNK_SIZE)
+
+
+def stream(kind, fmt):
+    """Yield encoded lines (str); the CSV header goes out before the first query runs."""
+    if kind not in EXPORTS:
+        raise ValueError(f'Unknown export: {kind}')
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+
+    columns, rows = iter_rows(kind)
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield '\ufeff' + writer.writerow(columns)  # BOM so Excel reads Korean text
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + '\n'
@@ -0,0 +1,334 @@
+"""Read-only serializers that build the DRF payloads straight from ``.values()`` rows.
+
+Each class mirrors a ModelSerializer field for field (same keys, order and
+formatting) but skips model instances and per-field Python, and batches the
+per-object lookups (tags, target jobs, prerequisites, completions) into one
+query per page. ``manage.py check_fast_serializers`` verifies byte-equivalent
+JSON against the DRF serializers and measures the speed-up. ``?fields=``
+narrows ``values()`` to the columns the kept fields read, skips the lookups
+of dropped fields and is applied to the rendered rows; ``?expand=`` requests
+fall back to the DRF serializers.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .instrumentation import timed
+from .models import (
+    Course, CourseTagRelation, Job, JobReviewStats, JobTagRelation, QuestCompletion,
+)
+from .renderers import FastJSONRenderer
+from .sparse_fields import project, requested
+
+
+def _grouped(pairs):
+    grouped = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return grouped
+
+
+class FastSerializer:
+    """Base class: ``values`` are the ORM paths read per row.
+
+    ``field_values`` maps output fields to the paths they read when those are
+    not the field's own name. With ``fields`` only those paths (and ``id``)
+    are selected; dropped columns are filled from ``placeholders`` (default
+    None) so ``to_representation`` stays branch-free, and projected away.
+    """
+    values = ()
+    field_values = {}
+    placeholders = {}
+
+    def __init__(self, context=None, fields=None):
+        self.context = context or {}
+        self.fields = fields
+
+    def wants(self, *names):
+        return self.fields is None or any(name in self.fields for name in names)
+
+    def selected_values(self):
+        if self.fields is None:
+            return list(self.values)
+        paths = {'id'}
+        for name in self.fields:
+            paths.update(self.field_values.get(name, (name,)))
+        return [path for path in self.values if path in paths]
+
+    def rows(self, queryset):
+        return queryset.prefetch_related(None).values(*self.selected_values())
+
+    def prefetch(self, rows):
+        """Batched lookups for a page of rows, passed to ``to_representation``."""
+        return {}
+
+    def to_representation(self, row, extra):
+        raise NotImplementedError
+
+    def serialize(self, rows):
+        rows = list(rows)
+        if self.fields is not None:
+            filler = {**dict.fromkeys(self.values), **self.placeholders}
+            rows = [{**filler, **row} for row in rows]
+        extra = self.prefetch(rows)
+        data = [self.to_representation(row, extra) for row in rows]
+        if self.fields is not None:
+            data = project(data, self.fields)
+        return data
+
+
+# ============ JOBS ============
+
+class FastJobSerializer(FastSerializer):
+    """Same output as ``JobSerializer``."""
+    values = (
+        'id', 'code', 'title', 'group_id', 'group__name', 'group__code', 'group__icon',
+        'description', 'salary_min', 'salary_max',
+        'market_demand', 'req_tech', 'req_hand', 'req_speed', 'req_art', 'req_biz',
+        'hiring_companies', 'source', 'is_starter', 'is_blue_ocean', 'is_ev_transition', 'order',
+        'review_stats__review_count', 'review_stats__rating_sum', 'review_stats__rating_histogram',
+        'review_stats__pros_counts', 'review_stats__cons_counts',
+    )
+    field_values = {
+        'group': ('group_id',),
+        'group_name': ('group__name',),
+        'group_code': ('group__code',),
+        'group_icon': ('group__icon',),
+        'salary_range_display': ('salary_min', 'salary_max'),
+        'review_stats': tuple(path for path in values if path.startswith('review_stats__')),
+    }
+    placeholders = {'salary_min': 0, 'salary_max': 0}
+
+    def prefetch(self, rows):
+        if not self.wants('tags'):
+            return {'tags': {}}
+        ids = [row['id'] for row in rows]
+        tags = JobTagRelation.objects.filter(job_id__in=ids).order_by('pk').values_list('job_id', 'tag__name')
+        return {'tags': _grouped(tags)}
+
+    @staticmethod
+    def review_stats(row):
+        count = row['review_stats__review_count']
+        if count is None:
+            return None
+        return {
+            'review_count': count,
+            'average_rating': round(row['review_stats__rating_sum'] / count, 2) if count else None,
+            'rating_histogram': row['review_stats__rating_histogram'],
+            'top_pros': JobReviewStats._top(row['review_stats__pros_counts'], JobReviewStats.TOP_N),
+            'top_cons': JobReviewStats._top(row['review_stats__cons_counts'], JobReviewStats.TOP_N),
+        }
+
+    def to_representation(self, row, extra):
+        return {
+            'id': row['id'],
+            'code': row['code'],
+            'title': row['title'],
+            'group': row['group_id'],
+            'group_name': row['group__name'],
+            'group_code': row['group__code'],
+            'group_icon': row['group__icon'],
+            'description': row['description'],
+            'salary_min': row['salary_min'],
+            'salary_max': row['salary_max'],
+            'salary_range_display': f"{row['salary_min']:,}~{row['salary_max']:,}만원",
+            'market_demand': row['market_demand'],
+            'req_tech': row['req_tech'],
+            'req_hand': row['req_hand'],
+            'req_speed': row['req_speed'],
+            'req_art': row['req_art'],
+            'req_biz': row['req_biz'],
+            'hiring_companies': row['hiring_companies'],
+            'source': row['source'],
+            'is_starter': row['is_starter'],
+            'is_blue_ocean': row['is_blue_ocean'],
+            'is_ev_transition': row['is_ev_transition'],
+            'tags': extra['tags'].get(row['id'], []),
+            'review_stats': self.review_stats(row),
+            'order': row['order'],
+        }
+
+
+class FastJobDetailSerializer(FastJobSerializer):
+    """Same output as ``JobDetailSerializer`` (prerequisites and unlocks nested)."""
+
+    def prefetch(self, rows):
+        extra = super().prefetch(rows)
+        if not self.wants('prerequisites', 'unlocks'):
+            return {**extra, 'prerequisites': {}, 'unlocks': {}}
+        ids = [row['id'] for row in rows]
+        edges = list(
+            Job.prerequisites.through.objects.filter(from_job_id__in=ids)
+            .values_list('from_job_id', 'to_job_id')
+            .union(
+                Job.prerequisites.through.objects.filter(to_job_id__in=ids)
+                .values_list('from_job_id', 'to_job_id')
+            )
+        )
+        related_ids = {job_id for edge in edges for job_id in edge}
+        nested = FastJobSerializer(self.context, fields=self.nested_fields())
+        # Job's default ordering, as the prefetched related managers use
+        related = nested.serialize(nested.rows(Job.objects.filter(id__in=related_ids)))
+        position = {job['id']: index for index, job in enumerate(related)}
+        extra['related'] = {job['id']: job for job in related}
+        extra['prerequisites'] = {
+            job_id: sorted(targets, key=position.get)
+            for job_id, targets in _grouped(edges).items()
+        }
+        extra['unlocks'] = {
+            job_id: sorted(sources, key=position.get)
+            for job_id, sources in _grouped((to_id, from_id) for from_id, to_id in edges).items()
+        }
+        return extra
+
+    def nested_fields(self):
+        """Fields of the related jobs: the union of the prerequisites / unlocks selections."""
+        if self.fields is None:
+            return None
+        selections = [self.fields[name] for name in ('prerequisites', 'unlocks') if name in self.fields]
+        if not all(selections):
+            return None
+        merged = {'id': {}}  # keys the related jobs; projected away unless selected
+        for selection in selections:
+            for name, sub_fields in selection.items():
+                # Differing sub-selections: render the field whole, projection trims it
+                merged[name] = sub_fields if merged.get(name, sub_fields) == sub_fields else {}
+        return merged
+
+    def to_representation(self, row, extra):
+        data = super().to_representation(row, extra)
+        data['prerequisites'] = [extra['related'][job_id] for job_id in extra['prerequisites'].get(row['id'], [])]
+        data['unlocks'] = [extra['related'][job_id] for job_id in extra['unlocks'].get(row['id'], [])]
+        return data
+
+
+# ============ EDUCATION ============
+
+class FastCourseSerializer(FastSerializer):
+    """Same output as ``CourseSerializer``."""
+    values = (
+        'id', 'code', 'academy_id', 'academy__name', 'academy__logo',
+        'title', 'description', 'category', 'course_type',
+        'duration', 'price', 'price_note', 'url',
+        'rating', 'enroll_count', 'is_active',
+    )
+    field_values = {
+        'academy': ('academy_id',),
+        'academy_name': ('academy__name',),
+        'academy_logo': ('academy__logo',),
+    }
+    RATING_STEP = Decimal('0.1')
+
+    def prefetch(self, rows):
+        ids = [row['id'] for row in rows]
+        extra = {'tags': {}, 'target_jobs': {}}
+        if self.wants('tags'):
+            tags = CourseTagRelation.objects.filter(course_id__in=ids).order_by('pk').values_list('course_id', 'tag__name')
+            extra['tags'] = _grouped(tags)
+        if self.wants('target_job_ids'):
+            # target_jobs.all() follows Job's default ordering
+            targets = (
+                Course.target_jobs.through.objects.filter(course_id__in=ids)
+                .order_by(*[f'job__{field}' for field in Job._meta.ordering])
+                .values_list('course_id', 'job_id')
+            )
+            extra['target_jobs'] = _grouped(targets)
+        return extra
+
+    def to_representation(self, row, extra):
+        rating = row['rating']
+        return {
+            'id': row['id'],
+            'code': row['code'],
+            'academy': row['academy_id'],
+            'academy_name': row['academy__name'],
+            'academy_logo': row['academy__logo'],
+            'title': row['title'],
+            'description': row['description'],
+            'category': row['category'],
+            'course_type': row['course_type'],
+            'duration': row['duration'],
+            'price': row['price'],
+            'price_note': row['price_note'],
+            'url': row['url'],
+            'rating': None if rating is None else f'{rating.quantize(self.RATING_STEP):f}',
+            'enroll_count': row['enroll_count'],
+            'is_active': row['is_active'],
+            'tags': extra['tags'].get(row['id'], []),
+            'target_job_ids': extra['target_jobs'].get(row['id'], []),
+        }
+
+
+# ============ QUESTS ============
+
+class FastQuestSerializer(FastSerializer):
+    """Same output as ``QuestSerializer``; ``profile_id`` in the context fills is_completed_today."""
+    values = (
+        'id', 'title', 'description', 'target_stat', 'stat_reward',
+        'xp_reward', 'icon', 'category', 'requires_photo',
+        'cooldown_hours', 'max_daily_completions', 'difficulty', 'is_active',
+    )
+
+    def prefetch(self, rows):
+        profile_id = self.context.get('profile_id')
+        if not profile_id or not self.wants('is_completed_today'):
+            return {'completed': set()}
+        completed = QuestCompletion.objects.filter(
+            profile_id=profile_id,
+            quest_id__in=[row['id'] for row in rows],
+            completed_at__date=timezone.now().date(),
+        ).values_list('quest_id', flat=True)
+        return {'completed': set(completed)}
+
+    def to_representation(self, row, extra):
+        data = {field: row[field] for field in self.values}
+        data['is_completed_today'] = row['id'] in extra['completed']
+        return data
+
+
+# ============ VIEWSET MIXIN ============
+
+class FastReadMixin:
+    """Serve list / retrieve from ``fast_serializer_classes`` (action -> class) when FAST_SERIALIZERS is on.
+
+    Requests with ``?expand=`` use the DRF serializers.
+    """
+    fast_serializer_classes = {}
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_fast_serializer(self):
+        serializer_class = self.fast_serializer_classes.get(self.action)
+        fields, expand = requested(self.request)
+        if serializer_class is None or expand or not getattr(settings, 'FAST_SERIALIZERS', True):
+            return None
+        return serializer_class(self.get_serializer_context(), fields=fields)
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_fast_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        rows = fast.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        with timed(request, 'ser'):
+            data = fast.serialize(rows if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        fast = self.get_fast_serializer()
+        if fast is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        with timed(request, 'ser'):
+            data = fast.serialize(fast.rows(queryset)[:1])
+        if not data:
+            raise Http404
+        return Response(data[0])
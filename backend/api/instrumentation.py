@@ -0,0 +1,183 @@
+"""Per-request metrics, query counting and Server-Timing headers.
+
+``RequestTimingMiddleware`` counts every request and its latency per route
+in ``api.metrics`` (two clock reads and lock-free updates). On top of that it
+instruments INSTRUMENTATION_SAMPLE_RATE of the requests: for those, every
+database connection gets an execute wrapper counting queries and their time,
+and the response carries a ``Server-Timing`` header:
+
+* ``db``: time in queries (the description holds the query count)
+* ``ser``: ``serializer.data`` / ``FastSerializer.serialize`` in list and
+  retrieve, without the queries they run (see ``timed``)
+* ``app``: the rest of the view code
+* ``render``: response rendering (JSON encoding)
+* ``total``: the whole request below this middleware
+
+The route's query histograms are updated, and requests over
+INSTRUMENTATION_QUERY_BUDGET queries or INSTRUMENTATION_LATENCY_BUDGET_MS
+are logged with their SQL fingerprints, most repeated first; an N+1 shows up
+as one fingerprint with a high count.
+"""
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.response import Response
+
+from . import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+
+
+def fingerprint(sql):
+    """SQL with literals and IN lists collapsed, so repeats of one statement group together."""
+    sql = _IN_LISTS.sub('(...)', _LITERALS.sub('?', sql))
+    return ' '.join(sql.split())
+
+
+class QueryRecorder:
+    """``execute_wrapper`` counting queries, their time and their SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements.append(sql)
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+def _sampled():
+    rate = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 0.0)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+@contextmanager
+def timed(request, name):
+    """Add the block's time, minus its queries, to the ``name`` timing of a sampled request.
+
+    Nested blocks count once, in the outermost one.
+    """
+    timing = getattr(request, '_request_timing', None)
+    if timing is None or timing['active']:
+        yield
+        return
+    recorder = timing['recorder']
+    timing['active'] = True
+    started, db_started = time.perf_counter(), recorder.duration
+    try:
+        yield
+    finally:
+        timing['active'] = False
+        timing[name] += time.perf_counter() - started - (recorder.duration - db_started)
+
+
+class TimedSerializationMixin:
+    """DRF's ``list`` / ``retrieve`` with ``serializer.data`` timed as ``ser``."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
+        with timed(request, 'ser'):
+            data = serializer.data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        with timed(request, 'ser'):
+            data = serializer.data
+        return Response(data)
+
+
+class RequestTimingMiddleware:
+    """Count requests per route; measure sampled ones (Server-Timing, query histograms, budget logs)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        metrics.REQUESTS_IN_PROGRESS.inc()
+        try:
+            if _sampled():
+                response = self.measure(request, started)
+            else:
+                response = self.get_response(request)
+        finally:
+            metrics.REQUESTS_IN_PROGRESS.dec()
+        metrics.observe_request(route_name(request), request.method, response.status_code, time.perf_counter() - started)
+        metrics.maybe_flush()
+        return response
+
+    def measure(self, request, started):
+        recorder = QueryRecorder()
+        request._request_timing = timing = {'render': 0.0, 'ser': 0.0, 'active': False, 'recorder': recorder}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        db = recorder.duration
+        render, ser = timing['render'], timing['ser']
+        app = max(total - db - ser - render, 0.0)
+        response.headers['Server-Timing'] = ', '.join([
+            f'db;dur={db * 1000:.1f};desc="{recorder.count} queries"',
+            f'ser;dur={ser * 1000:.1f}',
+            f'app;dur={app * 1000:.1f}',
+            f'render;dur={render * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        route = route_name(request)
+        metrics.observe_queries(route, db, recorder.count)
+        if (
+            recorder.count > getattr(settings, 'INSTRUMENTATION_QUERY_BUDGET', 30)
+            or total * 1000 > getattr(settings, 'INSTRUMENTATION_LATENCY_BUDGET_MS', 500)
+        ):
+            self.log_over_budget(request, route, recorder, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns
+        timing = getattr(request, '_request_timing', None)
+        if timing is not None:
+            render_started = time.perf_counter()
+
+            def rendered(response):
+                timing['render'] = time.perf_counter() - render_started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def log_over_budget(self, request, route, recorder, total):
+        top = Counter(fingerprint(sql) for sql in recorder.statements).most_common(5)
+        logger.warning(
+            'Over budget: %s %s (%s) took %.1f ms with %d queries (%.1f ms db)%s',
+            request.method, request.path, route, total * 1000, recorder.count, recorder.duration * 1000,
+            ''.join(f'\n  {count:4d}x {sql[:300]}' for sql, count in top),
+        )
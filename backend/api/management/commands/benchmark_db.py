@@ -0,0 +1,116 @@
+"""Management command to benchmark API endpoints against the configured database profile.
+
+Run once per profile and compare, e.g.::
+
+    python manage.py benchmark_db --concurrency 8 --writers 1
+    DB_ENGINE=postgres python manage.py benchmark_db --concurrency 8 --writers 1
+"""
+
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.db.models import F
+from django.test import Client
+
+from api.models import Course, Job, Post
+
+
+def _endpoints():
+    job = Job.objects.order_by('pk').values_list('pk', flat=True).first()
+    course = Course.objects.order_by('pk').values_list('pk', flat=True).first()
+    endpoints = ['/api/jobs/', '/api/job-groups/', '/api/courses/', '/api/posts/', '/api/stories/']
+    if job:
+        endpoints += [f'/api/jobs/{job}/', f'/api/reviews/?job={job}', f'/api/jobs/{job}/salary_distribution/']
+    if course:
+        endpoints.append(f'/api/courses/{course}/')
+    return endpoints
+
+
+def _describe():
+    settings_dict = connection.settings_dict
+    parts = [connection.vendor, f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size'):
+                cursor.execute(f'PRAGMA {pragma}')
+                parts.append(f'{pragma}={cursor.fetchone()[0]}')
+    return ', '.join(parts)
+
+
+class Command(BaseCommand):
+    help = 'Measure latency and throughput of read endpoints, optionally under concurrent writes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4, help='Reader threads per endpoint')
+        parser.add_argument('--writers', type=int, default=0, help='Background threads issuing small writes')
+
+    def handle(self, *args, **options):
+        endpoints = _endpoints()
+        self.stdout.write(f'Database: {_describe()}')
+
+        stop = threading.Event()
+        writes = []
+        post_id = Post.objects.values_list('pk', flat=True).first()
+        writers = [
+            threading.Thread(target=self._write_loop, args=(post_id, stop, writes))
+            for _ in range(options['writers'] if post_id else 0)
+        ]
+        for thread in writers:
+            thread.start()
+
+        self.stdout.write(f"{'endpoint':45} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8} {'errors':>7}")
+        try:
+            for path in endpoints:
+                self._run_endpoint(path, options['requests'], options['concurrency'])
+        finally:
+            stop.set()
+            for thread in writers:
+                thread.join()
+        if writers:
+            self.stdout.write(f'Background writes committed: {sum(writes)}')
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def _run_endpoint(self, path, total, concurrency):
+        timings, errors = [], []
+        lock = threading.Lock()
+        per_thread = max(1, total // concurrency)
+
+        def worker():
+            client = Client(HTTP_HOST='localhost')
+            local, failed = [], 0
+            for _ in range(per_thread):
+                started = time.perf_counter()
+                response = client.get(path)
+                local.append(time.perf_counter() - started)
+                failed += response.status_code >= 400
+            with lock:
+                timings.extend(local)
+                errors.append(failed)
+            connections.close_all()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        self.stdout.write(f'{path:45} {p50:8.1f} {p95:8.1f} {len(timings) / elapsed:8.0f} {sum(errors):7}')
+
+    def _write_loop(self, post_id, stop, writes):
+        count = 0
+        while not stop.is_set():
+            # A real write transaction that leaves the data unchanged
+            Post.objects.filter(pk=post_id).update(views=F('views'))
+            count += 1
+            time.sleep(0.001)
+        writes.append(count)
+        connections.close_all()
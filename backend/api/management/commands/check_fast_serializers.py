@@ -0,0 +1,99 @@
+"""Management command to verify and benchmark the values()-based fast serializers.
+
+For every job, course and quest the JSON produced by the DRF serializer and
+``JSONRenderer`` is compared byte for byte with the fast serializer and
+``FastJSONRenderer``. With ``--iterations`` both paths are also timed over the
+whole table (queries included).
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (
+    FastCourseSerializer, FastJobDetailSerializer, FastJobSerializer, FastQuestSerializer,
+)
+from api.models import Course, Job, MechanicProfile, Quest
+from api.renderers import FastJSONRenderer
+from api.serializers import CourseSerializer, JobDetailSerializer, JobSerializer, QuestSerializer
+
+
+def _jobs():
+    return Job.objects.select_related('group', 'review_stats')
+
+
+def _job_details():
+    related = _jobs()
+    return related.prefetch_related(Prefetch('prerequisites', queryset=related), Prefetch('unlocks', queryset=related))
+
+
+def _cases():
+    """(name, queryset, DRF serializer, fast serializer, context) as the viewsets use them."""
+    cases = [
+        ('jobs', _jobs, JobSerializer, FastJobSerializer, {}),
+        ('job detail', _job_details, JobDetailSerializer, FastJobDetailSerializer, {}),
+        ('courses', lambda: Course.objects.filter(is_active=True), CourseSerializer, FastCourseSerializer, {}),
+        ('quests', lambda: Quest.objects.filter(is_active=True), QuestSerializer, FastQuestSerializer, {}),
+    ]
+    profile_id = MechanicProfile.objects.values_list('pk', flat=True).first()
+    if profile_id:
+        cases.append((
+            'quests (profile)', lambda: Quest.objects.filter(is_active=True),
+            QuestSerializer, FastQuestSerializer, {'profile_id': profile_id},
+        ))
+    return cases
+
+
+def _drf_json(queryset, serializer_class, context):
+    return JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+
+
+def _fast_json(queryset, serializer_class, context):
+    fast = serializer_class(context)
+    return FastJSONRenderer().render(fast.serialize(fast.rows(queryset)))
+
+
+class Command(BaseCommand):
+    help = 'Check that fast serializers render byte-identical JSON and measure their throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=0, help='Benchmark passes per serializer (0 = check only)')
+
+    def handle(self, *args, **options):
+        failures = 0
+        for name, queryset, drf_class, fast_class, context in _cases():
+            ids = list(queryset().values_list('pk', flat=True))
+            mismatched = [
+                pk for pk in ids
+                if _drf_json(queryset().filter(pk=pk), drf_class, context)
+                != _fast_json(queryset().filter(pk=pk), fast_class, context)
+            ]
+            if _drf_json(queryset(), drf_class, context) != _fast_json(queryset(), fast_class, context):
+                mismatched.append('full list')
+            if mismatched:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'{name}: output differs for {mismatched[:10]}'))
+            else:
+                self.stdout.write(f'{name}: {len(ids)} objects identical')
+
+            if options['iterations']:
+                self._benchmark(name, queryset, drf_class, fast_class, context, len(ids), options['iterations'])
+
+        if failures:
+            raise CommandError(f'{failures} serializer(s) differ from DRF output')
+        self.stdout.write(self.style.SUCCESS('Fast serializers match DRF output'))
+
+    def _benchmark(self, name, queryset, drf_class, fast_class, context, count, iterations):
+        timings = {}
+        for label, render, serializer_class in (('drf', _drf_json, drf_class), ('fast', _fast_json, fast_class)):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                render(queryset(), serializer_class, context)
+            timings[label] = time.perf_counter() - started
+        objects = count * iterations
+        self.stdout.write(
+            f'  drf {objects / timings["drf"]:10.0f} obj/s   fast {objects / timings["fast"]:10.0f} obj/s   '
+            f'speed-up {timings["drf"] / timings["fast"]:.1f}x'
+        )
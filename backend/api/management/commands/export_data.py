@@ -0,0 +1,31 @@
+"""Management command to export salary reports or profiles as CSV / NDJSON."""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import exports
+
+
+class Command(BaseCommand):
+    help = 'Stream a full export of salary reports or profiles in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(exports.EXPORTS))
+        parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv')
+        parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        out = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            count = 0
+            for line in exports.stream(options['kind'], options['format']):
+                out.write(line)
+                count += 1
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if options['output']:
+            self.stderr.write(self.style.SUCCESS(f'Wrote {count} lines to {options["output"]}'))
@@ -0,0 +1,16 @@
+"""Management command to rebuild per-job review aggregates."""
+
+from django.core.management.base import BaseCommand
+
+from api import review_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild JobReviewStats from all CareerReview rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', dest='jobs', help='Only rebuild these job ids')
+
+    def handle(self, *args, **options):
+        count = review_stats.rebuild(options['jobs'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt review stats for {count} jobs'))
@@ -0,0 +1,13 @@
+"""Management command to rebuild the salary cohort cube."""
+
+from django.core.management.base import BaseCommand
+
+from api import salary_cube
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SalaryCubeCell rows from all SalaryReport rows'
+
+    def handle(self, *args, **options):
+        count = salary_cube.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} salary cube cells'))
@@ -0,0 +1,16 @@
+"""Management command to rebuild verified-salary quantile sketches."""
+
+from django.core.management.base import BaseCommand
+
+from api import salary_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SalarySketch rows from verified SalaryReport and MechanicProfile salaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', dest='jobs', help='Only rebuild these job ids')
+
+    def handle(self, *args, **options):
+        count = salary_stats.rebuild(options['jobs'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} salary sketches'))
@@ -0,0 +1,13 @@
+"""Management command to rebuild the career transition graph."""
+
+from django.core.management.base import BaseCommand
+
+from api import transitions
+
+
+class Command(BaseCommand):
+    help = 'Rebuild JobTransition edges from all StoryJourneyStep rows'
+
+    def handle(self, *args, **options):
+        count = transitions.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} job transitions'))
@@ -0,0 +1,23 @@
+"""Management command to recompute near-duplicate flags of existing posts."""
+
+from django.core.management.base import BaseCommand
+
+from api import moderation
+from api.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Re-index post MinHash signatures, setting and clearing duplicate flags'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--post', type=int, action='append', dest='posts', help='Only re-index these post ids')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk').only('pk', 'title', 'content', 'is_flagged', 'duplicate_of', 'duplicate_reviewed')
+        if options['posts']:
+            posts = posts.filter(pk__in=options['posts'])
+        count = flagged = 0
+        for post in posts.iterator(chunk_size=500):
+            count += 1
+            flagged += moderation.index_post(post) is not None
+        self.stdout.write(self.style.SUCCESS(f'Re-indexed {count} posts, {flagged} flagged as near-duplicates'))
@@ -0,0 +1,13 @@
+"""Management command to score pending salary reports for verification triage."""
+
+from django.core.management.base import BaseCommand
+
+from api import anomaly
+
+
+class Command(BaseCommand):
+    help = 'Compute robust anomaly scores for all pending SalaryReport rows'
+
+    def handle(self, *args, **options):
+        count = anomaly.score_pending()
+        self.stdout.write(self.style.SUCCESS(f'Scored {count} pending reports'))
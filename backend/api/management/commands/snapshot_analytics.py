@@ -0,0 +1,26 @@
+"""Management command to write a columnar analytics snapshot."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import analytics
+
+
+class Command(BaseCommand):
+    help = 'Snapshot SalaryReport, QuestCompletion and MechanicProfile data as memory-mappable columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help='Snapshot root (default: ANALYTICS_SNAPSHOT_DIR)')
+        parser.add_argument('--parquet', action='store_true', help='Also write table.parquet (requires pyarrow)')
+        parser.add_argument('--keep', type=int, default=0, help='Keep only the newest N snapshots')
+
+    def handle(self, *args, **options):
+        if options['parquet']:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise CommandError('--parquet requires pyarrow')
+
+        path = analytics.write_snapshot(options['output_dir'], parquet=options['parquet'])
+        if options['keep']:
+            analytics.prune_snapshots(options['keep'], options['output_dir'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote snapshot {path}'))
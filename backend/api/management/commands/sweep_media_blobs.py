@@ -0,0 +1,29 @@
+"""Management command to reclaim unreferenced proof image blobs."""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api import storage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs that no model field references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=settings.MEDIA_BLOB_SWEEP_GRACE_HOURS,
+            help='Only sweep blobs older than this, so in-flight uploads are kept',
+        )
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts from the models first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            corrected = storage.recount()
+            self.stdout.write(f'Corrected {corrected} reference counts')
+
+        removed, freed = storage.sweep(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} blobs ({freed / 1024 / 1024:.1f}MB)'))
@@ -0,0 +1,34 @@
+"""Management command to refresh local SQLite read replicas from the primary."""
+
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api import replicas
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into every SQLite replica file (online backup)'
+
+    def handle(self, *args, **options):
+        primary = connections[replicas.PRIMARY]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Only SQLite replicas can be synced locally; use database replication otherwise')
+        aliases = [alias for alias in replicas.replicas() if connections[alias].vendor == 'sqlite']
+        if not aliases:
+            raise CommandError('No SQLite replica configured (set DB_REPLICA_PATH)')
+
+        # The backup API copies a consistent snapshot even while the primary is being written
+        source = sqlite3.connect(str(primary.settings_dict['NAME']))
+        try:
+            for alias in aliases:
+                connections[alias].close()
+                target = sqlite3.connect(str(connections[alias].settings_dict['NAME']))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(self.style.SUCCESS(f'Synced {alias} from {replicas.PRIMARY}'))
+        finally:
+            source.close()
@@ -0,0 +1,407 @@
+"""In-process metrics registry with Prometheus text exposition (served at ``/metrics``).
+
+Counters, gauges and histograms keep one value map per thread, so ``inc`` and
+``observe`` never take a lock; collection merges the thread shards, and the
+shards of finished threads are folded into one base map. Some
+metrics are computed when collected instead (catalog cache lookups, open
+database connections).
+
+Values cover one process. With METRICS_MULTIPROC_DIR set, each process also
+writes its values to ``<dir>/metrics_<pid>.json``, at most every
+METRICS_FLUSH_SECONDS from the request path and at exit, and collection
+merges every file: counters and histograms are summed, gauges are summed over
+live processes only. Empty the directory when the server starts.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from django.conf import settings
+
+from . import catalog_cache
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_FILE_PATTERN = re.compile(r'^metrics_(\d+)\.json$')
+
+# Anything else (arbitrary client methods) is labelled "other"
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+def _add_value(values, labels, value):
+    values[labels] = values.get(labels, 0) + value
+
+
+def _add_row(values, labels, row):
+    values[labels] = _sum_rows(values.get(labels), list(row))
+
+
+class _Shards:
+    """One value map per thread; only the first update of a thread takes the lock.
+
+    Maps of finished threads are merged into ``_base`` (when a new thread
+    registers and at collection), so thread-per-request servers keep a
+    bounded number of maps.
+    """
+
+    def __init__(self, combine):
+        self._local = threading.local()
+        self._threads = []  # (weakref to thread, its map)
+        self._base = {}
+        self._combine = combine
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._fold_finished()
+                self._threads.append((weakref.ref(threading.current_thread()), values))
+            return values
+
+    def _fold_finished(self):
+        live = []
+        for thread, values in self._threads:
+            current = thread()
+            if current is not None and current.is_alive():
+                live.append((thread, values))
+                continue
+            # The thread is gone, nothing writes to its map any more
+            for labels, value in list(values.items()):
+                self._combine(self._base, labels, value)
+        self._threads = live
+
+    def snapshot(self):
+        with self._lock:
+            self._fold_finished()
+            # dict.items() / list() copies run without releasing the GIL
+            return [list(self._base.items())] + [list(values.items()) for _, values in self._threads]
+
+
+# ============ METRIC TYPES ============
+
+class Metric:
+    """Base class; ``function`` makes a metric computed at collection ({labels: value})."""
+    kind = None
+    combine = staticmethod(_add_value)
+
+    def __init__(self, name, documentation, labelnames=(), function=None, registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._shards = _Shards(self.combine)
+        (registry or REGISTRY).register(self)
+
+    def _add(self, labels, amount):
+        values = self._shards.get()
+        values[labels] = values.get(labels, 0) + amount
+
+    def samples(self):
+        if self.function is not None:
+            return dict(self.function())
+        merged = {}
+        for shard in self._shards.snapshot():
+            for labels, value in shard:
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+    def family(self):
+        return {
+            'kind': self.kind, 'help': self.documentation,
+            'labelnames': list(self.labelnames), 'samples': self.samples(),
+        }
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        self._add(labels, amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        self._add(labels, amount)
+
+    def dec(self, *labels, amount=1):
+        self._add(labels, -amount)
+
+
+class Histogram(Metric):
+    """Per-bucket counts (upper bounds inclusive, plus +Inf) followed by the sum."""
+    kind = 'histogram'
+    combine = staticmethod(_add_row)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry=registry)
+
+    def observe(self, value, *labels):
+        values = self._shards.get()
+        row = values.get(labels)
+        if row is None:
+            row = values[labels] = [0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def samples(self):
+        merged = {}
+        for shard in self._shards.snapshot():
+            for labels, row in shard:
+                merged[labels] = _sum_rows(merged.get(labels), list(row))
+        return merged
+
+    def family(self):
+        return {**super().family(), 'buckets': list(self.buckets)}
+
+
+def _sum_rows(left, right):
+    if left is None:
+        return right
+    return [a + b for a, b in zip(left, right)]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+
+    def collect(self):
+        """{name: family} of this process; samples keyed by label tuples."""
+        return {name: metric.family() for name, metric in self._metrics.items()}
+
+
+REGISTRY = Registry()
+
+
+# ============ MULTIPROCESS MODE ============
+
+_last_flush = 0.0
+
+
+def multiproc_dir():
+    return getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+
+
+def flush():
+    """Write this process's values for the other workers' ``/metrics``."""
+    global _last_flush
+    directory = multiproc_dir()
+    if not directory:
+        return
+    _last_flush = time.monotonic()
+    families = {
+        name: {**family, 'samples': [[list(labels), value] for labels, value in family['samples'].items()]}
+        for name, family in REGISTRY.collect().items()
+    }
+    path = os.path.join(directory, f'metrics_{os.getpid()}.json')
+    temporary = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as handle:
+        json.dump(families, handle)
+    os.replace(temporary, path)
+
+
+def maybe_flush():
+    if multiproc_dir() and time.monotonic() - _last_flush >= getattr(settings, 'METRICS_FLUSH_SECONDS', 5):
+        flush()
+
+
+atexit.register(flush)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_all():
+    """Families of this process, or merged over all processes in multiprocess mode."""
+    directory = multiproc_dir()
+    if not directory:
+        return REGISTRY.collect()
+
+    flush()
+    merged = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as handle:
+                families = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        alive = _alive(int(match.group(1)))
+        for name, family in families.items():
+            if family['kind'] == 'gauge' and not alive:
+                continue
+            target = merged.setdefault(name, {**family, 'samples': {}})
+            for labels, value in family['samples']:
+                key = tuple(labels)
+                if family['kind'] == 'histogram':
+                    target['samples'][key] = _sum_rows(target['samples'].get(key), value)
+                else:
+                    target['samples'][key] = target['samples'].get(key, 0) + value
+    return merged
+
+
+# ============ EXPOSITION ============
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) or abs(value) >= 1e15 else str(int(value))
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def with_cache_ratios(families):
+    """Add api_cache_hit_ratio, computed from the (merged) lookup counters."""
+    lookups = families.get('api_cache_requests_total', {}).get('samples', {})
+    counts = {}
+    for (namespace, result), value in lookups.items():
+        counts.setdefault(namespace, {'hit': 0, 'miss': 0})[result] += value
+    families['api_cache_hit_ratio'] = {
+        'kind': 'gauge', 'help': 'Catalog response cache hit ratio', 'labelnames': ['namespace'],
+        'samples': {
+            (namespace, ): values['hit'] / (values['hit'] + values['miss'])
+            for namespace, values in counts.items() if values['hit'] + values['miss']
+        },
+    }
+    return families
+
+
+def exposition(families):
+    """Prometheus text format (version 0.0.4)."""
+    lines = []
+    for name, family in sorted(families.items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        names = family['labelnames']
+        for labels, value in sorted(family['samples'].items()):
+            if family['kind'] != 'histogram':
+                lines.append(f'{name}{_labels(names, labels)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip([*family['buckets'], '+Inf'], value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(names, labels, [("le", _number(bound))])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(names, labels)} {_number(value[-1])}')
+            lines.append(f'{name}_count{_labels(names, labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def render():
+    return exposition(with_cache_ratios(collect_all()))
+
+
+# ============ API METRICS ============
+
+def _cache_lookups():
+    samples = {}
+    for namespace, values in catalog_cache.stats().items():
+        samples[(namespace, 'hit')] = values['hits']
+        samples[(namespace, 'miss')] = values['misses']
+    return samples
+
+
+_connections = weakref.WeakSet()
+_connections_lock = threading.Lock()
+
+
+def _open_connections():
+    samples = {(alias, ): 0 for alias in settings.DATABASES}
+    with _connections_lock:
+        wrappers = list(_connections)
+    for wrapper in wrappers:
+        if wrapper.connection is not None:
+            samples[(wrapper.alias, )] = samples.get((wrapper.alias, ), 0) + 1
+    return samples
+
+
+REQUESTS = Counter('api_requests_total', 'Requests by route, method and status class', ('route', 'method', 'status'))
+REQUEST_DURATION = Histogram('api_request_duration_seconds', 'Request latency by route', ('route',))
+REQUEST_DB_DURATION = Histogram('api_request_db_seconds', 'Database time of sampled requests', ('route',))
+REQUEST_QUERIES = Histogram('api_request_queries', 'Queries of sampled requests', ('route',), QUERY_BUCKETS)
+REQUESTS_IN_PROGRESS = Gauge('api_requests_in_progress', 'Requests being handled')
+CACHE_LOOKUPS = Counter(
+    'api_cache_requests_total', 'Catalog response cache lookups', ('namespace', 'result'), function=_cache_lookups,
+)
+DB_CONNECTIONS_OPEN = Gauge('api_db_connections_open', 'Open database connections', ('alias',), function=_open_connections)
+DB_CONNECTIONS_CREATED = Counter('api_db_connections_created_total', 'Database connections opened', ('alias', 'vendor'))
+
+
+def track_connection(connection):
+    with _connections_lock:
+        _connections.add(connection)
+    DB_CONNECTIONS_CREATED.inc(connection.alias, connection.vendor)
+
+
+def observe_request(route, method, status_code, seconds):
+    REQUESTS.inc(route, method if method in HTTP_METHODS else 'other', f'{status_code // 100}xx')
+    REQUEST_DURATION.observe(seconds, route)
+
+
+def observe_queries(route, seconds, count):
+    REQUEST_DB_DURATION.observe(seconds, route)
+    REQUEST_QUERIES.observe(count, route)
+
+
+def _quantile(buckets, row, q):
+    """Upper bound of the bucket holding the q-quantile (None past the last bucket)."""
+    total = sum(row[:-1])
+    if not total:
+        return None
+    seen = 0
+    for bound, count in zip(buckets, row):
+        seen += count
+        if seen >= q * total:
+            return bound
+    return None
+
+
+def route_stats():
+    """{route: requests, errors and latency / query percentiles} over all processes."""
+    families = collect_all()
+    stats = {}
+    for (route, _, status), count in families['api_requests_total']['samples'].items():
+        entry = stats.setdefault(route, {'requests': 0, 'errors_4xx': 0, 'errors_5xx': 0})
+        entry['requests'] += count
+        if status in ('4xx', '5xx'):
+            entry[f'errors_{status}'] += count
+    for name, suffix in (('api_request_duration_seconds', 'seconds'), ('api_request_queries', 'queries')):
+        family = families[name]
+        for (route, ), row in family['samples'].items():
+            entry = stats.setdefault(route, {})
+            for q in (0.5, 0.95, 0.99):
+                entry[f'p{int(q * 100)}_{suffix}'] = _quantile(family['buckets'], row, q)
+    return dict(sorted(stats.items()))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_quest_questcompletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='unique_views',
+            field=models.IntegerField(default=0, help_text='고유 조회자 수 (추정치)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='viewer_sketch',
+            field=models.BinaryField(default=bytes, editable=False, help_text='HyperLogLog 레지스터'),
+        ),
+    ]
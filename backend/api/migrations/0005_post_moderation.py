@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_post_unique_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='minhash_signature',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_flagged',
+            field=models.BooleanField(default=False, help_text='중복/스팸 의심'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='api.post'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='duplicate_score',
+            field=models.FloatField(blank=True, help_text='추정 유사도 (0-1)', null=True),
+        ),
+        migrations.CreateModel(
+            name='PostSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.SmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='api.post')),
+            ],
+            options={
+                'verbose_name': '게시글 LSH 버킷',
+                'verbose_name_plural': '게시글 LSH 버킷',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='post_lsh_bucket_idx')],
+            },
+        ),
+    ]
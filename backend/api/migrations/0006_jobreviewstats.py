@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:00
+
+import api.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_post_moderation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobReviewStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_stats', serialize=False, to='api.job')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_histogram', models.JSONField(default=api.models._empty_rating_histogram, help_text='1~5점 리뷰 수')),
+                ('pros_counts', models.JSONField(default=dict, help_text='장점 항목별 언급 수')),
+                ('cons_counts', models.JSONField(default=dict, help_text='단점 항목별 언급 수')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '직업 리뷰 통계',
+                'verbose_name_plural': '직업 리뷰 통계',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_jobreviewstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='careerreview',
+            index=models.Index(fields=['job', '-helpful_count', '-created_at', '-id'], name='review_job_helpful_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_careerreview_review_job_helpful_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('median_duration_months', models.FloatField(blank=True, help_text='이전 직업 재직 기간 중앙값 (개월)', null=True)),
+                ('median_salary_delta', models.IntegerField(blank=True, help_text='연봉 변화 중앙값 (만원)', null=True)),
+                ('story_samples', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('from_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions_out', to='api.job')),
+                ('to_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions_in', to='api.job')),
+            ],
+            options={
+                'verbose_name': '직업 전환 경로',
+                'verbose_name_plural': '직업 전환 경로',
+                'unique_together': {('from_job', 'to_job')},
+                'indexes': [
+                    models.Index(fields=['from_job', '-count'], name='transition_from_idx'),
+                    models.Index(fields=['to_job', '-count'], name='transition_to_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_jobtransition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalarySketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('years_band', models.CharField(default='all', help_text='경력 구간 (e.g., 0-2, 10+, all)', max_length=10)),
+                ('sample_count', models.IntegerField(default=0)),
+                ('sketch', models.JSONField(default=dict, help_text='KLL 스케치')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='salary_sketches', to='api.job')),
+            ],
+            options={
+                'verbose_name': '연봉 분포 스케치',
+                'verbose_name_plural': '연봉 분포 스케치',
+                'unique_together': {('job', 'years_band')},
+            },
+        ),
+    ]
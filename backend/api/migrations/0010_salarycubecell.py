@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_salarysketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalaryCubeCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('years_band', models.CharField(max_length=10)),
+                ('tier', models.CharField(choices=[('Unranked', 'Unranked'), ('Bronze', 'Bronze'), ('Silver', 'Silver'), ('Gold', 'Gold'), ('Platinum', 'Platinum'), ('Diamond', 'Diamond')], max_length=20)),
+                ('status', models.CharField(choices=[('None', '미인증'), ('Pending', '심사 중'), ('Verified', '인증 완료'), ('Rejected', '반려됨')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('salary_sum', models.BigIntegerField(default=0)),
+                ('salary_sum_sq', models.FloatField(default=0)),
+                ('sketch', models.JSONField(default=dict, help_text='KLL 스케치')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='salary_cube_cells', to='api.jobgroup')),
+            ],
+            options={
+                'verbose_name': '연봉 큐브 셀',
+                'verbose_name_plural': '연봉 큐브 셀',
+                'unique_together': {('job_group', 'years_band', 'tier', 'status')},
+            },
+        ),
+    ]
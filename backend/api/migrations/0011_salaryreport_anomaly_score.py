@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_salarycubecell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salaryreport',
+            name='anomaly_score',
+            field=models.FloatField(blank=True, db_index=True, help_text='이상치 점수 (|z|)', null=True),
+        ),
+        migrations.AddField(
+            model_name='salaryreport',
+            name='anomaly_scored_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_salaryreport_anomaly_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mechanicprofile',
+            name='salary_proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='salary_proofs/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='questcompletion',
+            name='proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='quest_proofs/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='salaryreport',
+            name='proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='salary_proofs/thumbs/'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:00
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_proof_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('digest', models.CharField(help_text='SHA-256', max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='저장소 경로', max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(db_index=True, default=0, help_text='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '미디어 파일',
+                'verbose_name_plural': '미디어 파일',
+            },
+        ),
+        migrations.AlterField(
+            model_name='mechanicprofile',
+            name='salary_proof_image',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.get_proof_storage, upload_to='salary_proofs/'),
+        ),
+        migrations.AlterField(
+            model_name='mechanicprofile',
+            name='salary_proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, storage=api.storage.get_proof_storage, upload_to='salary_proofs/thumbs/'),
+        ),
+        migrations.AlterField(
+            model_name='questcompletion',
+            name='proof_image',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.get_proof_storage, upload_to='quest_proofs/'),
+        ),
+        migrations.AlterField(
+            model_name='questcompletion',
+            name='proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, storage=api.storage.get_proof_storage, upload_to='quest_proofs/thumbs/'),
+        ),
+        migrations.AlterField(
+            model_name='salaryreport',
+            name='proof_image',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.get_proof_storage, upload_to='salary_proofs/'),
+        ),
+        migrations.AlterField(
+            model_name='salaryreport',
+            name='proof_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, storage=api.storage.get_proof_storage, upload_to='salary_proofs/thumbs/'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0013_mediablob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificationAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_status', models.CharField(choices=[('None', '미인증'), ('Pending', '심사 중'), ('Verified', '인증 완료'), ('Rejected', '반려됨')], max_length=10)),
+                ('status', models.CharField(choices=[('None', '미인증'), ('Pending', '심사 중'), ('Verified', '인증 완료'), ('Rejected', '반려됨')], max_length=10)),
+                ('reason', models.TextField(blank=True)),
+                ('batch', models.CharField(db_index=True, help_text='같은 일괄 처리 묶음', max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='verification_audits', to='api.mechanicprofile')),
+                ('report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='verification_audits', to='api.salaryreport')),
+                ('reviewer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '인증 이력',
+                'verbose_name_plural': '인증 이력',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
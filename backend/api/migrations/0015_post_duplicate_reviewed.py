@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_squashed_0014_verificationaudit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='duplicate_reviewed',
+            field=models.BooleanField(default=False, help_text='모더레이터가 정상 처리함 (재검사 시 다시 표시하지 않음)'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_user_tiers(apps, schema_editor):
+    # Existing reports take the author's current tier; run `rebuild_salary_cube` afterwards
+    SalaryReport = apps.get_model('api', 'SalaryReport')
+    MechanicProfile = apps.get_model('api', 'MechanicProfile')
+    SalaryReport.objects.update(
+        user_tier=Subquery(MechanicProfile.objects.filter(pk=OuterRef('user_id')).values('tier')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_post_duplicate_reviewed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salaryreport',
+            name='user_tier',
+            field=models.CharField(choices=[('Unranked', 'Unranked'), ('Bronze', 'Bronze'), ('Silver', 'Silver'), ('Gold', 'Gold'), ('Platinum', 'Platinum'), ('Diamond', 'Diamond')], default='Unranked', editable=False, help_text='작성 시점의 작성자 티어 (연봉 큐브 집계 기준)', max_length=20),
+        ),
+        migrations.RunPython(copy_user_tiers, migrations.RunPython.noop),
+    ]
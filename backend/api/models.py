@@ -3,6 +3,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .storage import get_proof_storage
+
 
 # ============ ENUMS ============
 
@@ -288,7 +290,8 @@ class MechanicProfile(models.Model):
 
     # Salary verification
     current_salary = models.IntegerField(null=True, blank=True, help_text='현재 연봉 (만원)')
-    salary_proof_image = models.ImageField(upload_to='salary_proofs/', null=True, blank=True)
+    salary_proof_image = models.ImageField(upload_to='salary_proofs/', storage=get_proof_storage, null=True, blank=True)
+    salary_proof_thumbnail = models.ImageField(upload_to='salary_proofs/thumbs/', storage=get_proof_storage, null=True, blank=True, editable=False)
     salary_verification_status = models.CharField(
         max_length=10,
         choices=VerificationStatus.choices,
@@ -349,6 +352,9 @@ class CareerReview(models.Model):
         verbose_name = "커리어 리뷰"
         verbose_name_plural = "커리어 리뷰"
         ordering = ['-helpful_count', '-created_at']
+        indexes = [
+            models.Index(fields=['job', '-helpful_count', '-created_at', '-id'], name='review_job_helpful_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author.name}"
@@ -366,6 +372,49 @@ class ReviewHelpful(models.Model):
         verbose_name_plural = "리뷰 도움됨"
 
 
+def _empty_rating_histogram():
+    return [0, 0, 0, 0, 0]
+
+
+class JobReviewStats(models.Model):
+    """Per-job review aggregates, maintained incrementally on CareerReview writes."""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='review_stats')
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_histogram = models.JSONField(default=_empty_rating_histogram, help_text='1~5점 리뷰 수')
+    pros_counts = models.JSONField(default=dict, help_text='장점 항목별 언급 수')
+    cons_counts = models.JSONField(default=dict, help_text='단점 항목별 언급 수')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    TOP_N = 5
+
+    class Meta:
+        verbose_name = "직업 리뷰 통계"
+        verbose_name_plural = "직업 리뷰 통계"
+
+    def __str__(self):
+        return f"{self.job_id}: {self.review_count} reviews"
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @staticmethod
+    def _top(counts, n):
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return [{'text': text, 'count': count} for text, count in ranked[:n]]
+
+    @property
+    def top_pros(self):
+        return self._top(self.pros_counts, self.TOP_N)
+
+    @property
+    def top_cons(self):
+        return self._top(self.cons_counts, self.TOP_N)
+
+
 # ============ SUCCESS STORIES ============
 
 class SuccessStory(models.Model):
@@ -405,6 +454,31 @@ class StoryJourneyStep(models.Model):
         ordering = ['story', 'order']
 
 
+class JobTransition(models.Model):
+    """Aggregated job-to-job move mined from consecutive StoryJourneySteps."""
+    from_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='transitions_out')
+    to_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='transitions_in')
+    count = models.IntegerField(default=0)
+    median_duration_months = models.FloatField(null=True, blank=True, help_text='이전 직업 재직 기간 중앙값 (개월)')
+    median_salary_delta = models.IntegerField(null=True, blank=True, help_text='연봉 변화 중앙값 (만원)')
+
+    # {story_id: [duration_months, salary_delta]} so a story can be re-applied incrementally
+    story_samples = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "직업 전환 경로"
+        verbose_name_plural = "직업 전환 경로"
+        unique_together = ['from_job', 'to_job']
+        indexes = [
+            models.Index(fields=['from_job', '-count'], name='transition_from_idx'),
+            models.Index(fields=['to_job', '-count'], name='transition_to_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.from_job_id} → {self.to_job_id} ({self.count})"
+
+
 # ============ COMMUNITY ============
 
 class PostCategory(models.TextChoices):
@@ -427,12 +501,23 @@ class Post(models.Model):
     # Engagement
     likes = models.IntegerField(default=0)
     views = models.IntegerField(default=0)
+    unique_views = models.IntegerField(default=0, help_text='고유 조회자 수 (추정치)')
+    viewer_sketch = models.BinaryField(default=bytes, editable=False, help_text='HyperLogLog 레지스터')
     comment_count = models.IntegerField(default=0)
 
     # Settings
     show_verified_salary = models.BooleanField(default=False)
     is_pinned = models.BooleanField(default=False)
 
+    # Moderation (near-duplicate detection)
+    minhash_signature = models.BinaryField(null=True, blank=True, editable=False)
+    is_flagged = models.BooleanField(default=False, help_text='중복/스팸 의심')
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='near_duplicates'
+    )
+    duplicate_score = models.FloatField(null=True, blank=True, help_text='추정 유사도 (0-1)')
+    duplicate_reviewed = models.BooleanField(default=False, help_text='모더레이터가 정상 처리함 (재검사 시 다시 표시하지 않음)')
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -445,6 +530,18 @@ class Post(models.Model):
         return f"[{self.get_category_display()}] {self.title}"
 
 
+class PostSignatureBand(models.Model):
+    """LSH bucket of a post's MinHash signature, one row per band."""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='signature_bands')
+    band = models.SmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = "게시글 LSH 버킷"
+        verbose_name_plural = "게시글 LSH 버킷"
+        indexes = [models.Index(fields=['band', 'bucket'], name='post_lsh_bucket_idx')]
+
+
 class Comment(models.Model):
     """Comments on posts."""
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -515,7 +612,8 @@ class QuestCompletion(models.Model):
     """Quest completion records."""
     profile = models.ForeignKey(MechanicProfile, on_delete=models.CASCADE, related_name='quest_completions')
     quest = models.ForeignKey(Quest, on_delete=models.CASCADE, related_name='completions')
-    proof_image = models.ImageField(upload_to='quest_proofs/', null=True, blank=True)
+    proof_image = models.ImageField(upload_to='quest_proofs/', storage=get_proof_storage, null=True, blank=True)
+    proof_thumbnail = models.ImageField(upload_to='quest_proofs/thumbs/', storage=get_proof_storage, null=True, blank=True, editable=False)
     notes = models.TextField(blank=True)
 
     is_verified = models.BooleanField(default=True)
@@ -540,16 +638,25 @@ class SalaryReport(models.Model):
     estimated_salary = models.IntegerField(help_text='시장 가치 (만원)')
     years_experience = models.IntegerField()
     percentile = models.IntegerField(default=50, help_text='0-100 백분위')
+    user_tier = models.CharField(
+        max_length=20, choices=Tier.choices, default=Tier.UNRANKED, editable=False,
+        help_text='작성 시점의 작성자 티어 (연봉 큐브 집계 기준)'
+    )
 
     # Stats snapshot
     user_stats = models.JSONField(default=dict)
 
     # Verification
-    proof_image = models.ImageField(upload_to='salary_proofs/', null=True, blank=True)
+    proof_image = models.ImageField(upload_to='salary_proofs/', storage=get_proof_storage, null=True, blank=True)
+    proof_thumbnail = models.ImageField(upload_to='salary_proofs/thumbs/', storage=get_proof_storage, null=True, blank=True, editable=False)
     status = models.CharField(max_length=10, choices=VerificationStatus.choices, default=VerificationStatus.NONE)
     verified_at = models.DateTimeField(null=True, blank=True)
     rejection_reason = models.TextField(blank=True)
 
+    # Triage: robust z-score of salary vs. experience among pending reports of the job
+    anomaly_score = models.FloatField(null=True, blank=True, db_index=True, help_text='이상치 점수 (|z|)')
+    anomaly_scored_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -564,3 +671,87 @@ class SalaryReport(models.Model):
     @property
     def salary_gap(self):
         return self.estimated_salary - self.current_salary
+
+
+class SalarySketch(models.Model):
+    """Mergeable quantile sketch of verified salaries for one job and years band."""
+    ALL_YEARS = 'all'
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='salary_sketches')
+    years_band = models.CharField(max_length=10, default=ALL_YEARS, help_text="경력 구간 (e.g., 0-2, 10+, all)")
+    sample_count = models.IntegerField(default=0)
+    sketch = models.JSONField(default=dict, help_text='KLL 스케치')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "연봉 분포 스케치"
+        verbose_name_plural = "연봉 분포 스케치"
+        unique_together = ['job', 'years_band']
+
+    def __str__(self):
+        return f"{self.job_id} [{self.years_band}] n={self.sample_count}"
+
+
+class SalaryCubeCell(models.Model):
+    """Pre-aggregated SalaryReport cell: job group x years band x user tier x status."""
+    job_group = models.ForeignKey(JobGroup, on_delete=models.CASCADE, related_name='salary_cube_cells')
+    years_band = models.CharField(max_length=10)
+    tier = models.CharField(max_length=20, choices=Tier.choices)
+    status = models.CharField(max_length=10, choices=VerificationStatus.choices)
+
+    count = models.IntegerField(default=0)
+    salary_sum = models.BigIntegerField(default=0)
+    salary_sum_sq = models.FloatField(default=0)
+    sketch = models.JSONField(default=dict, help_text='KLL 스케치')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "연봉 큐브 셀"
+        verbose_name_plural = "연봉 큐브 셀"
+        unique_together = ['job_group', 'years_band', 'tier', 'status']
+
+    def __str__(self):
+        return f"{self.job_group_id}/{self.years_band}/{self.tier}/{self.status} n={self.count}"
+
+
+class VerificationAudit(models.Model):
+    """One salary verification decision on a report or a profile."""
+    report = models.ForeignKey(
+        SalaryReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='verification_audits'
+    )
+    profile = models.ForeignKey(
+        MechanicProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='verification_audits'
+    )
+    previous_status = models.CharField(max_length=10, choices=VerificationStatus.choices)
+    status = models.CharField(max_length=10, choices=VerificationStatus.choices)
+    reason = models.TextField(blank=True)
+    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    batch = models.CharField(max_length=32, db_index=True, help_text='같은 일괄 처리 묶음')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "인증 이력"
+        verbose_name_plural = "인증 이력"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        target = f"report #{self.report_id}" if self.report_id else f"profile #{self.profile_id}"
+        return f"{target}: {self.previous_status} → {self.status}"
+
+
+# ============ MEDIA STORAGE ============
+
+class MediaBlob(models.Model):
+    """A stored proof image file, shared by every field whose content hashes to the same digest."""
+    digest = models.CharField(max_length=64, primary_key=True, help_text='SHA-256')
+    name = models.CharField(max_length=255, unique=True, help_text='저장소 경로')
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0, db_index=True, help_text='참조 수')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "미디어 파일"
+        verbose_name_plural = "미디어 파일"
+
+    def __str__(self):
+        return f"{self.name} (refs={self.ref_count})"
@@ -0,0 +1,75 @@
+"""Near-duplicate / copy-paste spam detection for community posts."""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Post, PostSignatureBand
+from .sketches import MinHash
+
+
+minhash = MinHash()
+
+
+def _post_text(post):
+    return f'{post.title}\n{post.content}'
+
+
+@transaction.atomic
+def index_post(post):
+    """Store the post's MinHash signature and flag it if it near-duplicates another post.
+
+    Only earlier posts sharing at least one LSH bucket are compared, so the
+    cost is independent of the total number of posts and an original is never
+    marked as a copy of a later post. Re-indexing an edited post clears a
+    duplicate flag it no longer earns; posts a moderator cleared
+    (``duplicate_reviewed``) are never flagged again.
+    """
+    text = _post_text(post)
+    buckets = []
+    best_id, best_score = None, 0.0
+    if minhash.shingles(text):
+        signature = minhash.signature(text)
+        buckets = minhash.band_buckets(signature)
+
+        bucket_filter = Q()
+        for band, bucket in enumerate(buckets):
+            bucket_filter |= Q(band=band, bucket=bucket)
+        candidate_ids = set(
+            PostSignatureBand.objects.filter(bucket_filter, post_id__lt=post.pk)
+            .values_list('post_id', flat=True)
+        )
+
+        candidates = Post.objects.filter(pk__in=candidate_ids).values_list('pk', 'minhash_signature')
+        for candidate_id, packed in candidates:
+            if not packed:
+                continue
+            score = minhash.similarity(signature, minhash.unpack(packed))
+            if score > best_score:
+                best_id, best_score = candidate_id, score
+        post.minhash_signature = minhash.pack(signature)
+    else:
+        post.minhash_signature = None
+
+    threshold = getattr(settings, 'POST_DUPLICATE_THRESHOLD', 0.8)
+    post.duplicate_score = best_score if best_id else None
+    if best_id and best_score >= threshold and not post.duplicate_reviewed:
+        post.is_flagged = True
+        post.duplicate_of_id = best_id
+    elif post.duplicate_of_id is not None:
+        # Flagged as a copy before the edit
+        post.is_flagged = False
+        post.duplicate_of_id = None
+    Post.objects.filter(pk=post.pk).update(
+        minhash_signature=post.minhash_signature,
+        duplicate_score=post.duplicate_score,
+        is_flagged=post.is_flagged,
+        duplicate_of=post.duplicate_of_id,
+    )
+
+    PostSignatureBand.objects.filter(post=post).delete()
+    PostSignatureBand.objects.bulk_create([
+        PostSignatureBand(post=post, band=band, bucket=bucket)
+        for band, bucket in enumerate(buckets)
+    ])
+    return post.duplicate_of_id
@@ -0,0 +1,226 @@
+"""Pagination classes for the API."""
+
+import base64
+import hashlib
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardPagination(PageNumberPagination):
+    """Page-number pagination with a client-selectable page size."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+# ============ APPROXIMATE COUNTS ============
+
+def estimate_count(queryset):
+    """Row estimate without a full COUNT(*).
+
+    PostgreSQL answers from planner statistics: ``pg_class.reltuples`` for a
+    whole table, the EXPLAIN row estimate for a filtered queryset. Other
+    databases count once and keep the result for APPROXIMATE_COUNT_SECONDS.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            if not queryset.query.where and not queryset.query.distinct:
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+                # -1 until the table has been analyzed
+                if row and row[0] >= 0:
+                    return row[0]
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{queryset.db}:{sql}:{params}'.encode(), usedforsecurity=False).hexdigest()
+    key = f'pagination:count:{digest}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(settings, 'APPROXIMATE_COUNT_SECONDS', 300))
+    return count
+
+
+class ApproximatePage(Page):
+    """Page whose ``has_next`` comes from a look-ahead row, not from the count."""
+
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator that estimates ``count`` once a result exceeds APPROXIMATE_COUNT_THRESHOLD rows.
+
+    Smaller results are counted exactly (the check itself is a COUNT over at
+    most threshold + 1 rows). With an estimate, pages past the estimated end
+    are still served and the next link depends on a look-ahead row.
+    Also used by the admin changelists of the large tables.
+    """
+    is_approximate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        threshold = getattr(settings, 'APPROXIMATE_COUNT_THRESHOLD', 10_000)
+        capped = self.object_list.order_by()[:threshold + 1].count()
+        if capped <= threshold:
+            return capped
+        self.is_approximate = True
+        # An estimate below the rows already seen would hide existing pages
+        return max(estimate_count(self.object_list), capped)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Past the estimated last page: served when the count is an estimate
+            if not self.is_approximate or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return ApproximatePage(rows[:self.per_page], number, self, more=len(rows) > self.per_page)
+
+
+class ApproximatePagination(StandardPagination):
+    """Default API pagination: page numbers with approximate counts on large results."""
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_approximate': self.page.paginator.is_approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_approximate'] = {'type': 'boolean'}
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """Seek-method pagination over a fixed, index-backed ordering.
+
+    The cursor stores the ordering values of the last row on the page, so each
+    page is a range scan of the index instead of an OFFSET.
+    """
+    ordering = ('-id',)
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def _fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj):
+        values = []
+        for name, _ in self._fields():
+            field = obj._meta.get_field(name)
+            values.append(field.value_to_string(obj))
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, model, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list):
+                raise ValueError(values)
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self._fields(), values, strict=True)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            raise NotFound('Invalid cursor')
+        if any(value is None for value in values):
+            raise NotFound('Invalid cursor')
+        return values
+
+    def seek_filter(self, values):
+        """(a, b, c) < (x, y, z) in ordering direction, as OR-ed equality prefixes."""
+        fields = self._fields()
+        clauses = []
+        for i, ((name, descending), value) in enumerate(zip(fields, values)):
+            prefix = {fields[j][0]: values[j] for j in range(i)}
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            clauses.append(Q(**prefix, **{lookup: value}))
+        return reduce(or_, clauses)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.seek_filter(self.decode_cursor(queryset.model, cursor)))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ReviewKeysetPagination(KeysetPagination):
+    """Helpful-first review lists, served by the (job, -helpful_count, -created_at, -id) index."""
+    ordering = ('-helpful_count', '-created_at', '-id')
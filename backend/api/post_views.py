@@ -0,0 +1,110 @@
+"""Buffered unique-viewer counting for community posts.
+
+Views are recorded into per-post HyperLogLog sketches held in process memory
+and merged into ``Post.viewer_sketch`` periodically, so a GET no longer costs
+a database write.
+
+Buffered views live only in memory: a graceful exit flushes them (``atexit``),
+but a killed or crashed worker loses what it recorded since its last flush,
+at most POST_VIEW_FLUSH_SECONDS of views. While a flush is being written its
+batch stays visible to ``record_view``, and a failed write puts it back into
+the buffer.
+"""
+
+import atexit
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import Post
+from .sketches import HyperLogLog
+
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_pending = {}  # post_id -> [HyperLogLog, raw view count]
+_flushing = {}  # same, for the batch being written
+_last_flush = time.monotonic()
+
+
+def viewer_key(request):
+    """Identify a viewer by profile id, falling back to IP + user agent."""
+    profile_id = request.query_params.get('profile_id')
+    if profile_id:
+        return f'profile:{profile_id}'
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    ip = forwarded.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    agent = request.META.get('HTTP_USER_AGENT', '')
+    return 'anon:' + hashlib.sha1(f'{ip}|{agent}'.encode('utf-8')).hexdigest()
+
+
+def record_view(post, key):
+    """Record a view of ``post`` and reflect buffered counts on the instance."""
+    with _lock:
+        entry = _pending.get(post.pk)
+        if entry is None:
+            entry = _pending[post.pk] = [HyperLogLog(), 0]
+        entry[0].add(key)
+        entry[1] += 1
+        sketch = HyperLogLog.from_bytes(post.viewer_sketch).merge(entry[0])
+        post.views += entry[1]
+        in_flight = _flushing.get(post.pk)
+        if in_flight is not None:
+            sketch.merge(in_flight[0])
+            post.views += in_flight[1]
+        post.unique_views = sketch.count()
+        due = time.monotonic() - _last_flush >= getattr(settings, 'POST_VIEW_FLUSH_SECONDS', 60)
+    if due:
+        flush()
+
+
+def _requeue(batch):
+    """Put an unwritten batch back into the buffer (caller holds ``_lock``)."""
+    for post_id, (sketch, views) in batch.items():
+        entry = _pending.get(post_id)
+        if entry is None:
+            _pending[post_id] = [sketch, views]
+        else:
+            entry[0].merge(sketch)
+            entry[1] += views
+
+
+def flush():
+    """Merge all buffered sketches into the database."""
+    global _last_flush
+    with _flush_lock:
+        with _lock:
+            batch = dict(_pending)
+            _pending.clear()
+            _flushing.update(batch)
+            _last_flush = time.monotonic()
+
+        try:
+            for post_id, (sketch, views) in batch.items():
+                with transaction.atomic():
+                    stored = (
+                        Post.objects.select_for_update().filter(pk=post_id)
+                        .values_list('viewer_sketch', flat=True).first()
+                    )
+                    if stored is not None:
+                        merged = HyperLogLog.from_bytes(stored).merge(sketch)
+                        Post.objects.filter(pk=post_id).update(
+                            viewer_sketch=merged.to_bytes(),
+                            unique_views=merged.count(),
+                            views=F('views') + views,
+                        )
+                with _lock:
+                    _flushing.pop(post_id, None)
+        except Exception:
+            with _lock:
+                _requeue(_flushing)
+                _flushing.clear()
+            raise
+    return len(batch)
+
+
+atexit.register(flush)
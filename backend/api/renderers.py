@@ -0,0 +1,35 @@
+"""JSON renderer backed by orjson, producing the same bytes as DRF's JSONRenderer."""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Datetimes are passed through so DRF's formatting (ms precision, 'Z') applies
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Compact UTF-8 JSON via orjson; defers to JSONRenderer for indented or unsupported output."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            or not (self.compact and not self.ensure_ascii)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:  # e.g. integers beyond 64 bits or non-string keys
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping of U+2028/U+2029 as JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
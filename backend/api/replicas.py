@@ -0,0 +1,86 @@
+"""Read/write splitting across the primary database and read replicas.
+
+Reads go to a replica only inside a ``ReplicaReadMixin`` viewset handling a
+safe method; everything else uses ``default``. Any write pins the rest of the
+request to the primary, and ``ReplicaPinMiddleware`` sets a short-lived
+cookie so the same client also reads its own writes on the next requests,
+while the replicas catch up.
+"""
+
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_pin'
+
+_state = Local()
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def reading_from_replica(enabled=True):
+    previous = getattr(_state, 'use_replica', False)
+    _state.use_replica = enabled
+    try:
+        yield
+    finally:
+        _state.use_replica = previous
+
+
+class ReplicaRouter:
+    """Route reads to a random replica when allowed; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if getattr(_state, 'use_replica', False) and not getattr(_state, 'pinned', False) and replicas():
+            return random.choice(replicas())
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        _state.pinned = True
+        _state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaPinMiddleware:
+    """Keep clients that wrote recently on the primary for REPLICA_PIN_SECONDS."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.pinned = PIN_COOKIE in request.COOKIES
+        _state.wrote = False
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = _state.wrote
+            _state.pinned = _state.wrote = False
+        if wrote and replicas():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests of a viewset from a read replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with reading_from_replica(request.method in SAFE_METHODS):
+            return super().dispatch(request, *args, **kwargs)
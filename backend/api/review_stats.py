@@ -0,0 +1,77 @@
+"""Incremental maintenance of JobReviewStats."""
+
+from collections import Counter
+
+from django.db import transaction
+
+from . import catalog_cache
+from .models import CareerReview, JobReviewStats
+
+
+def snapshot(review):
+    """The parts of a review that contribute to its job's aggregates."""
+    return {
+        'job_id': review.job_id,
+        'rating': review.rating,
+        'pros': list(review.pros or []),
+        'cons': list(review.cons or []),
+    }
+
+
+def _bump(counts, items, sign):
+    for item in items:
+        key = str(item).strip()
+        if not key:
+            continue
+        value = counts.get(key, 0) + sign
+        if value > 0:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+
+def _apply_to(stats, snap, sign):
+    stats.review_count += sign
+    stats.rating_sum += sign * snap['rating']
+    bucket = min(5, max(1, snap['rating'])) - 1
+    stats.rating_histogram[bucket] += sign
+    _bump(stats.pros_counts, snap['pros'], sign)
+    _bump(stats.cons_counts, snap['cons'], sign)
+
+
+@transaction.atomic
+def apply(snap, sign):
+    """Add (sign=1) or remove (sign=-1) one review snapshot from its job's stats."""
+    stats, _ = JobReviewStats.objects.select_for_update().get_or_create(job_id=snap['job_id'])
+    _apply_to(stats, snap, sign)
+    stats.save()
+
+
+@transaction.atomic
+def rebuild(job_ids=None):
+    """Recompute stats from scratch in one streaming pass over the reviews."""
+    reviews = CareerReview.objects.order_by().values('job_id', 'rating', 'pros', 'cons')
+    existing = JobReviewStats.objects.all()
+    if job_ids is not None:
+        reviews = reviews.filter(job_id__in=job_ids)
+        existing = existing.filter(job_id__in=job_ids)
+
+    stats = {}
+    pros, cons = {}, {}
+    for row in reviews.iterator(chunk_size=2000):
+        job_id = row['job_id']
+        if job_id not in stats:
+            stats[job_id] = JobReviewStats(job_id=job_id)
+            pros[job_id], cons[job_id] = Counter(), Counter()
+        _apply_to(stats[job_id], {**row, 'pros': [], 'cons': []}, 1)
+        pros[job_id].update(str(p).strip() for p in row['pros'] or [] if str(p).strip())
+        cons[job_id].update(str(c).strip() for c in row['cons'] or [] if str(c).strip())
+
+    for job_id, item in stats.items():
+        item.pros_counts = dict(pros[job_id])
+        item.cons_counts = dict(cons[job_id])
+
+    existing.delete()
+    JobReviewStats.objects.bulk_create(stats.values(), batch_size=500)
+    transaction.on_commit(lambda: catalog_cache.invalidate('jobs'))
+    return len(stats)
@@ -0,0 +1,91 @@
+"""Salary estimation engine (server-side port of frontend salaryCalculator.ts).
+
+All functions are vectorized with NumPy so a whole grid of
+jobs x years x key-stat values is evaluated in a single call.
+"""
+
+import numpy as np
+
+
+STAT_KEYS = ['T', 'H', 'S', 'A', 'B']
+REQ_FIELDS = ['req_tech', 'req_hand', 'req_speed', 'req_art', 'req_biz']
+
+
+def salary_params(jobs):
+    """Per-job model parameters as arrays: base, cap, growth rate, key stat index.
+
+    Mirrors ``createSalaryInfoFromJob``: the key stat is the highest required
+    stat (the last one wins on ties) and the growth rate scales with the spread.
+    """
+    rows = [
+        (job['salary_min'], job['salary_max'], [job[field] for field in REQ_FIELDS])
+        if isinstance(job, dict) else
+        (job.salary_min, job.salary_max, [getattr(job, field) for field in REQ_FIELDS])
+        for job in jobs
+    ]
+    base = np.array([row[0] for row in rows], dtype=np.float64)
+    cap = np.array([row[1] for row in rows], dtype=np.float64)
+    required = np.array([row[2] for row in rows], dtype=np.int64).reshape(len(rows), len(REQ_FIELDS))
+    key_stat = len(REQ_FIELDS) - 1 - np.argmax(required[:, ::-1], axis=1)
+    growth = np.clip((cap - base) / 20000, 0.1, 0.3)
+    return base, cap, growth, key_stat
+
+
+def _js_round(values):
+    # Math.round rounds halves up, np.round rounds them to even
+    return np.floor(values + 0.5)
+
+
+def estimate(base, cap, growth, years, stat_values):
+    """Estimated salary (만원), broadcasting over all array arguments.
+
+    salary = base + base * ln(years + 1) * growth * 4 + max(0, stat - 50) * 10,
+    capped at the job's salary_max.
+    """
+    years = np.asarray(years, dtype=np.float64)
+    stat_values = np.asarray(stat_values, dtype=np.float64)
+    stat_values = np.where(stat_values == 0, 50, stat_values)
+    exp_factor = np.log(years + 1) * (growth * 4)
+    stat_bonus = np.maximum(0, (stat_values - 50) * 10)
+    total = base + base * exp_factor + stat_bonus
+    return np.minimum(_js_round(total), cap).astype(np.int64)
+
+
+def estimate_grid(jobs, years, stat_values):
+    """Estimates for every (job, years, key stat value) as a (J, Y, S) int array."""
+    base, cap, growth, _ = salary_params(jobs)
+    return estimate(
+        base[:, None, None], cap[:, None, None], growth[:, None, None],
+        np.asarray(years)[None, :, None], np.asarray(stat_values)[None, None, :],
+    )
+
+
+def percentile_rank(salaries, salary_min, salary_max):
+    """Percentile of a salary on the synthetic normal curve between min and max.
+
+    Uses the same Abramowitz-Stegun CDF approximation as ``getPercentileRank``.
+    A job without a salary range (min == max) is a step: 0 below, 50 at and
+    100 above the single value.
+    """
+    salaries = np.asarray(salaries, dtype=np.float64)
+    salary_min = np.asarray(salary_min, dtype=np.float64)
+    salary_max = np.asarray(salary_max, dtype=np.float64)
+    mean = (salary_min + salary_max) / 2
+    std_dev = (salary_max - salary_min) / 6
+    flat = std_dev <= 0
+    z = (salaries - mean) / np.where(flat, 1.0, std_dev)
+    t = 1 / (1 + 0.2316419 * np.abs(z))
+    d = 0.3989423 * np.exp(-z * z / 2)
+    p = d * t * (0.3193815 + t * (-0.3565638 + t * (1.781478 + t * (-1.821256 + t * 1.330274))))
+    percentile = np.where(z > 0, (1 - p) * 100, p * 100)
+    step = np.sign(salaries - mean) * 50 + 50
+    return _js_round(np.where(flat, step, percentile)).astype(np.int64)
+
+
+def estimate_for_profile(job, years, user_stats):
+    """(estimated_salary, percentile) for one job and a T/H/S/A/B stats dict."""
+    base, cap, growth, key_stat = salary_params([job])
+    stat_value = (user_stats or {}).get(STAT_KEYS[key_stat[0]]) or 50
+    salary = int(estimate(base, cap, growth, years, stat_value)[0])
+    percentile = int(percentile_rank(salary, job.salary_min, job.salary_max))
+    return salary, percentile
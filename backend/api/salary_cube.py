@@ -0,0 +1,146 @@
+"""Salary cohort cube: SalaryReport pre-aggregated by job group, years band, tier and status.
+
+Each cell keeps count, sum, sum of squares and a KLL sketch, so any roll-up
+or drill-down is answered by merging cells instead of scanning reports.
+The tier dimension is ``SalaryReport.user_tier``, the author's tier when the
+report was filed, so later tier changes never move a report between cells.
+"""
+
+import math
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import SalaryCubeCell, SalaryReport
+from .salary_stats import YEARS_BANDS, years_band
+from .sketches import KLLSketch
+
+
+ROW_FIELDS = ('target_job__group_id', 'years_experience', 'user_tier', 'status', 'current_salary')
+DIMENSIONS = {
+    'group': 'job_group__code',
+    'years_band': 'years_band',
+    'tier': 'tier',
+    'status': 'status',
+}
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+def cell_key(row):
+    return (row['target_job__group_id'], years_band(row['years_experience']), row['user_tier'], row['status'])
+
+
+def report_rows(queryset):
+    """Cube-relevant values of each report in ``queryset``."""
+    return list(queryset.order_by().values(*ROW_FIELDS))
+
+
+def _cell_reports(key):
+    group_id, band, tier, status = key
+    reports = SalaryReport.objects.filter(target_job__group_id=group_id, user_tier=tier, status=status)
+    low, high = next((low, high) for low, high, label in YEARS_BANDS if label == band)
+    reports = reports.filter(years_experience__gte=low)
+    if high is not None:
+        reports = reports.filter(years_experience__lte=high)
+    return reports.order_by()
+
+
+@transaction.atomic
+def apply(rows, sign):
+    """Add (sign=1) or remove (sign=-1) report rows from their cells.
+
+    Removals recompute the affected cell's sketch from that cell's reports
+    only, because quantile sketches cannot forget samples.
+    """
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[cell_key(row)].append(row['current_salary'])
+
+    for key, salaries in grouped.items():
+        group_id, band, tier, status = key
+        cell, _ = SalaryCubeCell.objects.select_for_update().get_or_create(
+            job_group_id=group_id, years_band=band, tier=tier, status=status
+        )
+        cell.count += sign * len(salaries)
+        cell.salary_sum += sign * sum(salaries)
+        cell.salary_sum_sq += sign * sum(float(s) * s for s in salaries)
+        if cell.count <= 0:
+            cell.delete()
+            continue
+        if sign > 0:
+            sketch = KLLSketch.from_dict(cell.sketch) if cell.sketch else KLLSketch()
+            for salary in salaries:
+                sketch.update(salary)
+        else:
+            sketch = KLLSketch()
+            for salary in _cell_reports(key).values_list('current_salary', flat=True).iterator():
+                sketch.update(salary)
+        cell.sketch = sketch.to_dict()
+        cell.save()
+
+
+def move(old_rows, new_rows):
+    """Re-bucket reports whose cube values changed (e.g. a status update)."""
+    with transaction.atomic():
+        apply(old_rows, -1)
+        apply(new_rows, 1)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute the whole cube in one pass over SalaryReport."""
+    cells = {}
+    for row in SalaryReport.objects.order_by().values(*ROW_FIELDS).iterator(chunk_size=5000):
+        key = cell_key(row)
+        cell = cells.get(key)
+        if cell is None:
+            group_id, band, tier, status = key
+            cell = cells[key] = SalaryCubeCell(job_group_id=group_id, years_band=band, tier=tier, status=status)
+            cell._sketch = KLLSketch()
+        salary = row['current_salary']
+        cell.count += 1
+        cell.salary_sum += salary
+        cell.salary_sum_sq += float(salary) * salary
+        cell._sketch.update(salary)
+
+    for cell in cells.values():
+        cell.sketch = cell._sketch.to_dict()
+    SalaryCubeCell.objects.all().delete()
+    SalaryCubeCell.objects.bulk_create(cells.values(), batch_size=500)
+    return len(cells)
+
+
+def query(filters=None, group_by=()):
+    """Roll up cells matching ``filters`` (dimension -> value), grouped by ``group_by`` dimensions.
+
+    Returns one dict per group with count, mean, std and salary quantiles.
+    """
+    unknown = set(filters or {}) - set(DIMENSIONS) | set(group_by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+
+    cells = SalaryCubeCell.objects.filter(**{DIMENSIONS[dim]: value for dim, value in (filters or {}).items()})
+    columns = [DIMENSIONS[dim] for dim in group_by]
+    rollup = {}
+    for cell in cells.values(*columns, 'count', 'salary_sum', 'salary_sum_sq', 'sketch'):
+        key = tuple(cell[column] for column in columns)
+        acc = rollup.setdefault(key, {'count': 0, 'sum': 0, 'sum_sq': 0.0, 'sketch': KLLSketch()})
+        acc['count'] += cell['count']
+        acc['sum'] += cell['salary_sum']
+        acc['sum_sq'] += cell['salary_sum_sq']
+        if cell['sketch']:
+            acc['sketch'].merge(KLLSketch.from_dict(cell['sketch']))
+
+    results = []
+    for key, acc in sorted(rollup.items(), key=lambda item: tuple(str(v) for v in item[0])):
+        count = acc['count']
+        mean = acc['sum'] / count
+        variance = max(0.0, acc['sum_sq'] / count - mean * mean)
+        results.append({
+            **dict(zip(group_by, key)),
+            'count': count,
+            'mean': round(mean, 1),
+            'std': round(math.sqrt(variance), 1),
+            'quantiles': {str(q): acc['sketch'].quantile(q) for q in QUANTILES},
+        })
+    return results
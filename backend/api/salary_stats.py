@@ -0,0 +1,172 @@
+"""Real salary percentiles from verified data, kept as per-job KLL sketches."""
+
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Job, MechanicProfile, SalaryReport, SalarySketch, VerificationStatus
+from .sketches import KLLSketch
+
+
+YEARS_BANDS = [(0, 2, '0-2'), (3, 5, '3-5'), (6, 9, '6-9'), (10, None, '10+')]
+
+DISTRIBUTION_POINTS = 31
+DISTRIBUTION_CACHE_KEY = 'salary_distribution:{}'
+
+_cache = {}  # (job_id, band) -> (loaded_at, KLLSketch)
+_cache_lock = threading.Lock()
+
+
+def years_band(years):
+    for low, high, label in YEARS_BANDS:
+        if years >= low and (high is None or years <= high):
+            return label
+    return YEARS_BANDS[0][2]
+
+
+def verified_samples(job_ids=None):
+    """Yield (job_id, years_experience, salary) for every verified salary."""
+    reports = SalaryReport.objects.filter(status=VerificationStatus.VERIFIED).order_by()
+    profiles = MechanicProfile.objects.filter(
+        salary_verification_status=VerificationStatus.VERIFIED,
+        current_job__isnull=False, current_salary__isnull=False,
+    ).order_by()
+    if job_ids is not None:
+        reports = reports.filter(target_job_id__in=job_ids)
+        profiles = profiles.filter(current_job_id__in=job_ids)
+    yield from reports.values_list('target_job_id', 'years_experience', 'current_salary').iterator(chunk_size=5000)
+    yield from profiles.values_list('current_job_id', 'years_experience', 'current_salary').iterator(chunk_size=5000)
+
+
+def _group(samples):
+    sketches = defaultdict(KLLSketch)
+    for job_id, years, salary in samples:
+        sketches[(job_id, SalarySketch.ALL_YEARS)].update(salary)
+        sketches[(job_id, years_band(years))].update(salary)
+    return sketches
+
+
+def _invalidate(keys):
+    with _cache_lock:
+        for key in keys:
+            _cache.pop(key, None)
+    cache.delete_many([DISTRIBUTION_CACHE_KEY.format(job_id) for job_id, _ in keys])
+
+
+@transaction.atomic
+def add_samples(samples):
+    """Merge newly verified (job_id, years, salary) samples into stored sketches."""
+    grouped = _group(samples)
+    for (job_id, band), fresh in grouped.items():
+        row, _ = SalarySketch.objects.select_for_update().get_or_create(job_id=job_id, years_band=band)
+        merged = KLLSketch.from_dict(row.sketch).merge(fresh) if row.sketch else fresh
+        row.sketch = merged.to_dict()
+        row.sample_count = merged.n
+        row.save()
+    _invalidate(grouped)
+    transaction.on_commit(lambda: precompute_distributions({job_id for job_id, _ in grouped}))
+    return len(grouped)
+
+
+@transaction.atomic
+def rebuild(job_ids=None):
+    """Recompute sketches from all verified data (needed when samples are removed)."""
+    grouped = _group(verified_samples(job_ids))
+    existing = SalarySketch.objects.all()
+    if job_ids is not None:
+        existing = existing.filter(job_id__in=job_ids)
+    stale = set(existing.values_list('job_id', 'years_band'))
+    existing.delete()
+    SalarySketch.objects.bulk_create([
+        SalarySketch(job_id=job_id, years_band=band, sketch=sketch.to_dict(), sample_count=sketch.n)
+        for (job_id, band), sketch in grouped.items()
+    ], batch_size=500)
+    _invalidate(stale | set(grouped))
+    transaction.on_commit(lambda: precompute_distributions({job_id for job_id, _ in stale | set(grouped)}))
+    return len(grouped)
+
+
+def get_sketch(job_id, band=SalarySketch.ALL_YEARS):
+    """Deserialized sketch, cached in process memory for SALARY_SKETCH_CACHE_SECONDS."""
+    key = (int(job_id), band)
+    ttl = getattr(settings, 'SALARY_SKETCH_CACHE_SECONDS', 60)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    data = SalarySketch.objects.filter(job_id=key[0], years_band=band).values_list('sketch', flat=True).first()
+    sketch = KLLSketch.from_dict(data) if data else None
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), sketch)
+    return sketch
+
+
+def percentile(job_id, salary, years=None):
+    """(percentile 0-100, sample count) of a salary among verified salaries, or (None, n)."""
+    band = years_band(years) if years is not None else SalarySketch.ALL_YEARS
+    sketch = get_sketch(job_id, band)
+    count = sketch.n if sketch else 0
+    if count < getattr(settings, 'SALARY_MIN_SAMPLES', 5):
+        return None, count
+    return int(round(sketch.cdf(salary) * 100)), count
+
+
+# ============ SALARY DISTRIBUTION ============
+
+def _synthetic_bins(job, xs):
+    """Same Gaussian as frontend ``generateDistribution`` (density scaled x10000)."""
+    mean = (job.salary_min + job.salary_max) / 2
+    std_dev = (job.salary_max - job.salary_min) / 6 or 1
+    density = np.exp(-0.5 * ((xs - mean) / std_dev) ** 2) / (std_dev * np.sqrt(2 * np.pi)) * 10000
+    return [
+        {'salary': int(x), 'density': round(float(d), 2), 'count': None}
+        for x, d in zip(xs, density)
+    ]
+
+
+def _sketch_bins(sketch, xs):
+    """Histogram centred on ``xs`` derived from the sketch CDF, scaled like the synthetic curve."""
+    step = xs[1] - xs[0]
+    edges = np.append(xs - step / 2, xs[-1] + step / 2)
+    cdf = np.array([sketch.cdf(edge) for edge in edges])
+    shares = np.diff(cdf)
+    density = shares / step * 10000
+    return [
+        {'salary': int(x), 'density': round(float(d), 2), 'count': int(round(share * sketch.n))}
+        for x, share, d in zip(xs, shares, density)
+    ]
+
+
+def compute_distribution(job):
+    """Binned salary distribution for a job; synthetic when verified samples are scarce."""
+    xs = np.round(np.linspace(job.salary_min * 0.8, job.salary_max * 1.2, DISTRIBUTION_POINTS))
+    sketch = get_sketch(job.pk)
+    count = sketch.n if sketch else 0
+    if count >= getattr(settings, 'SALARY_MIN_SAMPLES', 5):
+        return {'source': 'verified', 'sample_count': count, 'bins': _sketch_bins(sketch, xs)}
+    return {'source': 'synthetic', 'sample_count': count, 'bins': _synthetic_bins(job, xs)}
+
+
+def distribution(job):
+    """Cached distribution; entries are dropped whenever the job's sketches change."""
+    key = DISTRIBUTION_CACHE_KEY.format(job.pk)
+    data = cache.get(key)
+    if data is None:
+        data = compute_distribution(job)
+        cache.set(key, data, getattr(settings, 'SALARY_DISTRIBUTION_CACHE_SECONDS', 3600))
+    return data
+
+
+def precompute_distributions(job_ids):
+    """Warm the distribution cache right after sketches change."""
+    for job in Job.objects.filter(pk__in=job_ids):
+        cache.set(
+            DISTRIBUTION_CACHE_KEY.format(job.pk), compute_distribution(job),
+            getattr(settings, 'SALARY_DISTRIBUTION_CACHE_SECONDS', 3600),
+        )
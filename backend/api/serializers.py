@@ -3,25 +3,28 @@
 from rest_framework import serializers
 from .models import (
     JobGroup, Job, JobTag, JobTagRelation,
-    Academy, Course, CourseTag, CourseTagRelation, Certification,
-    MechanicProfile, CareerReview, SuccessStory, StoryJourneyStep,
+    JobReviewStats, Academy, Course, CourseTag, CourseTagRelation, Certification,
+    MechanicProfile, CareerReview, SuccessStory, StoryJourneyStep, JobTransition,
     Post, Comment, PostLike,
     Quest, QuestCompletion,
     SalaryReport, VerificationStatus
 )
+from .sparse_fields import SparseFieldsMixin
 
 
 # ============ JOB SERIALIZERS ============
 
-class JobTagSerializer(serializers.ModelSerializer):
+class JobTagSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = JobTag
         fields = ['id', 'name', 'color']
 
 
-class JobGroupSerializer(serializers.ModelSerializer):
+class JobGroupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     job_count = serializers.SerializerMethodField()
 
+    field_dependencies = {'job_count': []}
+
     class Meta:
         model = JobGroup
         fields = ['id', 'code', 'name', 'color', 'icon', 'description', 'order', 'job_count']
@@ -30,12 +33,32 @@ class JobGroupSerializer(serializers.ModelSerializer):
         return obj.jobs.count()
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobReviewStatsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    average_rating = serializers.ReadOnlyField()
+    top_pros = serializers.ReadOnlyField()
+    top_cons = serializers.ReadOnlyField()
+
+    class Meta:
+        model = JobReviewStats
+        fields = ['review_count', 'average_rating', 'rating_histogram', 'top_pros', 'top_cons']
+
+
+class JobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     group_name = serializers.CharField(source='group.name', read_only=True)
     group_code = serializers.CharField(source='group.code', read_only=True)
     group_icon = serializers.CharField(source='group.icon', read_only=True)
     tags = serializers.SerializerMethodField()
     salary_range_display = serializers.ReadOnlyField()
+    review_stats = serializers.SerializerMethodField()
+
+    expandable_fields = {
+        'group': (JobGroupSerializer, {'fields': ['id', 'code', 'name', 'color', 'icon']}),
+    }
+    field_dependencies = {
+        'salary_range_display': ['salary_min', 'salary_max'],
+        'tags': [],
+        'review_stats': ['review_stats__*'],
+    }
 
     class Meta:
         model = Job
@@ -44,11 +67,23 @@ class JobSerializer(serializers.ModelSerializer):
             'description', 'salary_min', 'salary_max', 'salary_range_display',
             'market_demand', 'req_tech', 'req_hand', 'req_speed', 'req_art', 'req_biz',
             'hiring_companies', 'source', 'is_starter', 'is_blue_ocean', 'is_ev_transition',
-            'tags', 'order'
+            'tags', 'review_stats', 'order'
         ]
 
     def get_tags(self, obj):
-        return list(obj.tag_relations.values_list('tag__name', flat=True))
+        return list(obj.tag_relations.order_by('pk').values_list('tag__name', flat=True))
+
+    def get_review_stats(self, obj):
+        # Loaded via select_related('review_stats'); jobs without reviews have none
+        try:
+            stats = obj.review_stats
+        except JobReviewStats.DoesNotExist:
+            return None
+        return JobReviewStatsSerializer(stats).data
+
+
+# Fields of a job expanded inside another resource
+JOB_SUMMARY_FIELDS = ['id', 'code', 'title', 'salary_range_display']
 
 
 class JobDetailSerializer(JobSerializer):
@@ -62,9 +97,11 @@ class JobDetailSerializer(JobSerializer):
 
 # ============ EDUCATION SERIALIZERS ============
 
-class AcademySerializer(serializers.ModelSerializer):
+class AcademySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     course_count = serializers.SerializerMethodField()
 
+    field_dependencies = {'course_count': []}
+
     class Meta:
         model = Academy
         fields = [
@@ -76,7 +113,7 @@ class AcademySerializer(serializers.ModelSerializer):
         return obj.courses.filter(is_active=True).count()
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     academy_name = serializers.CharField(source='academy.name', read_only=True)
     academy_logo = serializers.CharField(source='academy.logo', read_only=True)
     tags = serializers.SerializerMethodField()
@@ -84,6 +121,12 @@ class CourseSerializer(serializers.ModelSerializer):
         source='target_jobs', many=True, read_only=True
     )
 
+    expandable_fields = {
+        'academy': (AcademySerializer, {'fields': ['id', 'code', 'name', 'logo', 'location', 'is_partner']}),
+        'target_jobs': (JobSerializer, {'many': True, 'fields': JOB_SUMMARY_FIELDS}),
+    }
+    field_dependencies = {'tags': []}
+
     class Meta:
         model = Course
         fields = [
@@ -94,16 +137,22 @@ class CourseSerializer(serializers.ModelSerializer):
         ]
 
     def get_tags(self, obj):
-        return list(obj.tag_relations.values_list('tag__name', flat=True))
+        return list(obj.tag_relations.order_by('pk').values_list('tag__name', flat=True))
 
 
 # ============ USER PROFILE SERIALIZERS ============
 
-class MechanicProfileSerializer(serializers.ModelSerializer):
+class MechanicProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     stats = serializers.ReadOnlyField()
     current_job_title = serializers.CharField(source='current_job.title', read_only=True, allow_null=True)
     target_job_title = serializers.CharField(source='target_job.title', read_only=True, allow_null=True)
 
+    expandable_fields = {
+        'current_job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS}),
+        'target_job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS}),
+    }
+    field_dependencies = {'stats': ['stat_tech', 'stat_hand', 'stat_speed', 'stat_art', 'stat_biz']}
+
     class Meta:
         model = MechanicProfile
         fields = [
@@ -112,15 +161,17 @@ class MechanicProfileSerializer(serializers.ModelSerializer):
             'years_experience',
             'stat_tech', 'stat_hand', 'stat_speed', 'stat_art', 'stat_biz', 'stats',
             'current_salary', 'salary_verification_status', 'salary_verified_at',
-            'created_at', 'updated_at'
+            'salary_proof_thumbnail', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'salary_verified_at']
+        read_only_fields = ['created_at', 'updated_at', 'salary_verified_at', 'salary_proof_thumbnail']
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Compact author info for posts/comments."""
     stats = serializers.ReadOnlyField()
 
+    field_dependencies = {'stats': ['stat_tech', 'stat_hand', 'stat_speed', 'stat_art', 'stat_biz']}
+
     class Meta:
         model = MechanicProfile
         fields = [
@@ -132,10 +183,15 @@ class AuthorSerializer(serializers.ModelSerializer):
 
 # ============ REVIEW SERIALIZERS ============
 
-class CareerReviewSerializer(serializers.ModelSerializer):
+class CareerReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.name', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
 
+    expandable_fields = {
+        'author': (AuthorSerializer, {}),
+        'job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS}),
+    }
+
     class Meta:
         model = CareerReview
         fields = [
@@ -149,19 +205,26 @@ class CareerReviewSerializer(serializers.ModelSerializer):
 
 # ============ SUCCESS STORY SERIALIZERS ============
 
-class StoryJourneyStepSerializer(serializers.ModelSerializer):
+class StoryJourneyStepSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
 
+    expandable_fields = {'job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS})}
+
     class Meta:
         model = StoryJourneyStep
         fields = ['id', 'job', 'job_title', 'order', 'duration', 'salary']
 
 
-class SuccessStorySerializer(serializers.ModelSerializer):
+class SuccessStorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.name', read_only=True)
     target_job_title = serializers.CharField(source='target_job.title', read_only=True)
     journey_steps = StoryJourneyStepSerializer(many=True, read_only=True)
 
+    expandable_fields = {
+        'author': (AuthorSerializer, {}),
+        'target_job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS}),
+    }
+
     class Meta:
         model = SuccessStory
         fields = [
@@ -172,12 +235,36 @@ class SuccessStorySerializer(serializers.ModelSerializer):
         read_only_fields = ['is_verified', 'created_at']
 
 
+class SuccessStoryCardSerializer(SuccessStorySerializer):
+    """Compact story for list cards (no summary/key_lessons)."""
+
+    class Meta(SuccessStorySerializer.Meta):
+        fields = [
+            field for field in SuccessStorySerializer.Meta.fields
+            if field not in ('summary', 'key_lessons')
+        ]
+
+
+class JobTransitionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    from_job_title = serializers.CharField(source='from_job.title', read_only=True)
+    to_job_title = serializers.CharField(source='to_job.title', read_only=True)
+
+    class Meta:
+        model = JobTransition
+        fields = [
+            'from_job', 'from_job_title', 'to_job', 'to_job_title',
+            'count', 'median_duration_months', 'median_salary_delta'
+        ]
+
+
 # ============ COMMUNITY SERIALIZERS ============
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = AuthorSerializer(read_only=True)
     is_mine = serializers.SerializerMethodField()
 
+    field_dependencies = {'is_mine': ['author']}
+
     class Meta:
         model = Comment
         fields = ['id', 'post', 'author', 'content', 'likes', 'is_mine', 'created_at']
@@ -188,22 +275,25 @@ class CommentSerializer(serializers.ModelSerializer):
         return obj.author_id == profile_id if profile_id else False
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = AuthorSerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
     is_mine = serializers.SerializerMethodField()
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     related_job_title = serializers.CharField(source='related_job.title', read_only=True, allow_null=True)
 
+    expandable_fields = {'related_job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS})}
+    field_dependencies = {'is_liked': [], 'is_mine': ['author']}
+
     class Meta:
         model = Post
         fields = [
             'id', 'author', 'category', 'category_display', 'title', 'content',
             'related_job', 'related_job_title',
-            'likes', 'views', 'comment_count', 'is_liked', 'is_mine',
+            'likes', 'views', 'unique_views', 'comment_count', 'is_liked', 'is_mine',
             'show_verified_salary', 'is_pinned', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['likes', 'views', 'comment_count', 'created_at', 'updated_at', 'is_pinned']
+        read_only_fields = ['likes', 'views', 'unique_views', 'comment_count', 'created_at', 'updated_at', 'is_pinned']
 
     def get_is_liked(self, obj):
         profile_id = self.context.get('profile_id')
@@ -237,9 +327,11 @@ class CreateCommentSerializer(serializers.ModelSerializer):
 
 # ============ QUEST SERIALIZERS ============
 
-class QuestSerializer(serializers.ModelSerializer):
+class QuestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     is_completed_today = serializers.SerializerMethodField()
 
+    field_dependencies = {'is_completed_today': []}
+
     class Meta:
         model = Quest
         fields = [
@@ -262,18 +354,20 @@ class QuestSerializer(serializers.ModelSerializer):
         ).exists()
 
 
-class QuestCompletionSerializer(serializers.ModelSerializer):
+class QuestCompletionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     quest_title = serializers.CharField(source='quest.title', read_only=True)
     stat_type = serializers.CharField(source='quest.target_stat', read_only=True)
     stat_reward = serializers.IntegerField(source='quest.stat_reward', read_only=True)
 
+    expandable_fields = {'quest': (QuestSerializer, {})}
+
     class Meta:
         model = QuestCompletion
         fields = [
             'id', 'quest', 'quest_title', 'stat_type', 'stat_reward',
-            'proof_image', 'notes', 'is_verified', 'completed_at'
+            'proof_image', 'proof_thumbnail', 'notes', 'is_verified', 'completed_at'
         ]
-        read_only_fields = ['completed_at', 'is_verified']
+        read_only_fields = ['completed_at', 'is_verified', 'proof_thumbnail']
 
 
 class CompleteQuestSerializer(serializers.Serializer):
@@ -283,21 +377,27 @@ class CompleteQuestSerializer(serializers.Serializer):
 
 # ============ SALARY REPORT SERIALIZERS ============
 
-class SalaryReportSerializer(serializers.ModelSerializer):
+class SalaryReportSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.name', read_only=True)
     target_job_title = serializers.CharField(source='target_job.title', read_only=True)
     salary_gap = serializers.ReadOnlyField()
     status_display = serializers.CharField(source='get_status_display', read_only=True)
 
+    expandable_fields = {
+        'user': (AuthorSerializer, {}),
+        'target_job': (JobSerializer, {'fields': JOB_SUMMARY_FIELDS}),
+    }
+    field_dependencies = {'salary_gap': ['current_salary', 'estimated_salary']}
+
     class Meta:
         model = SalaryReport
         fields = [
             'id', 'user', 'user_name', 'target_job', 'target_job_title',
             'current_salary', 'estimated_salary', 'years_experience', 'percentile',
-            'user_stats', 'salary_gap', 'proof_image', 'status', 'status_display',
+            'user_stats', 'salary_gap', 'proof_image', 'proof_thumbnail', 'status', 'status_display',
             'verified_at', 'rejection_reason', 'created_at'
         ]
-        read_only_fields = ['created_at', 'verified_at']
+        read_only_fields = ['created_at', 'verified_at', 'proof_thumbnail']
 
 
 class CreateSalaryReportSerializer(serializers.ModelSerializer):
@@ -307,3 +407,5 @@ class CreateSalaryReportSerializer(serializers.ModelSerializer):
             'target_job', 'current_salary', 'estimated_salary',
             'years_experience', 'percentile', 'user_stats'
         ]
+        # Computed server-side by api.salary
+        read_only_fields = ['estimated_salary', 'percentile']
@@ -0,0 +1,160 @@
+"""Model signal handlers that keep derived data in sync."""
+
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import anomaly, catalog_cache, review_stats, salary_cube, salary_stats, storage, transitions, verification
+from .models import CareerReview, Course, Job, SalaryReport, StoryJourneyStep
+
+
+# ============ REVIEW AGGREGATES ============
+
+@receiver(pre_save, sender=CareerReview)
+def capture_previous_review(sender, instance, raw=False, **kwargs):
+    instance._previous_snapshot = None
+    if raw or not instance.pk:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values('job_id', 'rating', 'pros', 'cons').first()
+    if previous:
+        instance._previous_snapshot = previous
+
+
+@receiver(post_save, sender=CareerReview)
+def update_review_stats_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_snapshot', None)
+    if previous:
+        review_stats.apply(previous, -1)
+    review_stats.apply(review_stats.snapshot(instance), 1)
+
+
+@receiver(post_delete, sender=CareerReview)
+def update_review_stats_on_delete(sender, instance, **kwargs):
+    review_stats.apply(review_stats.snapshot(instance), -1)
+
+
+# ============ CAREER TRANSITION GRAPH ============
+
+@receiver(post_save, sender=StoryJourneyStep)
+@receiver(post_delete, sender=StoryJourneyStep)
+def update_transition_graph(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transitions.refresh_story(instance.story_id)
+
+
+# ============ SALARY CUBE ============
+
+@receiver(pre_save, sender=SalaryReport)
+def capture_previous_report(sender, instance, raw=False, **kwargs):
+    instance._previous_cube_rows = []
+    if raw:
+        return
+    if not instance.pk:
+        instance.user_tier = instance.user.tier
+        return
+    instance._previous_cube_rows = salary_cube.report_rows(sender.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=SalaryReport)
+def update_salary_cube_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_cube_rows', [])
+    current = salary_cube.report_rows(sender.objects.filter(pk=instance.pk))
+    if previous != current:
+        salary_cube.move(previous, current)
+
+
+@receiver(pre_delete, sender=SalaryReport)
+def capture_deleted_report(sender, instance, **kwargs):
+    instance._previous_cube_rows = salary_cube.report_rows(sender.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=SalaryReport)
+def update_salary_cube_on_delete(sender, instance, **kwargs):
+    salary_cube.apply(getattr(instance, '_previous_cube_rows', []), -1)
+
+
+# ============ ANOMALY SCORES ============
+
+@receiver(pre_save, sender=SalaryReport)
+def clear_stale_anomaly_score(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Drop a stored score when the job, years or salary it was computed from change."""
+    if raw or not instance.pk or instance.anomaly_scored_at is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list(*anomaly.SCORED_FIELDS).first()
+    if previous is None or previous == tuple(getattr(instance, name) for name in anomaly.SCORED_FIELDS):
+        return
+    instance.anomaly_score = instance.anomaly_scored_at = None
+    if update_fields is not None:
+        sender.objects.filter(pk=instance.pk).update(anomaly_score=None, anomaly_scored_at=None)
+
+
+# ============ BULK VERIFICATION ============
+
+@receiver(verification.verification_completed)
+def refresh_salary_statistics(sender, added, rebuild_job_ids, **kwargs):
+    # Sketches cannot forget samples: jobs that lost one are rebuilt (which also picks up their new ones)
+    if rebuild_job_ids:
+        salary_stats.rebuild(rebuild_job_ids)
+    added = [sample for sample in added if sample[0] not in rebuild_job_ids]
+    if added:
+        salary_stats.add_samples(added)
+
+
+# ============ MEDIA BLOB REFERENCES ============
+
+def capture_previous_files(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_files = []
+    if raw or not instance.pk:
+        return
+    fields = storage.tracked_fields(sender)
+    if update_fields is not None and not set(fields) & set(update_fields):
+        instance._previous_files = None
+        return
+    row = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._previous_files = list(row or ())
+
+
+def update_file_refs_on_save(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_files', [])
+    if raw or previous is None:
+        return
+    storage.swap(previous, storage.file_names(instance))
+
+
+def release_file_refs_on_delete(sender, instance, **kwargs):
+    storage.release(storage.file_names(instance))
+
+
+for model in storage.tracked_models():
+    pre_save.connect(capture_previous_files, sender=model)
+    post_save.connect(update_file_refs_on_save, sender=model)
+    post_delete.connect(release_file_refs_on_delete, sender=model)
+
+
+# ============ CATALOG RESPONSE CACHE ============
+
+def invalidate_catalog(sender, **kwargs):
+    # After commit, so a concurrent request cannot re-cache pre-commit data
+    transaction.on_commit(partial(catalog_cache.invalidate_model, sender))
+
+
+def invalidate_catalog_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(partial(catalog_cache.invalidate_model, type(instance)))
+        transaction.on_commit(partial(catalog_cache.invalidate_model, model))
+
+
+for label in catalog_cache.DEPENDENCIES:
+    post_save.connect(invalidate_catalog, sender=apps.get_model(label))
+    post_delete.connect(invalidate_catalog, sender=apps.get_model(label))
+
+m2m_changed.connect(invalidate_catalog_m2m, sender=Job.prerequisites.through)
+m2m_changed.connect(invalidate_catalog_m2m, sender=Course.target_jobs.through)
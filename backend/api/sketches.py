@@ -0,0 +1,224 @@
+"""Compact probabilistic sketches used by the API."""
+
+import hashlib
+import math
+import random
+import re
+import struct
+
+
+def _hash64(value):
+    """Stable 64-bit hash of a string (independent of PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+# ============ HYPERLOGLOG ============
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch with one byte per register.
+
+    With the default precision (p=10) a sketch is 1 KiB and estimates
+    distinct counts with ~3% standard error.
+    """
+
+    def __init__(self, precision=10, registers=None):
+        self.p = precision
+        self.m = 1 << precision
+        if registers:
+            if len(registers) != self.m:
+                raise ValueError('Register size does not match precision')
+            self.registers = bytearray(registers)
+        else:
+            self.registers = bytearray(self.m)
+
+    @classmethod
+    def from_bytes(cls, data, precision=10):
+        return cls(precision, bytes(data) if data else None)
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    def add(self, value):
+        x = _hash64(value)
+        index = x >> (64 - self.p)
+        remainder = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError('Cannot merge sketches with different precision')
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+
+# ============ MINHASH ============
+
+_MERSENNE_61 = (1 << 61) - 1
+
+
+class MinHash:
+    """MinHash signature over character shingles with LSH banding.
+
+    ``num_perm`` hash functions are split into ``bands`` bands; two texts
+    whose signatures agree on every row of any band share an LSH bucket.
+    """
+
+    def __init__(self, num_perm=64, bands=16, shingle_size=4):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(1)
+        self._params = [
+            (rng.randrange(1, _MERSENNE_61), rng.randrange(0, _MERSENNE_61))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text):
+        normalized = ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+        k = self.shingle_size
+        if len(normalized) <= k:
+            return {normalized} if normalized else set()
+        return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+    def signature(self, text):
+        hashes = [_hash64(s) for s in self.shingles(text)]
+        if not hashes:
+            return [_MERSENNE_61] * self.num_perm
+        return [
+            min((a * h + b) % _MERSENNE_61 for h in hashes)
+            for a, b in self._params
+        ]
+
+    def band_buckets(self, signature):
+        """Return one 63-bit bucket key per band."""
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            buckets.append(_hash64(','.join(map(str, rows))) >> 1)
+        return buckets
+
+    def pack(self, signature):
+        return struct.pack(f'>{self.num_perm}Q', *signature)
+
+    def unpack(self, data):
+        return list(struct.unpack(f'>{self.num_perm}Q', bytes(data)))
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+# ============ KLL QUANTILE SKETCH ============
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch (Karnin, Lang & Liberty).
+
+    Keeps O(k log(n/k)) items; level ``h`` items each stand for 2**h samples.
+    Rank error is roughly 1.7/k of n.
+    """
+
+    def __init__(self, k=200, c=2 / 3):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors = [[]]
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * self.c ** depth)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _size(self):
+        return sum(len(items) for items in self.compactors)
+
+    def _compress(self):
+        for level, items in enumerate(self.compactors):
+            if len(items) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                items.sort()
+                # Keep every other item, starting at a random offset, at double weight
+                offset = random.getrandbits(1)
+                survivors = items[offset::2] if len(items) % 2 == 0 else items[offset:-1:2]
+                leftover = [items[-1]] if len(items) % 2 else []
+                self.compactors[level + 1].extend(survivors)
+                self.compactors[level] = leftover
+                return
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.n += 1
+        if self._size() >= self._max_size:
+            self._compress()
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        while self._size() >= self._max_size:
+            self._compress()
+        return self
+
+    def rank(self, value):
+        """Estimated number of samples <= value."""
+        return sum(
+            sum(1 for item in items if item <= value) << level
+            for level, items in enumerate(self.compactors)
+        )
+
+    def cdf(self, value):
+        return self.rank(value) / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        weighted = sorted(
+            (item, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for item in items
+        )
+        if not weighted:
+            return None
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+        return weighted[-1][0]
+
+    def to_dict(self):
+        return {'k': self.k, 'n': self.n, 'compactors': self.compactors}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data.get('k', 200))
+        sketch.n = data.get('n', 0)
+        sketch.compactors = [list(items) for items in data.get('compactors') or [[]]]
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.compactors)))
+        return sketch
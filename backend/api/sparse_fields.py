@@ -0,0 +1,223 @@
+"""Sparse fieldsets (``?fields=``) and relation expansion (``?expand=``) for API reads.
+
+``?fields=id,title,author.name`` keeps only the listed fields; dotted names
+select inside nested serializers. ``?expand=group`` replaces a foreign key id
+with the related object, as declared in a serializer's ``expandable_fields``.
+``SparseQuerysetMixin`` then loads only what the remaining fields read:
+``only()`` for columns, ``select_related`` / ``prefetch_related`` for the
+relations still rendered.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse(value):
+    """'id,author.name,author.tier' -> {'id': {}, 'author': {'name': {}, 'tier': {}}}; {} means all."""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if not part:
+                break
+            node = node.setdefault(part, {})
+    return tree
+
+
+def requested(request):
+    """(fields tree or None, expand tree) of a read request; writes always use every field."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, {}
+    params = request.query_params
+    return parse(params.get(FIELDS_PARAM)) or None, parse(params.get(EXPAND_PARAM))
+
+
+def project(data, fields):
+    """Apply a fields tree to already rendered data."""
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+    if not fields or not isinstance(data, dict):
+        return data
+    return {key: project(value, fields[key]) for key, value in data.items() if key in fields}
+
+
+# ============ SERIALIZER SIDE ============
+
+class SparseFieldsMixin:
+    """Prune a ModelSerializer's fields and apply expansions from the request.
+
+    ``expandable_fields`` maps a name to ``(serializer class, kwargs)``; a
+    ``fields`` kwarg limits the expanded object's default fields.
+    ``field_dependencies`` lists the ORM paths read by fields that are not
+    plain model attributes (method fields, properties), so the query can be
+    trimmed; ``'rel__*'`` stands for the whole related row. Dotted selections
+    inside such fields (``review_stats.average_rating``) are applied to their
+    rendered value.
+    """
+    expandable_fields = {}
+    field_dependencies = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._projections = {}
+        if fields is not None:
+            self.restrict({name: {} for name in fields}, {})
+        requested_fields, expand = requested(self._context.get('request'))
+        if requested_fields or expand:
+            self.restrict(requested_fields, expand)
+
+    def restrict(self, fields, expand):
+        for name in expand:
+            if name in self.expandable_fields:
+                serializer_class, options = self.expandable_fields[name]
+                self.fields[name] = serializer_class(read_only=True, **options)
+        if fields:
+            for name in list(self.fields):
+                if name not in fields and name not in expand:
+                    self.fields.pop(name)
+        for name, field in self.fields.items():
+            nested = getattr(field, 'child', field)
+            sub_fields = fields.get(name) if fields else None
+            sub_expand = expand.get(name, {})
+            if isinstance(nested, SparseFieldsMixin):
+                if sub_fields or sub_expand:
+                    nested.restrict(sub_fields, sub_expand)
+            elif sub_fields:
+                self._projections[name] = sub_fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name, fields in self._projections.items():
+            data[name] = project(data[name], fields)
+        return data
+
+
+# ============ QUERY SIDE ============
+
+def _join(parts):
+    return '__'.join(parts)
+
+
+class QueryPlan:
+    """Columns, to-one and to-many relations read by a (restricted) serializer.
+
+    ``exact`` turns False when a field reads something that cannot be traced
+    to a model path; the queryset then keeps every column and relation.
+    """
+
+    def __init__(self):
+        self.columns = set()
+        self.select = set()
+        self.prefetch = set()
+        self.exact = True
+
+    def add_row(self, model, walked):
+        if walked:
+            self.select.add(_join(walked))
+        self.columns.update(_join(walked + [field.name]) for field in model._meta.concrete_fields)
+
+    def add_path(self, model, path, walked=()):
+        walked = list(walked)
+        parts = path.split('__')
+        for index, part in enumerate(parts):
+            if part == '*':
+                break
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                self.exact = False
+                return
+            if field.many_to_many or field.one_to_many:
+                self.prefetch.add(_join(walked + [part]))
+                return
+            if field.concrete:
+                self.columns.add(_join(walked + [part]))
+            if not field.is_relation or (field.concrete and index == len(parts) - 1):
+                # A column, or a foreign key read as its id
+                if walked:
+                    self.select.add(_join(walked))
+                return
+            walked.append(part)
+            model = field.related_model
+        self.add_row(model, walked)
+
+    def add_serializer(self, serializer, model, walked=()):
+        walked = list(walked)
+        dependencies = getattr(serializer, 'field_dependencies', {})
+        for name, field in serializer.fields.items():
+            if name in dependencies:
+                for path in dependencies[name]:
+                    self.add_path(model, path, walked)
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                self.exact = False
+                continue
+            source = field.source.replace('.', '__')
+            if source.startswith('get_') and source.endswith('_display'):
+                source = source[len('get_'):-len('_display')]
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, serializers.BaseSerializer):
+                self.add_nested(model, source, nested, walked)
+            else:
+                self.add_path(model, source, walked)
+
+    def add_nested(self, model, source, serializer, walked):
+        try:
+            relation = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            self.exact = False
+            return
+        if relation.many_to_many or relation.one_to_many:
+            self.prefetch.add(_join(walked + [source]))
+            return
+        if relation.concrete:
+            self.columns.add(_join(walked + [source]))
+        if isinstance(serializer, serializers.ModelSerializer):
+            self.select.add(_join(walked + [source]))
+            self.add_serializer(serializer, relation.related_model, walked + [source])
+        else:
+            self.add_row(relation.related_model, walked + [source])
+
+
+def trim_queryset(queryset, serializer):
+    """Load only the columns and relations the serializer renders."""
+    plan = QueryPlan()
+    plan.add_serializer(serializer, queryset.model)
+    lookups = queryset._prefetch_related_lookups
+    covered = {
+        (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0]
+        for lookup in lookups
+    }
+    missing = [path for path in sorted(plan.prefetch) if path.split('__')[0] not in covered]
+    if not plan.exact:
+        # Unknown reads: only add what is missing, never drop loaded data
+        return queryset.select_related(*plan.select).prefetch_related(*missing)
+
+    needed = {path.split('__')[0] for path in plan.prefetch}
+    kept = [
+        lookup for lookup in lookups
+        if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0] in needed
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if plan.select:
+        queryset = queryset.select_related(*sorted(plan.select))
+    return queryset.prefetch_related(*kept, *missing).only(*sorted(plan.columns))
+
+
+# ============ VIEWSET MIXIN ============
+
+class SparseQuerysetMixin:
+    """Trim the list / retrieve queryset to the fields requested with ``?fields=`` / ``?expand=``."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = requested(self.request)
+        if self.action in ('list', 'retrieve') and (fields or expand):
+            queryset = trim_queryset(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,189 @@
+"""Content-addressed, reference-counted storage for proof images.
+
+Each file is stored once as ``blobs/<aa>/<bb>/<sha256><ext>`` regardless of
+the field's ``upload_to``, so the same salary slip uploaded to a profile and
+to several reports (or re-uploaded on retry) occupies one file. The digest is
+computed from the upload's chunks before anything is written; existing
+content skips the write entirely.
+
+``MediaBlob.ref_count`` counts model fields pointing at a blob. Signals keep
+it current for normal saves and deletes, and ``retain`` / ``release`` cover
+queryset updates. ``delete()`` is a no-op for blobs: unreferenced blobs are
+reclaimed only by ``sweep_media_blobs`` after a grace period, which also
+covers uploads whose transaction rolled back. Files stored before blobs
+(``salary_proofs/...``) are not shared; they are deleted as soon as the last
+field pointing at them is cleared, replaced or deleted.
+"""
+
+import hashlib
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+
+BLOB_DIR = 'blobs'
+
+
+def blob_name(digest, ext):
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def is_blob(name):
+    return name.startswith(f'{BLOB_DIR}/')
+
+
+def _blob_model():
+    return apps.get_model('api', 'MediaBlob')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by the SHA-256 of their content."""
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        digest = digest.hexdigest()
+        name = blob_name(digest, os.path.splitext(name)[1].lower())
+
+        if not self.exists(name):
+            saved = super()._save(name, content)
+            if saved != name:
+                # Lost a race with an identical upload; keep the canonical copy
+                super().delete(saved)
+        _blob_model().objects.get_or_create(digest=digest, defaults={'name': name, 'size': size})
+        return name
+
+    def delete(self, name):
+        """Blobs may be shared; unreferenced ones are removed by ``sweep``. Legacy files go now."""
+        if name and not is_blob(name):
+            super().delete(name)
+
+    def delete_blob(self, name):
+        super().delete(name)
+
+
+proof_storage = ContentAddressedStorage()
+
+
+def get_proof_storage():
+    return proof_storage
+
+
+def tracked_fields(model):
+    """Names of ``model``'s file fields stored in content-addressed storage."""
+    return [
+        field.name for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def tracked_models():
+    return [model for model in apps.get_app_config('api').get_models() if tracked_fields(model)]
+
+
+def file_names(instance):
+    return [getattr(instance, name).name for name in tracked_fields(type(instance)) if getattr(instance, name)]
+
+
+def _adjust(names, sign):
+    counts = Counter(name for name in names if name)
+    Blob = _blob_model()
+    for name, count in counts.items():
+        Blob.objects.filter(name=name).update(ref_count=F('ref_count') + sign * count)
+
+
+def _referenced(name):
+    return any(
+        model.objects.filter(models.Q(*[(field, name) for field in tracked_fields(model)], _connector=models.Q.OR)).exists()
+        for model in tracked_models()
+    )
+
+
+def _delete_legacy(names):
+    for name in names:
+        if not _referenced(name):
+            proof_storage.delete(name)
+
+
+def retain(names):
+    """Add one reference per occurrence of each blob name (non-blob names are ignored)."""
+    _adjust(names, 1)
+
+
+def release(names):
+    """Drop references; legacy (non-blob) files no longer referenced are deleted after commit."""
+    names = [name for name in names if name]
+    _adjust(names, -1)
+    legacy = {name for name in names if not is_blob(name)}
+    if legacy:
+        transaction.on_commit(lambda: _delete_legacy(legacy))
+
+
+def swap(old_names, new_names):
+    """Move references from ``old_names`` to ``new_names``, skipping unchanged ones."""
+    old, new = Counter(name for name in old_names if name), Counter(name for name in new_names if name)
+    if old != new:
+        retain((new - old).elements())
+        release((old - new).elements())
+
+
+@transaction.atomic
+def recount():
+    """Recompute every ref_count from the model fields; returns the number of blobs corrected."""
+    counts = Counter()
+    for model in tracked_models():
+        for row in model.objects.order_by().values_list(*tracked_fields(model)).iterator(chunk_size=2000):
+            counts.update(name for name in row if name)
+
+    changed = []
+    for blob in _blob_model().objects.select_for_update().only('digest', 'ref_count'):
+        if blob.ref_count != counts.get(blob.name, 0):
+            blob.ref_count = counts.get(blob.name, 0)
+            changed.append(blob)
+    _blob_model().objects.bulk_update(changed, ['ref_count'], batch_size=1000)
+    return len(changed)
+
+
+def sweep(grace=timedelta(hours=24), dry_run=False):
+    """Delete unreferenced blobs (and stray blob files) older than ``grace``.
+
+    Returns ``(blob_count, byte_count)`` of what was (or would be) reclaimed.
+    """
+    cutoff = timezone.now() - grace
+    Blob = _blob_model()
+    removed = bytes_freed = 0
+
+    for blob in Blob.objects.filter(ref_count__lte=0, created_at__lt=cutoff).iterator():
+        removed += 1
+        bytes_freed += blob.size
+        if not dry_run:
+            with transaction.atomic():
+                # Re-check under lock in case a save referenced it meanwhile
+                if Blob.objects.select_for_update().filter(pk=blob.pk, ref_count__lte=0).delete()[0]:
+                    proof_storage.delete_blob(blob.name)
+
+    # Files written but never recorded (e.g. the process died between the two)
+    root = proof_storage.path(BLOB_DIR)
+    known = set(Blob.objects.values_list('name', flat=True))
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, proof_storage.location).replace(os.sep, '/')
+            if name in known or os.path.getmtime(path) >= cutoff.timestamp():
+                continue
+            removed += 1
+            bytes_freed += os.path.getsize(path)
+            if not dry_run:
+                os.remove(path)
+    return removed, bytes_freed
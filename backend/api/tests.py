@@ -0,0 +1,728 @@
+"""API tests for Unsan Academy."""
+
+import base64
+import csv
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from . import (
+    anomaly, catalog_cache, exports, metrics, moderation, review_stats, salary, salary_cube, salary_stats, storage,
+    verification,
+)
+from .fast_serializers import FastCourseSerializer, FastJobDetailSerializer, FastJobSerializer, FastQuestSerializer
+from .models import (
+    Academy, CareerReview, Course, CourseTag, CourseTagRelation, Job, JobGroup, JobTag, JobTagRelation,
+    JobReviewStats, JobTransition, MechanicProfile, MediaBlob, Post, Quest, QuestCompletion, ReviewHelpful, SalaryCubeCell, SalaryReport, SalarySketch,
+    Tier, VerificationStatus,
+)
+from .renderers import FastJSONRenderer
+from .replicas import PIN_COOKIE, ReplicaPinMiddleware, ReplicaRouter, reading_from_replica
+from .serializers import CourseSerializer, JobDetailSerializer, JobSerializer, QuestSerializer
+
+
+class FixtureMixin:
+    """A few groups, jobs and profiles shared by the API tests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = JobGroup.objects.create(code='Maintenance', name='정비', icon='🔧')
+        cls.jobs = [
+            Job.objects.create(
+                code=f'job{i}', title=f'직업{i}', group=cls.group, description='설명',
+                salary_min=3000 + i * 100, salary_max=6000 + i * 200,
+            )
+            for i in range(3)
+        ]
+        cls.profiles = [
+            MechanicProfile.objects.create(
+                user=User.objects.create(username=f'user{i}'), name=f'사용자{i}',
+                current_job=cls.jobs[i % 3], years_experience=i, current_salary=3500 + i * 300,
+            )
+            for i in range(3)
+        ]
+
+
+class MigrationTests(TestCase):
+    def test_models_match_migrations(self):
+        call_command('makemigrations', 'api', check=True, dry_run=True, interactive=False, stdout=StringIO())
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+# ============ REVIEWS ============
+
+class CareerReviewTests(FixtureMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.reviews = [
+            CareerReview.objects.create(
+                author=cls.profiles[0], job=cls.jobs[0], title=f'리뷰{i}', content='내용', helpful_count=i % 3,
+            )
+            for i in range(5)
+        ]
+
+    def test_keyset_pages_cover_every_review_once(self):
+        url = f'/api/reviews/?job={self.jobs[0].pk}&page_size=2'
+        seen = []
+        while url:
+            data = self.client.get(url).json()
+            seen += [review['id'] for review in data['results']]
+            url = data['next']
+        self.assertEqual(sorted(seen), sorted(review.pk for review in self.reviews))
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ('garbage', _cursor(['x', 'y', 'z']), _cursor([1, None, 2]), _cursor({'a': 1})):
+            response = self.client.get('/api/reviews/', {'job': self.jobs[0].pk, 'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+    def test_helpful_is_idempotent(self):
+        url = f'/api/reviews/{self.reviews[0].pk}/helpful/'
+        profile_id = self.profiles[1].pk
+        self.assertEqual(self.client.post(url, {'profile_id': profile_id}).json()['helpful_count'], 1)
+        self.assertEqual(self.client.post(url, {'profile_id': profile_id}).json()['helpful_count'], 1)
+        self.assertEqual(self.client.delete(f'{url}?profile_id={profile_id}').json()['helpful_count'], 0)
+        self.assertEqual(self.client.delete(f'{url}?profile_id={profile_id}').json()['helpful_count'], 0)
+
+    def test_helpful_survives_concurrent_insert(self):
+        review, profile = self.reviews[0], self.profiles[1]
+        # A concurrent request committed its vote without updating the counter yet
+        ReviewHelpful.objects.create(review=review, user=profile)
+        response = self.client.post(f'/api/reviews/{review.pk}/helpful/', {'profile_id': profile.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['helpful_count'], review.helpful_count)
+
+    def test_helpful_rejects_bad_profile_id(self):
+        response = self.client.post(f'/api/reviews/{self.reviews[0].pk}/helpful/', {'profile_id': 'abc'})
+        self.assertEqual(response.status_code, 404)
+
+
+class ReviewStatsTests(FixtureMixin, APITestCase):
+    def stats(self):
+        return {
+            stats.job_id: (stats.review_count, stats.rating_sum, stats.rating_histogram, stats.pros_counts, stats.cons_counts)
+            for stats in JobReviewStats.objects.exclude(review_count=0)
+        }
+
+    def assertStats(self, expected):
+        self.assertEqual(self.stats(), expected)
+        # The incremental updates agree with a full recount
+        review_stats.rebuild()
+        self.assertEqual(self.stats(), expected)
+
+    def test_create_update_delete(self):
+        job_a, job_b = self.jobs[0].pk, self.jobs[1].pk
+        first = CareerReview.objects.create(
+            author=self.profiles[0], job=self.jobs[0], title='리뷰', content='내용', rating=5, pros=['급여', '워라밸'],
+        )
+        CareerReview.objects.create(
+            author=self.profiles[1], job=self.jobs[0], title='리뷰', content='내용', rating=2, cons=['야근'],
+        )
+        self.assertStats({job_a: (2, 7, [0, 1, 0, 0, 1], {'급여': 1, '워라밸': 1}, {'야근': 1})})
+
+        first.rating, first.pros = 3, ['급여']
+        first.save()
+        self.assertStats({job_a: (2, 5, [0, 1, 1, 0, 0], {'급여': 1}, {'야근': 1})})
+
+        first.job = self.jobs[1]
+        first.save()
+        self.assertStats({
+            job_a: (1, 2, [0, 1, 0, 0, 0], {}, {'야근': 1}),
+            job_b: (1, 3, [0, 0, 1, 0, 0], {'급여': 1}, {}),
+        })
+
+        first.delete()
+        self.assertStats({job_a: (1, 2, [0, 1, 0, 0, 0], {}, {'야근': 1})})
+
+
+# ============ JOBS ============
+
+class JobTransitionTests(FixtureMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for to_job, count in ((cls.jobs[1], 3), (cls.jobs[2], 1)):
+            JobTransition.objects.create(from_job=cls.jobs[0], to_job=to_job, count=count)
+
+    def test_limit_is_clamped(self):
+        url = f'/api/jobs/{self.jobs[0].pk}/transitions/'
+        self.assertEqual(len(self.client.get(url, {'limit': 1}).json()['next_jobs']), 1)
+        self.assertEqual(len(self.client.get(url, {'limit': -5}).json()['next_jobs']), 1)
+        self.assertEqual(len(self.client.get(url, {'limit': 500}).json()['next_jobs']), 2)
+
+    def test_invalid_limit_is_bad_request(self):
+        response = self.client.get(f'/api/jobs/{self.jobs[0].pk}/transitions/', {'limit': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_job_is_not_found(self):
+        self.assertEqual(self.client.get('/api/jobs/999999/transitions/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/abc/transitions/').status_code, 404)
+
+
+class SalaryPercentileTests(FixtureMixin, APITestCase):
+    def test_unknown_job_is_not_found(self):
+        self.assertEqual(self.client.get('/api/jobs/abc/salary_percentile/', {'salary': 3000}).status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/999999/salary_percentile/', {'salary': 3000}).status_code, 404)
+
+
+# ============ MODERATION ============
+
+SPAM = '중고 공구 싸게 팝니다. 토크렌치 스캐너 리프트 전부 상태 좋고 직거래 가능합니다. 연락 주세요 010-1234-5678'
+
+
+class PostModerationTests(FixtureMixin, APITestCase):
+    def create_post(self, author, content=SPAM):
+        response = self.client.post('/api/posts/', {'author_id': author.pk, 'title': '판매', 'content': content})
+        self.assertEqual(response.status_code, 201)
+        return Post.objects.get(pk=response.data['id'])
+
+    def assertFlags(self, *expected):
+        self.assertEqual(
+            [(post.is_flagged, post.duplicate_of_id) for post in Post.objects.order_by('pk')], list(expected),
+        )
+
+    def test_copy_is_flagged_against_the_original(self):
+        original = self.create_post(self.profiles[0])
+        self.create_post(self.profiles[1])
+        moderation.index_post(original)
+        self.assertFlags((False, None), (True, original.pk))
+
+    def test_edit_clears_a_stale_flag(self):
+        self.create_post(self.profiles[0])
+        copy = self.create_post(self.profiles[1])
+        copy.content = '엔진오일 교환 주기는 차종마다 다르니 정비 매뉴얼을 먼저 확인하세요.'
+        moderation.index_post(copy)
+        self.assertFlags((False, None), (False, None))
+
+    def test_backfill_flags_only_later_copies(self):
+        original = Post.objects.create(author=self.profiles[0], title='판매', content=SPAM)
+        Post.objects.create(author=self.profiles[1], title='판매', content=SPAM)
+        for _ in range(2):  # The second run sees every post's bands
+            call_command('reindex_posts', stdout=StringIO())
+            self.assertFlags((False, None), (True, original.pk))
+
+    def test_moderator_clear_survives_reindexing(self):
+        self.create_post(self.profiles[0])
+        copy = self.create_post(self.profiles[1])
+        self.client.force_login(User.objects.create_superuser('admin', password='pw'))
+        response = self.client.post('/admin/api/post/', {'action': 'clear_flag', '_selected_action': [copy.pk]})
+        self.assertEqual(response.status_code, 302)
+
+        copy.refresh_from_db()
+        moderation.index_post(copy)
+        call_command('reindex_posts', stdout=StringIO())
+        self.assertFlags((False, None), (False, None))
+        self.assertTrue(Post.objects.get(pk=copy.pk).duplicate_reviewed)
+
+
+# ============ SALARY ============
+
+class PercentileRankTests(FixtureMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.flat_job = Job.objects.create(code='flat', title='고정급', group=cls.group, salary_min=4000, salary_max=4000)
+
+    def test_matches_normal_curve(self):
+        self.assertEqual(salary.percentile_rank([4500, 3000, 6000], 3000, 6000).tolist(), [50, 0, 100])
+
+    def test_flat_range_is_a_step(self):
+        with np.errstate(all='raise'):
+            ranks = salary.percentile_rank([3999, 4000, 4001], 4000, 4000)
+        self.assertEqual(ranks.tolist(), [0, 50, 100])
+
+    def test_flat_range_in_grid_and_percentile_endpoints(self):
+        grid = self.client.get('/api/jobs/salary_grid/', {'jobs': self.flat_job.pk, 'years': '0-3'}).json()
+        self.assertTrue(all(0 <= rank <= 100 for rank in np.ravel(grid['percentiles'])))
+        response = self.client.get(f'/api/jobs/{self.flat_job.pk}/salary_percentile/', {'salary': 3000})
+        self.assertEqual(response.json()['percentile'], 0)
+
+    def test_flat_range_profile_estimate(self):
+        _, percentile = salary.estimate_for_profile(self.flat_job, 5, {})
+        self.assertIn(percentile, (0, 50, 100))
+
+
+class AnomalyScoreTests(FixtureMixin, APITestCase):
+    def test_edit_clears_stale_score(self):
+        report = SalaryReport.objects.create(
+            user=self.profiles[0], target_job=self.jobs[0], current_salary=4000,
+            estimated_salary=4000, years_experience=2, status=VerificationStatus.PENDING,
+        )
+        anomaly.score_pending()
+        report.refresh_from_db()
+        self.assertIsNotNone(report.anomaly_score)
+
+        report.rejection_reason = '메모'
+        report.save()
+        report.refresh_from_db()
+        self.assertIsNotNone(report.anomaly_score)
+
+        report.current_salary = 40000
+        report.save(update_fields=['current_salary'])
+        report.refresh_from_db()
+        self.assertIsNone(report.anomaly_score)
+
+
+class SalaryCubeTests(FixtureMixin, APITestCase):
+    def cells(self):
+        return {
+            (cell.years_band, cell.tier, cell.status): (cell.count, cell.salary_sum)
+            for cell in SalaryCubeCell.objects.filter(job_group=self.group)
+        }
+
+    def assertCells(self, expected):
+        self.assertEqual(self.cells(), expected)
+        # The incremental updates agree with a full rebuild
+        salary_cube.rebuild()
+        self.assertEqual(self.cells(), expected)
+
+    def test_cells_follow_report_writes(self):
+        profile = self.profiles[0]
+        report = SalaryReport.objects.create(
+            user=profile, target_job=self.jobs[0], current_salary=4200, estimated_salary=4000, years_experience=2,
+        )
+        self.assertCells({('0-2', Tier.UNRANKED, VerificationStatus.NONE): (1, 4200)})
+
+        # The report stays in the cohort of the tier it was filed under
+        profile.tier = Tier.BRONZE
+        profile.save()
+        verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.VERIFIED)
+        self.assertCells({('0-2', Tier.UNRANKED, VerificationStatus.VERIFIED): (1, 4200)})
+
+        report.refresh_from_db()
+        report.current_salary = 4500
+        report.save()
+        self.assertCells({('0-2', Tier.UNRANKED, VerificationStatus.VERIFIED): (1, 4500)})
+
+        report.delete()
+        self.assertCells({})
+
+
+class ExportTests(FixtureMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i, profile in enumerate(cls.profiles):
+            SalaryReport.objects.create(
+                user=profile, target_job=cls.jobs[0], current_salary=4000 + i, estimated_salary=4000, years_experience=i,
+            )
+        cls.staff = User.objects.create(username='staff', is_staff=True)
+
+    def export(self, url, **params):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        content = self.export('/api/reports/export/')
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.reader(content[1:].splitlines()))
+        self.assertEqual(rows[0], exports.EXPORTS['reports'][1])
+        self.assertEqual([row[6] for row in rows[1:]], ['4000', '4001', '4002'])
+
+    def test_ndjson(self):
+        content = self.export('/api/profiles/export/', output='ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['사용자0', '사용자1', '사용자2'])
+        self.assertEqual(set(rows[0]), set(exports.EXPORTS['profiles'][1]))
+
+    def test_header_is_sent_before_querying(self):
+        with self.assertNumQueries(0):
+            next(exports.stream('reports', 'csv'))
+
+    def test_rejects_unknown_format_and_non_staff(self):
+        self.assertIn(self.client.get('/api/profiles/export/').status_code, (401, 403))
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get('/api/profiles/export/', {'output': 'xml'}).status_code, 400)
+
+
+# ============ VERIFICATION ============
+
+class VerificationTests(FixtureMixin, APITestCase):
+    def setUp(self):
+        self.profile = self.profiles[0]
+        MechanicProfile.objects.filter(pk=self.profile.pk).update(salary_verification_status=VerificationStatus.PENDING)
+        self.report = SalaryReport.objects.create(
+            user=self.profile, target_job=self.jobs[0], current_salary=4200,
+            estimated_salary=4000, years_experience=2, status=VerificationStatus.PENDING,
+        )
+
+    def test_rejecting_a_report_keeps_the_pending_profile_proof(self):
+        verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.REJECTED)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.salary_verification_status, VerificationStatus.PENDING)
+
+    def test_approving_a_report_verifies_the_profile(self):
+        verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.VERIFIED)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.salary_verification_status, VerificationStatus.VERIFIED)
+        self.assertEqual(self.profile.current_salary, 4200)
+
+    def sample_count(self):
+        sketch = SalarySketch.objects.filter(job=self.jobs[0], years_band=SalarySketch.ALL_YEARS).first()
+        return sketch.sample_count if sketch else 0
+
+    def test_approvals_merge_into_the_sketches(self):
+        with mock.patch.object(salary_stats, 'rebuild', wraps=salary_stats.rebuild) as rebuild:
+            verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.VERIFIED)
+        rebuild.assert_not_called()
+        # The report and the profile it verified
+        self.assertEqual(self.sample_count(), 2)
+
+    def test_rejecting_the_source_report_unverifies_the_profile(self):
+        verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.VERIFIED)
+        verification.verify_reports(SalaryReport.objects.all(), VerificationStatus.REJECTED, reason='위조')
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.salary_verification_status, VerificationStatus.NONE)
+        self.assertIsNone(self.profile.salary_verified_at)
+        self.assertEqual(self.sample_count(), 0)
+
+    def test_rejecting_the_source_report_falls_back_to_another_verified_one(self):
+        other = SalaryReport.objects.create(
+            user=self.profile, target_job=self.jobs[0], current_salary=3900,
+            estimated_salary=4000, years_experience=2, status=VerificationStatus.PENDING,
+        )
+        verification.verify_reports(SalaryReport.objects.filter(pk=other.pk), VerificationStatus.VERIFIED)
+        verification.verify_reports(SalaryReport.objects.filter(pk=self.report.pk), VerificationStatus.VERIFIED)
+        verification.verify_reports(SalaryReport.objects.filter(pk=self.report.pk), VerificationStatus.REJECTED)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.salary_verification_status, VerificationStatus.VERIFIED)
+        self.assertEqual(self.profile.current_salary, 3900)
+        # The other report and the profile
+        self.assertEqual(self.sample_count(), 2)
+
+
+# ============ MEDIA STORAGE ============
+
+class MediaBlobTests(FixtureMixin, APITestCase):
+    SLIP = b'salary slip scan'
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        override = self.settings(MEDIA_ROOT=root.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.reports = [
+            SalaryReport.objects.create(
+                user=profile, target_job=self.jobs[0], current_salary=4000, estimated_salary=4000, years_experience=1,
+            )
+            for profile in self.profiles[:2]
+        ]
+
+    def test_identical_uploads_share_one_counted_blob(self):
+        for i, report in enumerate(self.reports):
+            report.proof_image.save(f'slip{i}.png', ContentFile(self.SLIP))
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual({report.proof_image.name for report in self.reports}, {blob.name})
+
+        self.reports[0].delete()
+        self.assertEqual(storage.sweep(grace=timedelta(0)), (0, 0))
+        self.assertTrue(storage.proof_storage.exists(blob.name))
+
+        self.reports[1].proof_image = None
+        self.reports[1].save()
+        self.assertEqual(storage.sweep(grace=timedelta(0)), (1, len(self.SLIP)))
+        self.assertFalse(storage.proof_storage.exists(blob.name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_recount_fixes_drifted_counts(self):
+        self.reports[0].proof_image.save('slip.png', ContentFile(self.SLIP))
+        MediaBlob.objects.update(ref_count=5)
+        self.assertEqual(storage.recount(), 1)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+    def test_legacy_file_is_deleted_with_its_last_reference(self):
+        name = 'salary_proofs/old.png'
+        os.makedirs(storage.proof_storage.path('salary_proofs'))
+        with open(storage.proof_storage.path(name), 'wb') as legacy:
+            legacy.write(self.SLIP)
+        SalaryReport.objects.filter(pk__in=[report.pk for report in self.reports]).update(proof_image=name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reports[0].delete()
+        self.assertTrue(storage.proof_storage.exists(name))
+        report = SalaryReport.objects.get(pk=self.reports[1].pk)
+        report.proof_image = None
+        with self.captureOnCommitCallbacks(execute=True):
+            report.save()
+        self.assertFalse(storage.proof_storage.exists(name))
+
+
+# ============ CATALOG RESPONSE CACHE ============
+
+class CatalogCacheTests(FixtureMixin, APITestCase):
+    URLS = {'jobs': '/api/jobs/', 'job_groups': '/api/job-groups/', 'courses': '/api/courses/', 'quests': '/api/quests/'}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        academy = Academy.objects.create(code='academy', name='아카데미', logo='🏫', description='설명', location='서울')
+        cls.course = Course.objects.create(
+            code='course', academy=academy, title='과정', description='설명', category='Maintenance',
+            course_type='Online', duration='4주',
+        )
+
+    def setUp(self):
+        caches[catalog_cache.CACHE_ALIAS].clear()
+
+    def cache_states(self):
+        return {namespace: self.client.get(url)['X-Cache'] for namespace, url in self.URLS.items()}
+
+    def change(self, instance, **values):
+        for name, value in values.items():
+            setattr(instance, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save()
+
+    def test_writes_invalidate_only_dependent_namespaces(self):
+        self.assertEqual(set(self.cache_states().values()), {'MISS'})
+        self.assertEqual(set(self.cache_states().values()), {'HIT'})
+
+        self.change(self.course, title='새 과정')
+        self.assertEqual(self.cache_states(), {'jobs': 'HIT', 'job_groups': 'HIT', 'courses': 'MISS', 'quests': 'HIT'})
+
+        self.change(self.jobs[0], title='새 직업')
+        self.assertEqual(self.cache_states(), {'jobs': 'MISS', 'job_groups': 'MISS', 'courses': 'MISS', 'quests': 'HIT'})
+        response = self.client.get(f'/api/jobs/{self.jobs[0].pk}/')
+        self.assertEqual((response['X-Cache'], response.json()['title']), ('MISS', '새 직업'))
+
+    def test_m2m_changes_invalidate(self):
+        self.cache_states()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.target_jobs.add(self.jobs[0])
+        self.assertEqual(self.cache_states(), {'jobs': 'MISS', 'job_groups': 'MISS', 'courses': 'MISS', 'quests': 'HIT'})
+
+
+# ============ DATABASE ROUTING ============
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def handle(self, view, cookies=None):
+        request = RequestFactory().get('/api/jobs/')
+        request.COOKIES.update(cookies or {})
+        with self.settings(DATABASE_REPLICAS=['replica_0']):
+            return ReplicaPinMiddleware(view)(request)
+
+    def test_reads_use_a_replica_until_the_request_writes(self):
+        router, routes = ReplicaRouter(), []
+
+        def view(request):
+            routes.append(router.db_for_read(Job))
+            with reading_from_replica():
+                routes.append(router.db_for_read(Job))
+                router.db_for_write(Job)
+                routes.append(router.db_for_read(Job))
+            return HttpResponse()
+
+        response = self.handle(view)
+        self.assertEqual(routes, ['default', 'replica_0', 'default'])
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+
+    def test_pin_cookie_keeps_reads_on_the_primary(self):
+        router, routes = ReplicaRouter(), []
+
+        def view(request):
+            with reading_from_replica():
+                routes.append(router.db_for_read(Job))
+            return HttpResponse()
+
+        self.assertNotIn(PIN_COOKIE, self.handle(view, {PIN_COOKIE: '1'}).cookies)
+        self.assertNotIn(PIN_COOKIE, self.handle(view).cookies)
+        self.assertEqual(routes, ['default', 'replica_0'])
+
+
+# ============ CONDITIONAL GET ============
+
+class ConditionalGetTests(FixtureMixin, APITestCase):
+    def test_list_revalidates_by_etag(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/profiles/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([profile['id'] for profile in response.json()['results']], [p.pk for p in self.profiles[:2]])
+        # One count, one validator page; not paginated a second time
+        self.assertEqual(sum('COUNT(' in query['sql'] for query in queries.captured_queries), 1)
+        self.assertNotIn('Last-Modified', response)
+
+        etag = response['ETag']
+        cached = self.client.get('/api/profiles/', {'page_size': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((cached.status_code, cached['ETag']), (304, etag))
+
+        MechanicProfile.objects.filter(pk=self.profiles[0].pk).update(xp=10, updated_at=timezone.now())
+        changed = self.client.get('/api/profiles/', {'page_size': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_detail_revalidates_by_last_modified(self):
+        url = f'/api/profiles/{self.profiles[0].pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304,
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        # A related change that does not touch the profile's updated_at
+        Job.objects.filter(pk=self.profiles[0].current_job_id).update(updated_at=timezone.now() + timedelta(seconds=5))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+
+# ============ FAST SERIALIZERS ============
+
+class FastSerializerGoldenTests(FixtureMixin, APITestCase):
+    """Fast serializers must render the same bytes as the DRF serializers they replace."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        jobs = cls.jobs
+        jobs[1].prerequisites.add(jobs[0])
+        jobs[2].prerequisites.add(jobs[0], jobs[1])
+        for name in ('입문추천', '고연봉'):
+            JobTagRelation.objects.create(job=jobs[0], tag=JobTag.objects.create(name=name))
+        CareerReview.objects.create(
+            author=cls.profiles[1], job=jobs[0], title='좋아요', content='내용', rating=5,
+            pros=['연봉', '성장'], cons=['야근'],
+        )
+        CareerReview.objects.create(author=cls.profiles[2], job=jobs[0], title='보통', content='내용', rating=3, pros=['연봉'])
+
+        academy = Academy.objects.create(code='academy', name='아카데미', logo='🏫', description='설명', location='서울')
+        courses = [
+            Course.objects.create(
+                code=f'course{i}', academy=academy, title=f'과정{i}', description='설명', category='Maintenance',
+                course_type='Online', duration='4주', rating=rating,
+            )
+            for i, rating in enumerate(('4.5', '3.25'))
+        ]
+        courses[0].target_jobs.add(jobs[2], jobs[0])
+        CourseTagRelation.objects.create(course=courses[0], tag=CourseTag.objects.create(name='국비지원'))
+
+        quests = [
+            Quest.objects.create(title=f'퀘스트{i}', description='설명', target_stat='Tech') for i in range(2)
+        ]
+        QuestCompletion.objects.create(profile=cls.profiles[0], quest=quests[0])
+
+    def setUp(self):
+        caches[catalog_cache.CACHE_ALIAS].clear()
+
+    def assertSameBytes(self, queryset, drf_class, fast_class, context=None):
+        context = context or {}
+        drf = JSONRenderer().render(drf_class(queryset, many=True, context=context).data)
+        fast = fast_class(context)
+        self.assertEqual(FastJSONRenderer().render(fast.serialize(fast.rows(queryset))), drf)
+
+    def test_jobs(self):
+        self.assertSameBytes(Job.objects.select_related('group', 'review_stats'), JobSerializer, FastJobSerializer)
+
+    def test_job_detail(self):
+        related = Job.objects.select_related('group', 'review_stats')
+        queryset = related.prefetch_related(
+            Prefetch('prerequisites', queryset=related), Prefetch('unlocks', queryset=related),
+        )
+        self.assertSameBytes(queryset, JobDetailSerializer, FastJobDetailSerializer)
+
+    def test_courses(self):
+        self.assertSameBytes(Course.objects.all(), CourseSerializer, FastCourseSerializer)
+
+    def test_quests(self):
+        self.assertSameBytes(Quest.objects.all(), QuestSerializer, FastQuestSerializer)
+        self.assertSameBytes(
+            Quest.objects.all(), QuestSerializer, FastQuestSerializer, {'profile_id': self.profiles[0].pk},
+        )
+
+    def assertSameResponse(self, url, params=None):
+        responses = []
+        for fast in (True, False):
+            caches[catalog_cache.CACHE_ALIAS].clear()
+            with self.settings(FAST_SERIALIZERS=fast):
+                response = self.client.get(url, params or {})
+            self.assertEqual(response.status_code, 200)
+            responses.append(response.content)
+        self.assertEqual(*responses)
+
+    def test_endpoints(self):
+        job_id, course_id = self.jobs[2].pk, Course.objects.first().pk
+        for url, params in (
+            ('/api/jobs/', None),
+            ('/api/jobs/', {'fields': 'id,title,tags,review_stats.average_rating'}),
+            (f'/api/jobs/{job_id}/', None),
+            (f'/api/jobs/{job_id}/', {'fields': 'id,prerequisites.title,unlocks.code'}),
+            ('/api/courses/', None),
+            ('/api/courses/', {'fields': 'id,rating,target_job_ids'}),
+            (f'/api/courses/{course_id}/', {'fields': 'academy_name,tags'}),
+            ('/api/quests/', {'profile_id': self.profiles[0].pk}),
+            ('/api/quests/', {'profile_id': self.profiles[0].pk, 'fields': 'id,is_completed_today'}),
+        ):
+            with self.subTest(url=url, params=params):
+                self.assertSameResponse(url, params)
+
+
+# ============ INSTRUMENTATION ============
+
+class ServerTimingTests(FixtureMixin, APITestCase):
+    def test_sampled_requests_report_serialization(self):
+        with self.settings(INSTRUMENTATION_SAMPLE_RATE=1.0):
+            for url in ('/api/jobs/', f'/api/jobs/{self.jobs[0].pk}/', '/api/profiles/'):
+                with self.subTest(url=url):
+                    timings = self.client.get(url)['Server-Timing']
+                    self.assertEqual(
+                        [entry.split(';')[0] for entry in timings.split(', ')],
+                        ['db', 'ser', 'app', 'render', 'total'],
+                    )
+
+    def test_unsampled_requests_have_no_header(self):
+        with self.settings(INSTRUMENTATION_SAMPLE_RATE=0.0):
+            self.assertNotIn('Server-Timing', self.client.get('/api/jobs/'))
+
+
+class MetricsTests(APITestCase):
+    def test_unknown_methods_share_one_label(self):
+        before = metrics.REQUESTS.samples()
+        for method in ('GET', 'BREW', 'PROPFIND'):
+            metrics.observe_request('job-list', method, 200, 0.01)
+        after = metrics.REQUESTS.samples()
+        self.assertEqual(after[('job-list', 'other', '2xx')] - before.get(('job-list', 'other', '2xx'), 0), 2)
+        self.assertNotIn(('job-list', 'BREW', '2xx'), after)
+
+    def test_finished_thread_shards_are_merged(self):
+        registry = metrics.Registry()
+        counter = metrics.Counter('test_total', 'Test counter', ('kind',), registry=registry)
+        histogram = metrics.Histogram('test_seconds', 'Test histogram', buckets=(1.0,), registry=registry)
+
+        def work():
+            counter.inc('a')
+            histogram.observe(0.5)
+
+        for _ in range(5):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        counter.inc('a')
+
+        self.assertEqual(counter.samples(), {('a',): 6})
+        self.assertEqual(histogram.samples(), {(): [5, 0, 2.5]})
+        # Only the live main-thread map is left besides the base map
+        self.assertEqual(len(counter._shards.snapshot()), 2)
+        self.assertEqual(len(histogram._shards.snapshot()), 1)
@@ -0,0 +1,101 @@
+"""Career transition graph built from success story journeys."""
+
+import re
+from collections import defaultdict
+from itertools import groupby
+from statistics import median
+
+from django.db import transaction
+
+from .models import JobTransition, StoryJourneyStep
+
+
+_YEARS = re.compile(r'(\d+(?:\.\d+)?)\s*년')
+_MONTHS = re.compile(r'(\d+)\s*개월')
+_AMOUNT = re.compile(r'(\d[\d,]*)')
+
+
+def parse_duration_months(text):
+    """'2년' -> 24, '1년 6개월' -> 18, '현재' -> None."""
+    years = _YEARS.search(text or '')
+    months = _MONTHS.search(text or '')
+    if not years and not months:
+        return None
+    total = float(years.group(1)) * 12 if years else 0
+    return total + (int(months.group(1)) if months else 0)
+
+
+def parse_salary(text):
+    """'3,500만원' -> 3500, '' -> None."""
+    match = _AMOUNT.search((text or '').split('→')[-1])
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def story_edges(steps):
+    """Yield (from_job_id, to_job_id, duration_months, salary_delta) for consecutive steps."""
+    for current, following in zip(steps, steps[1:]):
+        if current['job_id'] == following['job_id']:
+            continue
+        before, after = parse_salary(current['salary']), parse_salary(following['salary'])
+        delta = after - before if before is not None and after is not None else None
+        yield current['job_id'], following['job_id'], parse_duration_months(current['duration']), delta
+
+
+def _summarize(edge):
+    samples = list(edge.story_samples.values())
+    durations = [d for d, _ in samples if d is not None]
+    deltas = [s for _, s in samples if s is not None]
+    edge.count = len(samples)
+    edge.median_duration_months = median(durations) if durations else None
+    edge.median_salary_delta = round(median(deltas)) if deltas else None
+
+
+def _step_rows(story_ids=None):
+    steps = StoryJourneyStep.objects.order_by('story_id', 'order', 'id')
+    if story_ids is not None:
+        steps = steps.filter(story_id__in=story_ids)
+    return steps.values('story_id', 'job_id', 'duration', 'salary')
+
+
+@transaction.atomic
+def rebuild():
+    """Rebuild the whole graph in one ordered pass over all journey steps."""
+    samples = defaultdict(dict)
+    rows = _step_rows().iterator(chunk_size=2000)
+    for story_id, steps in groupby(rows, key=lambda row: row['story_id']):
+        for from_id, to_id, months, delta in story_edges(list(steps)):
+            samples[(from_id, to_id)][str(story_id)] = [months, delta]
+
+    edges = []
+    for (from_id, to_id), story_samples in samples.items():
+        edge = JobTransition(from_job_id=from_id, to_job_id=to_id, story_samples=story_samples)
+        _summarize(edge)
+        edges.append(edge)
+
+    JobTransition.objects.all().delete()
+    JobTransition.objects.bulk_create(edges, batch_size=500)
+    return len(edges)
+
+
+@transaction.atomic
+def refresh_story(story_id):
+    """Re-apply one story's contribution to the graph."""
+    key = str(story_id)
+    touched = {}
+    for edge in JobTransition.objects.select_for_update().filter(story_samples__has_key=key):
+        edge.story_samples.pop(key, None)
+        touched[(edge.from_job_id, edge.to_job_id)] = edge
+
+    for from_id, to_id, months, delta in story_edges(list(_step_rows([story_id]))):
+        edge = touched.get((from_id, to_id))
+        if edge is None:
+            edge, _ = JobTransition.objects.select_for_update().get_or_create(from_job_id=from_id, to_job_id=to_id)
+            touched[(from_id, to_id)] = edge
+        edge.story_samples[key] = [months, delta]
+
+    for edge in touched.values():
+        _summarize(edge)
+        if edge.count:
+            edge.save()
+        else:
+            edge.delete()
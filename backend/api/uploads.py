@@ -0,0 +1,140 @@
+"""Proof-image uploads: size-limited streaming and background post-processing.
+
+Uploads larger than FILE_UPLOAD_MAX_MEMORY_SIZE are streamed to a temporary
+file by Django; ``SizeLimitUploadHandler`` drops any file over
+PROOF_IMAGE_MAX_BYTES while it is still streaming. After the request commits,
+decoding, EXIF stripping, downscaling and thumbnailing run on a local thread
+pool so the response does not wait for Pillow.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import close_old_connections, transaction
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import storage as media
+
+
+logger = logging.getLogger(__name__)
+
+# model label -> {image field: thumbnail field}
+PROOF_FIELDS = {
+    'api.MechanicProfile': {'salary_proof_image': 'salary_proof_thumbnail'},
+    'api.SalaryReport': {'proof_image': 'proof_thumbnail'},
+    'api.QuestCompletion': {'proof_image': 'proof_thumbnail'},
+}
+
+_executor = None
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """Skip uploaded files larger than PROOF_IMAGE_MAX_BYTES as soon as the limit is crossed."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.PROOF_IMAGE_MAX_BYTES:
+            self.request.rejected_uploads = getattr(self.request, 'rejected_uploads', set()) | {self.field_name}
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def upload_error(request, upload, field_name):
+    """Error message for a missing, oversized or non-image upload, or None if it is acceptable."""
+    if field_name in getattr(request._request, 'rejected_uploads', ()):
+        return f'{field_name} exceeds {filesizeformat(settings.PROOF_IMAGE_MAX_BYTES)}'
+    if not upload:
+        return f'{field_name} required'
+    if upload.content_type and not upload.content_type.startswith('image/'):
+        return f'{field_name} must be an image'
+    return None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROOF_IMAGE_WORKERS, thread_name_prefix='proof-image'
+        )
+    return _executor
+
+
+def schedule(instance, image_field):
+    """Process ``instance.<image_field>`` in the background once the transaction commits."""
+    label = instance._meta.label
+    job = (label, instance.pk, image_field)
+    if settings.PROOF_IMAGE_ASYNC:
+        transaction.on_commit(lambda: _get_executor().submit(_run, *job))
+    else:
+        transaction.on_commit(lambda: process(*job))
+
+
+def _run(label, pk, image_field):
+    close_old_connections()
+    try:
+        process(label, pk, image_field)
+    except Exception:
+        logger.exception('Proof image processing failed for %s #%s', label, pk)
+    finally:
+        close_old_connections()
+
+
+def _encode(image, max_size):
+    image = image.copy()
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    buffer = BytesIO()
+    # Re-encoding without exif= drops all metadata (GPS, device, ...)
+    image.save(buffer, format='JPEG', quality=85, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def process(label, pk, image_field):
+    """Decode, strip EXIF, downscale and thumbnail one stored proof image."""
+    model = apps.get_model(label)
+    thumb_field = PROOF_FIELDS[label][image_field]
+    instance = model.objects.filter(pk=pk).first()
+    original = getattr(instance, image_field, None) if instance else None
+    if not original:
+        return
+
+    try:
+        with original.open('rb') as handle:
+            image = Image.open(handle)
+            image = ImageOps.exif_transpose(image).convert('RGB')
+    except (UnidentifiedImageError, OSError):
+        logger.warning('Unreadable proof image %s for %s #%s', original.name, label, pk)
+        return
+
+    stem = os.path.splitext(os.path.basename(original.name))[0]
+    old_name = original.name
+    image_name = original.field.generate_filename(instance, f'{stem}.jpg')
+    image_name = original.storage.save(image_name, _encode(image, settings.PROOF_IMAGE_MAX_DIMENSION))
+    thumb_file = getattr(instance, thumb_field)
+    old_thumb_name = thumb_file.name
+    thumb_name = thumb_file.field.generate_filename(instance, f'{stem}_thumb.jpg')
+    thumb_name = thumb_file.storage.save(thumb_name, _encode(image, settings.PROOF_THUMBNAIL_SIZE))
+
+    # update() so processing does not trigger save signals or touch updated_at;
+    # blob references are moved explicitly instead
+    with transaction.atomic():
+        updated = model.objects.filter(pk=pk, **{image_field: old_name}).update(
+            **{image_field: image_name, thumb_field: thumb_name}
+        )
+        if updated:
+            media.swap([old_name, old_thumb_name], [image_name, thumb_name])
+    # Otherwise a newer upload replaced the image meanwhile; our unreferenced
+    # output is reclaimed by sweep_media_blobs
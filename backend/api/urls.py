@@ -34,4 +34,6 @@ router.register(r'reports', views.SalaryReportViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('dashboard/<int:profile_id>/', views.dashboard_data, name='dashboard-data'),
+    path('salary-cube/', views.salary_cube_query, name='salary-cube'),
+    path('request-stats/', views.request_stats, name='request-stats'),
 ]
@@ -0,0 +1,229 @@
+"""Bulk salary verification for SalaryReport and MechanicProfile.
+
+Selections are processed in chunks of VERIFICATION_CHUNK_SIZE rows, each in
+its own transaction with the rows locked, so any selection size runs in
+bounded memory and lock time. Every status change writes a
+``VerificationAudit`` row. Report decisions are mirrored onto the author's
+profile, and the salary cube is updated per chunk. Sketches and cached
+distributions are refreshed once per call through ``verification_completed``:
+new verified salaries are merged in, jobs that lost or replaced one are
+rebuilt.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import salary_cube
+from .models import MechanicProfile, SalaryReport, VerificationAudit, VerificationStatus
+
+
+# Sent once per bulk decision with ``added`` (job_id, years, salary) samples that
+# became verified and ``rebuild_job_ids`` whose verified samples were removed or replaced
+verification_completed = Signal()
+
+DECISIONS = (VerificationStatus.VERIFIED, VerificationStatus.REJECTED)
+
+
+def _chunks(ids):
+    size = getattr(settings, 'VERIFICATION_CHUNK_SIZE', 500)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _check(status):
+    if status not in DECISIONS:
+        raise ValueError(f'Unsupported verification decision: {status}')
+
+
+def _finish(batch, count, added, rebuild_job_ids):
+    if count:
+        verification_completed.send(
+            sender=VerificationAudit, batch=batch, added=added, rebuild_job_ids=rebuild_job_ids,
+        )
+    return count
+
+
+PROFILE_FIELDS = (
+    'id', 'current_job_id', 'years_experience', 'current_salary',
+    'salary_verification_status', 'salary_verified_at', 'updated_at',
+)
+
+
+def _save_profiles(changed, audits):
+    MechanicProfile.objects.bulk_update(
+        changed, ['current_salary', 'salary_verification_status', 'salary_verified_at', 'updated_at'],
+    )
+    VerificationAudit.objects.bulk_create(audits)
+
+
+def _sync_approvals(reports, reviewer, batch, now):
+    """Mark authors' profiles verified with their latest approved salary.
+
+    Returns ``(added, rebuild_job_ids)`` for the profiles' verified samples.
+    """
+    status = VerificationStatus.VERIFIED
+    latest = {report['user_id']: report for report in reports}  # reports are ordered by created_at
+    profiles = MechanicProfile.objects.select_for_update().filter(pk__in=latest).only(*PROFILE_FIELDS)
+    changed, audits, added, rebuild_job_ids = [], [], [], set()
+    for profile in profiles:
+        previous = profile.salary_verification_status
+        salary = latest[profile.pk]['current_salary']
+        if previous == status and profile.current_salary == salary:
+            continue
+        if profile.current_job_id:
+            if previous == status and profile.current_salary is not None:
+                rebuild_job_ids.add(profile.current_job_id)
+            else:
+                added.append((profile.current_job_id, profile.years_experience, salary))
+        profile.current_salary = salary
+        profile.salary_verified_at = now
+        profile.salary_verification_status = status
+        profile.updated_at = now
+        changed.append(profile)
+        audits.append(VerificationAudit(
+            profile=profile, report_id=latest[profile.pk]['id'], previous_status=previous,
+            status=status, reviewer=reviewer, batch=batch,
+        ))
+    _save_profiles(changed, audits)
+    return added, rebuild_job_ids
+
+
+def _sync_rejections(reports, reviewer, batch, now, reason):
+    """Re-derive verified profiles whose salary came from a now-rejected report.
+
+    The profile takes the author's latest remaining verified report, or drops
+    back to unverified without one. Profiles verified from their own proof, or
+    from another report, are left alone. Returns the job ids to rebuild.
+    """
+    status = VerificationStatus.VERIFIED
+    revoked = {report['id']: report for report in reports if report['status'] == status}
+    if not revoked:
+        return set()
+    profiles = MechanicProfile.objects.select_for_update().filter(
+        pk__in={report['user_id'] for report in revoked.values()}, salary_verification_status=status,
+    ).only(*PROFILE_FIELDS)
+    profiles = {profile.pk: profile for profile in profiles}
+
+    sources = {}  # profile_id -> report id of its latest verification
+    for profile_id, report_id in VerificationAudit.objects.filter(
+        profile_id__in=profiles, status=status,
+    ).order_by('profile_id', '-created_at', '-id').values_list('profile_id', 'report_id'):
+        sources.setdefault(profile_id, report_id)
+    affected = {profile_id for profile_id, report_id in sources.items() if report_id in revoked}
+
+    remaining = {}
+    for report in SalaryReport.objects.filter(user_id__in=affected, status=status).order_by('created_at').values(
+        'id', 'user_id', 'current_salary', 'verified_at',
+    ):
+        remaining[report['user_id']] = report
+
+    changed, audits, rebuild_job_ids = [], [], set()
+    for profile_id in affected:
+        profile = profiles[profile_id]
+        replacement = remaining.get(profile_id)
+        if replacement:
+            profile.current_salary = replacement['current_salary']
+            profile.salary_verified_at = replacement['verified_at']
+        else:
+            profile.salary_verification_status = VerificationStatus.NONE
+            profile.salary_verified_at = None
+        profile.updated_at = now
+        changed.append(profile)
+        audits.append(VerificationAudit(
+            profile=profile, report_id=replacement['id'] if replacement else sources[profile_id],
+            previous_status=status, status=profile.salary_verification_status,
+            reason=reason, reviewer=reviewer, batch=batch,
+        ))
+        if profile.current_job_id:
+            rebuild_job_ids.add(profile.current_job_id)
+    _save_profiles(changed, audits)
+    return rebuild_job_ids
+
+
+def verify_reports(queryset, status, reviewer=None, reason=''):
+    """Approve or reject the reports in ``queryset``; returns the number changed."""
+    _check(status)
+    ids = list(queryset.exclude(status=status).order_by('pk').values_list('pk', flat=True))
+    batch, now = uuid.uuid4().hex, timezone.now()
+    added, rebuild_job_ids, count = [], set(), 0
+    fields = {'status': status, 'updated_at': now}
+    if status == VerificationStatus.VERIFIED:
+        fields.update(verified_at=now, rejection_reason='')
+    else:
+        fields['rejection_reason'] = reason
+
+    for chunk in _chunks(ids):
+        with transaction.atomic():
+            locked = SalaryReport.objects.select_for_update().filter(pk__in=chunk).exclude(status=status)
+            reports = list(locked.order_by('created_at').values(
+                'id', 'user_id', 'target_job_id', 'years_experience', 'current_salary', 'status',
+            ))
+            if not reports:
+                continue
+            report_ids = [report['id'] for report in reports]
+            cube_rows = salary_cube.report_rows(SalaryReport.objects.filter(pk__in=report_ids))
+
+            SalaryReport.objects.filter(pk__in=report_ids).update(**fields)
+            salary_cube.move(cube_rows, [{**row, 'status': status} for row in cube_rows])
+            VerificationAudit.objects.bulk_create([
+                VerificationAudit(
+                    report_id=report['id'], profile_id=report['user_id'], previous_status=report['status'],
+                    status=status, reason=fields['rejection_reason'], reviewer=reviewer, batch=batch,
+                )
+                for report in reports
+            ])
+            if status == VerificationStatus.VERIFIED:
+                profile_added, profile_rebuilds = _sync_approvals(reports, reviewer, batch, now)
+            else:
+                profile_added, profile_rebuilds = [], _sync_rejections(reports, reviewer, batch, now, reason)
+        if status == VerificationStatus.VERIFIED:
+            added += [(report['target_job_id'], report['years_experience'], report['current_salary']) for report in reports]
+        else:
+            rebuild_job_ids |= {
+                report['target_job_id'] for report in reports if report['status'] == VerificationStatus.VERIFIED
+            }
+        added += profile_added
+        rebuild_job_ids |= profile_rebuilds
+        count += len(reports)
+    return _finish(batch, count, added, rebuild_job_ids)
+
+
+def verify_profiles(queryset, status, reviewer=None, reason=''):
+    """Approve or reject pending profile salary proofs; returns the number changed."""
+    _check(status)
+    pending = queryset.filter(salary_verification_status=VerificationStatus.PENDING)
+    ids = list(pending.order_by('pk').values_list('pk', flat=True))
+    batch, now = uuid.uuid4().hex, timezone.now()
+    added, count = [], 0
+    fields = {'salary_verification_status': status, 'updated_at': now}
+    if status == VerificationStatus.VERIFIED:
+        fields['salary_verified_at'] = now
+
+    for chunk in _chunks(ids):
+        with transaction.atomic():
+            locked = MechanicProfile.objects.select_for_update().filter(
+                pk__in=chunk, salary_verification_status=VerificationStatus.PENDING,
+            )
+            profiles = list(locked.values('id', 'current_job_id', 'years_experience', 'current_salary'))
+            if not profiles:
+                continue
+            MechanicProfile.objects.filter(pk__in=[profile['id'] for profile in profiles]).update(**fields)
+            VerificationAudit.objects.bulk_create([
+                VerificationAudit(
+                    profile_id=profile['id'], previous_status=VerificationStatus.PENDING,
+                    status=status, reason=reason, reviewer=reviewer, batch=batch,
+                )
+                for profile in profiles
+            ])
+        if status == VerificationStatus.VERIFIED:
+            added += [
+                (profile['current_job_id'], profile['years_experience'], profile['current_salary'])
+                for profile in profiles
+                if profile['current_job_id'] and profile['current_salary'] is not None
+            ]
+        count += len(profiles)
+    return _finish(batch, count, added, set())
@@ -1,40 +1,81 @@
 """API Views for Unsan Academy."""
 
+import hmac
+
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import F, Count
+from django.db import IntegrityError, transaction
+from django.db.models import F, Count, Prefetch
 
+from . import exports, metrics, moderation, post_views, salary, salary_cube, salary_stats, uploads
 from .models import (
-    JobGroup, Job, Academy, Course,
-    MechanicProfile, CareerReview, SuccessStory,
+    JobGroup, Job, JobTransition, Academy, Course,
+    MechanicProfile, CareerReview, ReviewHelpful, SuccessStory, StoryJourneyStep,
     Post, Comment, PostLike,
     Quest, QuestCompletion,
     SalaryReport, VerificationStatus
 )
+from .catalog_cache import CachedCatalogMixin
+from .conditional import ConditionalGetMixin
+from .fast_serializers import (
+    FastReadMixin, FastJobSerializer, FastJobDetailSerializer, FastCourseSerializer, FastQuestSerializer
+)
+from .instrumentation import TimedSerializationMixin
+from .pagination import ApproximatePagination, ReviewKeysetPagination
+from .replicas import ReplicaReadMixin
 from .serializers import (
     JobGroupSerializer, JobSerializer, JobDetailSerializer,
     AcademySerializer, CourseSerializer,
     MechanicProfileSerializer, AuthorSerializer,
-    CareerReviewSerializer, SuccessStorySerializer,
+    CareerReviewSerializer, SuccessStorySerializer, SuccessStoryCardSerializer, JobTransitionSerializer,
     PostSerializer, PostDetailSerializer, CreatePostSerializer,
     CommentSerializer, CreateCommentSerializer,
     QuestSerializer, QuestCompletionSerializer, CompleteQuestSerializer,
     SalaryReportSerializer, CreateSalaryReportSerializer
 )
+from .sparse_fields import SparseQuerysetMixin
+
+
+SALARY_GRID_MAX_CELLS = 200_000
+
+
+def _export_response(request, kind):
+    """Stream a full-table export as CSV (default) or NDJSON (``?output=ndjson``)."""
+    fmt = request.query_params.get('output', 'csv')
+    if fmt not in exports.FORMATS:
+        return Response({'error': 'output must be csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+    filename = f"{kind}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    response = StreamingHttpResponse(exports.stream(kind, fmt), content_type=exports.FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _parse_int_list(value):
+    """'1,2,3' -> [1, 2, 3]; '0-3' -> [0, 1, 2, 3]."""
+    if '-' in value and ',' not in value:
+        start, end = (int(part) for part in value.split('-', 1))
+        return list(range(start, end + 1))
+    return [int(part) for part in value.split(',') if part.strip()]
 
 
 # ============ JOB VIEWSETS ============
 
-class JobGroupViewSet(viewsets.ReadOnlyModelViewSet):
+class JobGroupViewSet(CachedCatalogMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for job groups (7 categories)."""
+    cache_namespace = 'job_groups'
     queryset = JobGroup.objects.all()
     serializer_class = JobGroupSerializer
 
 
-class JobViewSet(viewsets.ReadOnlyModelViewSet):
+class JobViewSet(ConditionalGetMixin, CachedCatalogMixin, FastReadMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for jobs (88 careers)."""
+    cache_namespace = 'jobs'
+    fast_serializer_classes = {'list': FastJobSerializer, 'retrieve': FastJobDetailSerializer}
     queryset = Job.objects.all()
 
     def get_serializer_class(self):
@@ -43,7 +84,13 @@ class JobViewSet(viewsets.ReadOnlyModelViewSet):
         return JobSerializer
 
     def get_queryset(self):
-        queryset = Job.objects.all()
+        related = Job.objects.select_related('group', 'review_stats')
+        queryset = related
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('prerequisites', queryset=related),
+                Prefetch('unlocks', queryset=related),
+            )
         group = self.request.query_params.get('group')
         if group:
             queryset = queryset.filter(group__code=group)
@@ -62,17 +109,93 @@ class JobViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=['get'])
+    def salary_grid(self, request):
+        """Salary estimates for every (job, years, key stat value) in one call.
+
+        Query params: ``jobs`` (comma-separated ids, default: all filtered jobs),
+        ``years`` (``0-10`` or ``1,3,5``) and ``stats`` (key stat values, default 50).
+        """
+        try:
+            years = _parse_int_list(request.query_params.get('years', '0-10'))
+            stat_values = _parse_int_list(request.query_params.get('stats', '50'))
+            job_ids = request.query_params.get('jobs')
+            jobs = self.filter_queryset(self.get_queryset())
+            if job_ids:
+                jobs = jobs.filter(id__in=_parse_int_list(job_ids))
+        except ValueError:
+            return Response({'error': 'Invalid jobs/years/stats'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = list(jobs.values('id', 'salary_min', 'salary_max', *salary.REQ_FIELDS))
+        if len(rows) * len(years) * len(stat_values) > SALARY_GRID_MAX_CELLS:
+            return Response({'error': 'Grid too large'}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({'jobs': [], 'years': years, 'stats': stat_values, 'estimates': [], 'percentiles': []})
+
+        estimates = salary.estimate_grid(rows, years, stat_values)
+        salary_min = [[[row['salary_min']]] for row in rows]
+        salary_max = [[[row['salary_max']]] for row in rows]
+        percentiles = salary.percentile_rank(estimates, salary_min, salary_max)
+        return Response({
+            'jobs': [row['id'] for row in rows],
+            'years': years,
+            'stats': stat_values,
+            'estimates': estimates.tolist(),
+            'percentiles': percentiles.tolist(),
+        })
+
+    @action(detail=True, methods=['get'])
+    def salary_percentile(self, request, pk=None):
+        """Percentile of ``salary`` among verified salaries for this job (optionally per ``years`` band)."""
+        try:
+            value = int(request.query_params['salary'])
+            years = request.query_params.get('years')
+            years = int(years) if years is not None else None
+        except (KeyError, ValueError):
+            return Response({'error': 'salary required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = self.get_object()
+        rank, sample_count = salary_stats.percentile(job.pk, value, years)
+        source = 'verified'
+        if rank is None:
+            rank = int(salary.percentile_rank(value, job.salary_min, job.salary_max))
+            source = 'synthetic'
+        return Response({'percentile': rank, 'sample_count': sample_count, 'source': source})
+
+    @action(detail=True, methods=['get'])
+    def salary_distribution(self, request, pk=None):
+        """Binned distribution of verified salaries (synthetic curve when samples are scarce)."""
+        job = self.get_object()
+        return Response({'job': job.pk, **salary_stats.distribution(job)})
+
+    @action(detail=True, methods=['get'])
+    def transitions(self, request, pk=None):
+        """Where people go from this job and how they reach it, from success stories."""
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        job = self.get_object()
+        edges = JobTransition.objects.select_related('from_job', 'to_job').order_by('-count')
+        return Response({
+            'next_jobs': JobTransitionSerializer(edges.filter(from_job=job)[:limit], many=True).data,
+            'previous_jobs': JobTransitionSerializer(edges.filter(to_job=job)[:limit], many=True).data,
+        })
+
 
 # ============ EDUCATION VIEWSETS ============
 
-class AcademyViewSet(viewsets.ReadOnlyModelViewSet):
+class AcademyViewSet(CachedCatalogMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for academies."""
+    cache_namespace = 'academies'
     queryset = Academy.objects.all()
     serializer_class = AcademySerializer
 
 
-class CourseViewSet(viewsets.ReadOnlyModelViewSet):
+class CourseViewSet(ConditionalGetMixin, CachedCatalogMixin, FastReadMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for courses."""
+    cache_namespace = 'courses'
+    fast_serializer_classes = {'list': FastCourseSerializer, 'retrieve': FastCourseSerializer}
     queryset = Course.objects.filter(is_active=True)
     serializer_class = CourseSerializer
 
@@ -95,10 +218,11 @@ class CourseViewSet(viewsets.ReadOnlyModelViewSet):
 
 # ============ PROFILE VIEWSET ============
 
-class MechanicProfileViewSet(viewsets.ModelViewSet):
+class MechanicProfileViewSet(ConditionalGetMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ModelViewSet):
     """ViewSet for MechanicProfile."""
-    queryset = MechanicProfile.objects.all()
+    queryset = MechanicProfile.objects.order_by('id')
     serializer_class = MechanicProfileSerializer
+    conditional_fields = ('current_job__updated_at', 'target_job__updated_at')
 
     @action(detail=True, methods=['post'])
     def complete_quest(self, request, pk=None):
@@ -128,12 +252,21 @@ class MechanicProfileViewSet(viewsets.ModelViewSet):
         if today_completions >= quest.max_daily_completions:
             return Response({'error': 'Quest completion limit reached'}, status=status.HTTP_400_BAD_REQUEST)
 
+        proof_image = request.FILES.get('proof_image')
+        if proof_image or 'proof_image' in getattr(request._request, 'rejected_uploads', ()):
+            error = uploads.upload_error(request, proof_image, 'proof_image')
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
         # Create completion record
         completion = QuestCompletion.objects.create(
             profile=profile,
             quest=quest,
-            notes=notes
+            notes=notes,
+            proof_image=proof_image
         )
+        if proof_image:
+            uploads.schedule(completion, 'proof_image')
 
         # Update stats
         stat_field = f'stat_{quest.target_stat.lower()}'
@@ -156,6 +289,11 @@ class MechanicProfileViewSet(viewsets.ModelViewSet):
             'tier': profile.tier,
         })
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Staff-only streaming export of all profiles."""
+        return _export_response(request, 'profiles')
+
     @action(detail=True, methods=['post'])
     def update_salary(self, request, pk=None):
         """Update current salary for the profile."""
@@ -176,20 +314,25 @@ class MechanicProfileViewSet(viewsets.ModelViewSet):
         profile = self.get_object()
 
         proof_image = request.FILES.get('salary_proof_image')
-        if not proof_image:
-            return Response({'error': 'salary_proof_image required'}, status=status.HTTP_400_BAD_REQUEST)
+        error = uploads.upload_error(request, proof_image, 'salary_proof_image')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
         profile.salary_proof_image = proof_image
         profile.salary_verification_status = VerificationStatus.PENDING
         profile.save(update_fields=['salary_proof_image', 'salary_verification_status', 'updated_at'])
+        uploads.schedule(profile, 'salary_proof_image')
 
         return Response(MechanicProfileSerializer(profile).data)
 
 
 # ============ QUEST VIEWSET ============
 
-class QuestViewSet(viewsets.ReadOnlyModelViewSet):
+class QuestViewSet(CachedCatalogMixin, FastReadMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Quests."""
+    cache_namespace = 'quests'
+    fast_serializer_classes = {'list': FastQuestSerializer, 'retrieve': FastQuestSerializer}
+    cache_bypass_params = ('profile_id',)
     queryset = Quest.objects.filter(is_active=True)
     serializer_class = QuestSerializer
 
@@ -210,26 +353,85 @@ class QuestViewSet(viewsets.ReadOnlyModelViewSet):
 
 # ============ REVIEW VIEWSETS ============
 
-class CareerReviewViewSet(viewsets.ModelViewSet):
+class CareerReviewViewSet(ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ModelViewSet):
     """ViewSet for career reviews."""
     queryset = CareerReview.objects.all()
     serializer_class = CareerReviewSerializer
+    pagination_class = ReviewKeysetPagination
 
     def get_queryset(self):
-        queryset = CareerReview.objects.all()
+        queryset = CareerReview.objects.select_related('author', 'job')
         job = self.request.query_params.get('job')
         if job:
             queryset = queryset.filter(job_id=job)
         return queryset
 
+    @property
+    def paginator(self):
+        # Keyset pagination follows the review_job_helpful_idx index, so it needs ?job=
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('job'):
+                self._paginator = ReviewKeysetPagination()
+            else:
+                self._paginator = ApproximatePagination()
+        return self._paginator
+
+    @action(detail=True, methods=['post', 'delete'])
+    def helpful(self, request, pk=None):
+        """Mark (POST) or unmark (DELETE) a review as helpful. Both are idempotent."""
+        profile_id = request.data.get('profile_id') or request.query_params.get('profile_id')
+        if not profile_id:
+            return Response({'error': 'profile_id required'}, status=status.HTTP_400_BAD_REQUEST)
 
-class SuccessStoryViewSet(viewsets.ReadOnlyModelViewSet):
-    """ViewSet for success stories."""
+        review = self.get_object()
+        try:
+            profile = MechanicProfile.objects.get(id=profile_id)
+        except (MechanicProfile.DoesNotExist, ValueError):
+            return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        with transaction.atomic():
+            if request.method == 'POST':
+                try:
+                    with transaction.atomic():
+                        ReviewHelpful.objects.create(review=review, user=profile)
+                    changed = True
+                except IntegrityError:
+                    # Already marked, possibly by a concurrent request
+                    changed = False
+                delta = 1
+            else:
+                changed, _ = ReviewHelpful.objects.filter(review=review, user=profile).delete()
+                delta = -1
+            if changed:
+                CareerReview.objects.filter(pk=review.pk).update(helpful_count=F('helpful_count') + delta)
+
+        review.refresh_from_db(fields=['helpful_count'])
+        return Response({'helpful': request.method == 'POST', 'helpful_count': review.helpful_count})
+
+
+class SuccessStoryViewSet(ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet for success stories.
+
+    Stories, authors, target jobs, steps and step jobs load in three queries
+    per page. ``?compact=true`` omits ``summary``/``key_lessons`` for list cards.
+    """
     queryset = SuccessStory.objects.all()
     serializer_class = SuccessStorySerializer
 
+    def is_compact(self):
+        return self.request.query_params.get('compact') == 'true'
+
+    def get_serializer_class(self):
+        if self.is_compact():
+            return SuccessStoryCardSerializer
+        return SuccessStorySerializer
+
     def get_queryset(self):
-        queryset = SuccessStory.objects.all()
+        queryset = SuccessStory.objects.select_related('author', 'target_job').prefetch_related(
+            Prefetch('journey_steps', queryset=StoryJourneyStep.objects.select_related('job'))
+        )
+        if self.is_compact():
+            queryset = queryset.defer('summary', 'key_lessons')
         job = self.request.query_params.get('job')
         if job:
             queryset = queryset.filter(target_job_id=job)
@@ -238,9 +440,20 @@ class SuccessStoryViewSet(viewsets.ReadOnlyModelViewSet):
 
 # ============ COMMUNITY VIEWS ============
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ConditionalGetMixin, ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ModelViewSet):
     """ViewSet for community posts."""
     queryset = Post.objects.all()
+    # Counters and related rows change the payload without touching updated_at
+    conditional_fields = (
+        'likes', 'views', 'unique_views', 'comment_count', 'author__updated_at', 'related_job__updated_at',
+    )
+
+    def get_conditional_fields(self):
+        if self.action == 'retrieve':
+            return self.conditional_fields + (
+                'comments__id', 'comments__likes', 'comments__content', 'comments__author__updated_at',
+            )
+        return self.conditional_fields
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -276,17 +489,27 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = CreatePostSerializer(data=request.data)
         if serializer.is_valid():
             post = serializer.save(author=profile)
+            moderation.index_post(post)
             return Response(PostSerializer(post, context={'profile_id': int(profile_id)}).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def perform_update(self, serializer):
+        post = serializer.save()
+        moderation.index_post(post)
+
+    def get_object(self):
+        post = super().get_object()
+        if self.action == 'retrieve':
+            # Buffered view counting; flushed to the database periodically
+            post_views.record_view(post, post_views.viewer_key(self.request))
+        return post
+
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Increment view count
-        instance.views = F('views') + 1
-        instance.save(update_fields=['views'])
-        instance.refresh_from_db()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            # A revalidated page is still a view
+            self.get_object()
+        return response
 
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
@@ -334,7 +557,7 @@ class PostViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, SparseQuerysetMixin, TimedSerializationMixin, viewsets.ModelViewSet):
     """ViewSet for comments."""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
@@ -349,7 +572,7 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 # ============ SALARY REPORT VIEWS ============
 
-class SalaryReportViewSet(viewsets.ModelViewSet):
+class SalaryReportViewSet(SparseQuerysetMixin, TimedSerializationMixin, viewsets.ModelViewSet):
     """ViewSet for salary reports."""
     queryset = SalaryReport.objects.all()
 
@@ -377,7 +600,11 @@ class SalaryReportViewSet(viewsets.ModelViewSet):
 
         serializer = CreateSalaryReportSerializer(data=request.data)
         if serializer.is_valid():
-            report = serializer.save(user=profile)
+            data = serializer.validated_data
+            estimated_salary, percentile = salary.estimate_for_profile(
+                data['target_job'], data['years_experience'], data.get('user_stats')
+            )
+            report = serializer.save(user=profile, estimated_salary=estimated_salary, percentile=percentile)
             return Response(
                 SalaryReportSerializer(report).data,
                 status=status.HTTP_201_CREATED
@@ -394,14 +621,21 @@ class SalaryReportViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
         proof_image = request.FILES.get('proof_image')
-        if not proof_image:
-            return Response({'error': 'proof_image required'}, status=status.HTTP_400_BAD_REQUEST)
+        error = uploads.upload_error(request, proof_image, 'proof_image')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
         report.proof_image = proof_image
         report.status = VerificationStatus.PENDING
         report.save()
+        uploads.schedule(report, 'proof_image')
         return Response(SalaryReportSerializer(report).data)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Staff-only streaming export of all salary reports."""
+        return _export_response(request, 'reports')
+
     @action(detail=False, methods=['get'])
     def my_reports(self, request):
         """Get current user's reports."""
@@ -447,3 +681,39 @@ def dashboard_data(request, profile_id):
         'daily_quests': quests_serializer.data,
         'today_completions': completions_serializer.data,
     })
+
+
+# ============ SALARY ANALYTICS ============
+
+@api_view(['GET'])
+def salary_cube_query(request):
+    """Roll-up / drill-down over the salary cohort cube.
+
+    Filter with ``group``, ``years_band``, ``tier`` and ``status``; group with
+    ``by`` (comma-separated dimensions), e.g. ``?status=Verified&by=group,tier``.
+    """
+    filters = {
+        dim: request.query_params[dim]
+        for dim in salary_cube.DIMENSIONS if request.query_params.get(dim)
+    }
+    group_by = [dim for dim in request.query_params.get('by', '').split(',') if dim]
+    try:
+        results = salary_cube.query(filters, group_by)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'filters': filters, 'by': group_by, 'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_stats(request):
+    """Staff-only per-route request counts, errors and latency / query percentiles."""
+    return Response(metrics.route_stats())
+
+
+def prometheus_metrics(request):
+    """Prometheus scrape endpoint; needs ``Authorization: Bearer <METRICS_TOKEN>`` when a token is set."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
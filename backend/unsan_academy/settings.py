@@ -30,10 +30,13 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.instrumentation.RequestTimingMiddleware',
+    'api.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.replicas.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -58,11 +61,56 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'unsan_academy.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database profile: DB_ENGINE=sqlite (default) or postgres
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'unsan_academy'),
+            'USER': os.environ.get('DB_USER', 'unsan'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': 5,  # Seconds the driver waits for a lock before "database is locked"
+            },
+        }
     }
+
+# Read replicas: DB_REPLICA_HOSTS (PostgreSQL, comma-separated) or DB_REPLICA_PATH
+# (an SQLite file refreshed from the primary with `manage.py sync_sqlite_replica`)
+if DB_ENGINE == 'postgres':
+    for index, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+        DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+elif os.environ.get('DB_REPLICA_PATH'):
+    DATABASES['replica_0'] = {**DATABASES['default'], 'NAME': os.environ['DB_REPLICA_PATH'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = 5  # Clients read from the primary this long after a write
+
+# Applied to every new SQLite connection (see api/database.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',  # Readers no longer block behind a writer
+    'synchronous': 'normal',  # Durable at checkpoints; safe with WAL
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+    'cache_size': -20000,  # KiB (negative) per connection
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,4 +143,84 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.ApproximatePagination',
 }
+
+# Paginated results above this many rows report an estimated count
+# (PostgreSQL planner statistics, otherwise a count cached for APPROXIMATE_COUNT_SECONDS)
+APPROXIMATE_COUNT_THRESHOLD = int(os.environ.get('APPROXIMATE_COUNT_THRESHOLD', 10_000))
+APPROXIMATE_COUNT_SECONDS = 300
+
+# Response compression (api.compression): brotli when installed and accepted, gzip otherwise
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Request instrumentation (api.instrumentation): share of requests measured for
+# Server-Timing and route histograms, and the budgets above which a request is logged
+INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('INSTRUMENTATION_SAMPLE_RATE', 1.0 if DEBUG else 0.0))
+INSTRUMENTATION_QUERY_BUDGET = int(os.environ.get('INSTRUMENTATION_QUERY_BUDGET', 30))
+INSTRUMENTATION_LATENCY_BUDGET_MS = int(os.environ.get('INSTRUMENTATION_LATENCY_BUDGET_MS', 500))
+
+# Metrics (api.metrics), scraped at /metrics. With several worker processes set
+# METRICS_MULTIPROC_DIR to a directory shared by them and emptied on start
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR') or None
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Caches. The 'api' alias backs the catalog response cache: API_CACHE_BACKEND=locmem
+# (single process), file (shared directory) or redis (any Redis-protocol server; needs redis-py)
+API_CACHE_BACKEND = os.environ.get('API_CACHE_BACKEND', 'locmem')
+API_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('API_CACHE_LOCATION', BASE_DIR / 'cache'),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('API_CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        **API_CACHE_BACKENDS[API_CACHE_BACKEND],
+        'KEY_PREFIX': 'unsan',
+    },
+}
+API_CACHE_SECONDS = 3600
+
+# values()-based serializers for job/course/quest reads (see api/fast_serializers.py)
+FAST_SERIALIZERS = True
+
+# Community settings
+POST_VIEW_FLUSH_SECONDS = 60  # How often buffered post views are written to the DB
+POST_DUPLICATE_THRESHOLD = 0.8  # MinHash similarity at which a new post is flagged
+
+# Salary statistics
+SALARY_MIN_SAMPLES = 5  # Below this, percentiles fall back to the synthetic curve
+SALARY_SKETCH_CACHE_SECONDS = 60
+SALARY_DISTRIBUTION_CACHE_SECONDS = 3600
+ANALYTICS_SNAPSHOT_DIR = BASE_DIR / 'snapshots'
+SALARY_ANOMALY_APPROVE_THRESHOLD = 2.0  # Max |robust z| for bulk approval of pending reports
+VERIFICATION_CHUNK_SIZE = 500  # Rows locked and updated per transaction by bulk verification
+
+# Proof image uploads
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024  # Larger uploads are streamed to a temp file
+FILE_UPLOAD_HANDLERS = [
+    'api.uploads.SizeLimitUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+PROOF_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+PROOF_IMAGE_MAX_DIMENSION = 2048  # Longest side kept after downscaling
+PROOF_THUMBNAIL_SIZE = 320
+PROOF_IMAGE_WORKERS = 2
+PROOF_IMAGE_ASYNC = True  # False processes images inline after commit (tests, scripts)
+MEDIA_BLOB_SWEEP_GRACE_HOURS = 24  # Unreferenced proof blobs younger than this are kept
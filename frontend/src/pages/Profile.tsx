@@ -64,10 +64,10 @@ export function Profile() {
   const fetchSalaryReports = async () => {
     if (!profile?.id) return;
     try {
-      const response = await fetch(`${API_BASE}/reports/?profile_id=${profile.id}`);
+      const response = await fetch(`${API_BASE}/reports/?profile_id=${profile.id}&page_size=100`);
       if (response.ok) {
         const data = await response.json();
-        setSalaryReports(data);
+        setSalaryReports(data.results);
       }
     } catch {
       console.error('Failed to fetch reports');